@@ -147,6 +147,7 @@
 # }
 
 import os
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -160,6 +161,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'drf_yasg',
     'django_extensions',
@@ -215,6 +217,7 @@ TEMPLATES = [
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'industrial_designs.response_cache.ResponseCacheMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -241,7 +244,98 @@ DATABASES = {
     },
 }
 
-# Removed DATABASE_ROUTERS setting
+# Connection reuse, tunable per deployment through DB_POOL_MODE:
+#   persistent - each server thread keeps its connection open for
+#                DB_CONN_MAX_AGE seconds (the default)
+#   pool       - a psycopg 3 connection pool per database in each process,
+#                DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections
+#   pgbouncer  - persistent connections to a pgbouncer running in
+#                transaction mode, without server-side cursors (so
+#                streaming exports need DB_EXPORT_HOST, see below)
+#   off        - a new connection for every request
+# Connections are health-checked before reuse in every mode; /health/db/
+# reports per-database latency and the pool statistics.
+DB_POOL_MODE = os.getenv('DB_POOL_MODE', 'persistent')
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+if DB_POOL_MODE == 'pool':
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '8')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+            'max_idle': float(os.getenv('DB_POOL_MAX_IDLE', '300')),
+        },
+    }
+elif DB_POOL_MODE in ('persistent', 'pgbouncer'):
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = DB_POOL_MODE == 'pgbouncer'
+elif DB_POOL_MODE != 'off':
+    raise ImproperlyConfigured(f"Unknown DB_POOL_MODE {DB_POOL_MODE!r}; use persistent, pool, pgbouncer or off.")
+
+# Streaming exports (Parquet, ?all=true) read with .iterator(), which keeps memory
+# flat only through a server-side cursor. pgbouncer in transaction mode cannot
+# keep one open between fetches, so DB_POOL_MODE=pgbouncer turns them off and
+# .iterator() would load the whole result at once. Point DB_EXPORT_HOST /
+# DB_EXPORT_PORT at PostgreSQL itself or at a session-mode pgbouncer pool to
+# stream exports through the `exports` alias; without one, exports answer 503
+# in pgbouncer mode.
+EXPORT_DATABASE = None
+if os.getenv('DB_EXPORT_HOST'):
+    DATABASES['exports'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_EXPORT_HOST'),
+        'PORT': os.getenv('DB_EXPORT_PORT', DATABASES['default']['PORT']),
+        'OPTIONS': {},
+        'CONN_MAX_AGE': 0,
+        'DISABLE_SERVER_SIDE_CURSORS': False,
+        'TEST': {'MIRROR': 'default'},
+    }
+    EXPORT_DATABASE = 'exports'
+
+# Read replicas: DB_REPLICA_HOSTS=host[:port],host[:port],... Each replica
+# shares the primary's name and credentials (override with DB_REPLICA_NAME,
+# DB_REPLICA_USER, DB_REPLICA_PASSWORD) and becomes a `replica_N` alias that
+# db_router.DBRouter sends reads to.
+for number, replica in enumerate(filter(None, map(str.strip, os.getenv('DB_REPLICA_HOSTS', '').split(','))), start=1):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'NAME': os.getenv('DB_REPLICA_NAME', DATABASES['default']['NAME']),
+        'USER': os.getenv('DB_REPLICA_USER', DATABASES['default']['USER']),
+        'PASSWORD': os.getenv('DB_REPLICA_PASSWORD', DATABASES['default']['PASSWORD']),
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        # Tests run against the primary only.
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['db_router.DBRouter']
+
+# Response cache (industrial_designs.response_cache). CACHE_BACKEND picks where it lives:
+#   locmem - in each server process (the default)
+#   redis  - shared by every process and server, at CACHE_LOCATION
+#            (redis://host:6379/N or any Redis-compatible server)
+#   dummy  - nothing is cached; ETag / Last-Modified are still sent
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'redis': 'django.core.cache.backends.redis.RedisCache',
+    'dummy': 'django.core.cache.backends.dummy.DummyCache',
+}
+if CACHE_BACKEND not in CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"Unknown CACHE_BACKEND {CACHE_BACKEND!r}; use locmem, redis or dummy.")
+CACHES = {
+    'default': {
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND],
+        'LOCATION': os.getenv('CACHE_LOCATION', 'industrial_designs-responses'),
+        'KEY_PREFIX': 'industrial_designs',
+        'OPTIONS': {'MAX_ENTRIES': int(os.getenv('CACHE_MAX_ENTRIES', '5000'))} if CACHE_BACKEND == 'locmem' else {},
+    },
+}
+RESPONSE_CACHE_PATHS = ['/designs/']
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', '86400'))
+# How stale (in seconds) a process may let its copy of the data version get.
+DATA_VERSION_TTL = float(os.getenv('DATA_VERSION_TTL', '5'))
 
 AUTH_PASSWORD_VALIDATORS = [
     {
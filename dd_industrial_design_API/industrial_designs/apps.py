@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class IndustrialDesignsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'industrial_designs'
+
+    def ready(self):
+        # Generate each list view's FilterSet once, at startup, rather than
+        # on the first request (or, as before, on every request).
+        from .views import ReadOnlyMixin, ab_filterset_for
+
+        for view in ReadOnlyMixin.__subclasses__():
+            ab_filterset_for(view.queryset.model)
@@ -0,0 +1,41 @@
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from industrial_designs.views import ReadOnlyMixin, ab_filterset_for, make_ab_filterset
+
+
+class Command(BaseCommand):
+    help = (
+        "Times the FilterSet work each ID list request does: generating the "
+        "class per request (the old filterset_class) against the process-level "
+        "registry. Builds the filtered queryset without running it, so no data is needed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000,
+                            help='Simulated requests per view (default: %(default)s).')
+
+    def handle(self, *args, **options):
+        n = options['iterations']
+        request = Request(RequestFactory().get('/', {'application_number': '1', 'filing_date_after': '2015-01-01'}))
+        params = request.query_params
+
+        self.stdout.write(f"{'view':<40} {'per request':>14} {'registry':>12} {'speedup':>9}")
+        for view in ReadOnlyMixin.__subclasses__():
+            model = view.queryset.model
+            queryset = model.objects.all()
+
+            def generated():
+                make_ab_filterset(model)(params, queryset=queryset, request=request).qs
+
+            def registry():
+                ab_filterset_for(model)(params, queryset=queryset, request=request).qs
+
+            before = timeit.timeit(generated, number=n) / n
+            after = timeit.timeit(registry, number=n) / n
+            self.stdout.write(
+                f"{view.__name__:<40} {before * 1e6:>11.1f} us {after * 1e6:>9.1f} us {before / after:>8.1f}x"
+            )
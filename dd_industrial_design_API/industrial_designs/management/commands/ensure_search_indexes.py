@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from industrial_designs.search_indexes import ensure_search_indexes
+
+
+class Command(BaseCommand):
+    help = (
+        'Builds the trigram indexes on the ID tables that are not there yet. Run it '
+        'after the ID tables have been (re)loaded.'
+    )
+
+    def handle(self, *args, **options):
+        created, present, missing = ensure_search_indexes(connection)
+        for index in created:
+            self.stdout.write(f'Created {index}.')
+        if missing:
+            raise CommandError(f"Tables not loaded yet: {', '.join(sorted(set(missing)))}")
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(created)} index(es) created, {len(present)} already in place.'
+        ))
@@ -0,0 +1,50 @@
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = 'id_csv_2024_03_07'
+INDEXES = [
+    ('app_ip_org_name_trgm', 'application_interested_party'),
+    ('asg_ip_org_name_trgm', 'assignment_interested_party'),
+]
+
+
+def create_indexes(apps, schema_editor):
+    # The interested-party tables are unmanaged and loaded outside Django, so
+    # a fresh (e.g. test) database may not have them yet.
+    for index, table in INDEXES:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [f'"{SCHEMA}"."{table}"'])
+            if cursor.fetchone()[0] is None:
+                logger.warning('"%s"."%s" does not exist yet, so %s was not built. '
+                               'Run `manage.py ensure_search_indexes` once it is loaded.', SCHEMA, table, index)
+                continue
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} '
+            f'ON "{SCHEMA}"."{table}" USING gin (organization_name gin_trgm_ops);'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    for index, _ in INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{SCHEMA}".{index};')
+
+
+class Migration(migrations.Migration):
+    # The interested-party tables are unmanaged, so the indexes are created
+    # with raw SQL. Built CONCURRENTLY so lookups keep working meanwhile.
+    atomic = False
+
+    dependencies = [
+        ('industrial_designs', '0002_applicationclassification_applicationcorrection_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE EXTENSION IF NOT EXISTS pg_trgm;',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
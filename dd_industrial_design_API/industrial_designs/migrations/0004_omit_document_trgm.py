@@ -0,0 +1,62 @@
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = 'id_csv_2024_03_07'
+
+# Text columns of each table, in model field order. The index expression must
+# be the one OmitFilterBackend builds from the model (omit_document_sql), or
+# the planner will not match it.
+TABLES = [
+    ('application_main', ['application_number', 'extension_number', 'parent_application_number', 'application_language_code', 'design_current_status_code', 'design_status', 'design_title', 'design_title_language_code', 'designated_country_code', 'designated_country', 'filing_country', 'filing_country_code', 'international_application_kind', 'international_registration_number', 'maintenance_indicator_type', 'maintenance_indicator', 'novelty_statement', 'novelty_statement_language_type', 'novelty_statement_sequence_num', 'priority_claim_eu', 'priority_claim_kind', 'priority_country', 'priority_country_code', 'priority_number', 'priority_sequence_num', 'priority_status_code', 'priority_status', 'publication_identifier', 'receiving_office_country_code', 'receiving_office_country', 'registration_file_name', 'registration_number', 'registration_office_country_code', 'registration_office_country', 'total_graphical_images', 'total_number_of_designs']),
+    ('application_classification', ['application_number', 'extension_number', 'classification_kind_code', 'classification_kind', 'classification_number', 'classification_primary', 'classification_sub', 'classification_sub_sub', 'product_description']),
+    ('application_correction', ['application_number', 'extension_number', 'publication_identifier', 'publication_section']),
+    ('application_description', ['application_number', 'extension_number', 'design_description_language_code', 'design_description']),
+    ('application_description_txt_format', ['application_number', 'extension_number', 'design_description_language_code', 'design_description']),
+    ('application_image', ['application_number', 'extension_number', 'filename', 'colour', 'colour_type', 'image_kind', 'image_kind_code']),
+    ('application_interested_party', ['application_number', 'extension_number', 'first_name', 'last_name', 'organization_name', 'role', 'role_code', 'address', 'city', 'country', 'country_code', 'postal_code', 'province_state']),
+    ('assignment_main', ['assignment_number', 'application_number', 'extension_number', 'assignment_status_type', 'assignment_status', 'assignment_type_code', 'assignment_type', 'legal_disclaimer', 'ownership_change_prior_to_filing']),
+    ('assignment_correction', ['assignment_number', 'publication_identifier', 'publication_section']),
+    ('assignment_interested_party', ['assignment_number', 'first_name', 'last_name', 'organization_name', 'role', 'role_code', 'address', 'city', 'country', 'country_code', 'postal_code', 'province_state']),
+]
+
+
+def omit_document_sql(columns):
+    return " || E'\\x1f' || ".join(f"coalesce(\"{column}\", '')" for column in columns)
+
+
+def create_indexes(apps, schema_editor):
+    # The tables are unmanaged and loaded outside Django, so a fresh (e.g.
+    # test) database may not have them yet.
+    for table, columns in TABLES:
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s)', [f'"{SCHEMA}"."{table}"'])
+            if cursor.fetchone()[0] is None:
+                logger.warning('"%s"."%s" does not exist yet, so %s_omit_trgm was not built. '
+                               'Run `manage.py ensure_search_indexes` once it is loaded.', SCHEMA, table, table)
+                continue
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_omit_trgm '
+            f'ON "{SCHEMA}"."{table}" USING gin (({omit_document_sql(columns)}) gin_trgm_ops);'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    for table, _ in TABLES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS "{SCHEMA}".{table}_omit_trgm;')
+
+
+class Migration(migrations.Migration):
+    # One trigram index per table over all its text columns, so a bare
+    # ?omit=word can find the rows to exclude without an ILIKE per column.
+    atomic = False
+
+    dependencies = [
+        ('industrial_designs', '0003_interested_party_name_trgm'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -196,4 +196,16 @@ class AssignmentMain(BaseID):
 
     class Meta(BaseID.Meta):
         db_table = f'"{SCHEMA}"."assignment_main"'
-        verbose_name = "ID – assignment main"
\ No newline at end of file
+        verbose_name = "ID – assignment main"
+
+class DataVersion(models.Model):
+    """
+    Single row bumped (`manage.py bump_data_version`) after the ID tables are
+    reloaded. Cached API responses are keyed by it, so a bump invalidates all
+    of them at once.
+    """
+    version = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'id_data_version'
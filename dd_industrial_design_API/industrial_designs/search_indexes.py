@@ -0,0 +1,61 @@
+"""
+Trigram indexes on the unmanaged industrial design tables.
+
+The tables are loaded outside this repo, usually after `migrate` has run,
+so the migrations that define these indexes find nothing to index and skip
+them. `manage.py ensure_search_indexes` builds whatever is missing; run it
+after every data load.
+"""
+from django.apps import apps
+
+from .models import SCHEMA, ApplicationInterestedParty, AssignmentInterestedParty
+from .views import omit_document_sql
+
+
+def party_name_indexes():
+    """(index, model, indexed expression) for ?party_fuzzy= (migration 0003)."""
+    return [
+        ('app_ip_org_name_trgm', ApplicationInterestedParty, 'organization_name'),
+        ('asg_ip_org_name_trgm', AssignmentInterestedParty, 'organization_name'),
+    ]
+
+
+def table_name(model):
+    """'"schema"."table"' -> 'table'."""
+    return model._meta.db_table.rsplit('.', 1)[-1].strip('"')
+
+
+def omit_indexes():
+    """One per table over all its text columns, for a bare ?omit=word (migration 0004)."""
+    return [
+        (f'{table_name(model)}_omit_trgm', model, omit_document_sql(model))
+        for model in apps.get_app_config('industrial_designs').get_models()
+        if not model._meta.managed
+    ]
+
+
+def search_indexes():
+    return party_name_indexes() + omit_indexes()
+
+
+def ensure_search_indexes(connection):
+    """
+    Builds each missing index CONCURRENTLY (so `connection` must not be in a
+    transaction). Returns (created, already there, tables missing).
+    """
+    created, present, missing = [], [], []
+    for index, model, expression in search_indexes():
+        table = model._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT to_regclass(%s), to_regclass(%s)', [table, f'"{SCHEMA}".{index}'])
+            table_exists, index_exists = cursor.fetchone()
+            if table_exists is None:
+                missing.append(table)
+                continue
+            if index_exists is not None:
+                present.append(index)
+                continue
+            cursor.execute(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {index} '
+                           f'ON {table} USING gin (({expression}) gin_trgm_ops);')
+        created.append(index)
+    return created, present, missing
@@ -37,7 +37,15 @@ class ApplicationImageSerializer(serializers.ModelSerializer):
         model = ApplicationImage
         fields = "__all__"
 
-class ApplicationInterestedPartySerializer(serializers.ModelSerializer):
+class FuzzyMatchMixin:
+    # Exposes the score when the row came from a `?party_fuzzy=` lookup.
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, "similarity"):
+            data["similarity"] = instance.similarity
+        return data
+
+class ApplicationInterestedPartySerializer(FuzzyMatchMixin, serializers.ModelSerializer):
     class Meta:
         model = ApplicationInterestedParty
         fields = "__all__"
@@ -52,7 +60,7 @@ class AssignmentCorrectionSerializer(serializers.ModelSerializer):
         model = AssignmentCorrection
         fields = "__all__"
 
-class AssignmentInterestedPartySerializer(serializers.ModelSerializer):
+class AssignmentInterestedPartySerializer(FuzzyMatchMixin, serializers.ModelSerializer):
     class Meta:
         model = AssignmentInterestedParty
         fields = "__all__"
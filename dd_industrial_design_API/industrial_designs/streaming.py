@@ -0,0 +1,28 @@
+"""
+The database streaming exports read from.
+
+QuerySet.iterator() keeps memory flat only through a server-side cursor.
+Behind pgbouncer in transaction mode (DB_POOL_MODE=pgbouncer) those are
+disabled and iterator() fetches the whole result at once, so exports read
+from settings.EXPORT_DATABASE, a direct or session-mode connection, or are
+refused.
+"""
+from django.conf import settings
+from django.db import connections, router
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class ExportUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = ('Streaming exports need server-side cursors, which pgbouncer in transaction mode does not '
+                      'support. Set DB_EXPORT_HOST to a direct or session-mode connection.')
+    default_code = 'export_unavailable'
+
+
+def export_database(model):
+    """Alias to stream `model` from. Raises ExportUnavailable if it cannot hold a server-side cursor."""
+    alias = settings.EXPORT_DATABASE or router.db_for_read(model)
+    if connections[alias].settings_dict.get('DISABLE_SERVER_SIDE_CURSORS'):
+        raise ExportUnavailable()
+    return alias
@@ -1,9 +1,52 @@
-from django.test import TestCase
+import datetime
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.apps import apps
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, models
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.test import skipIfDBFeature
 
+from .models import SCHEMA, ApplicationInterestedParty, ApplicationMain
+from .search_indexes import ensure_search_indexes, search_indexes
+from .views import AB_FILTERSETS, ReadOnlyMixin
+
+
+def create_id_tables():
+    """
+    The ID tables are unmanaged and loaded outside Django, so the test
+    database starts without them. Inside a TestCase they go away with the
+    class's transaction.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{SCHEMA}"')
+    with connection.schema_editor() as editor:
+        for model in apps.get_app_config("industrial_designs").get_models():
+            if not model._meta.managed:
+                editor.create_model(model)
+
+
+def make_row(model, **values):
+    """Saves a `model` row with every column not in `values` set to a blank of its type."""
+    for field in model._meta.concrete_fields:
+        if field.primary_key or field.name in values:
+            continue
+        if isinstance(field, models.DateField):
+            values[field.name] = datetime.date(2024, 1, 1)
+        elif isinstance(field, (models.IntegerField, models.FloatField)):
+            values[field.name] = 0
+        else:
+            values[field.name] = ""
+    return model.objects.create(**values)
+
 @skipIfDBFeature('supports_transactions')
 class IDSmokeTests(APITestCase):
     schema = "id_csv_2024_03_07"
@@ -47,3 +90,287 @@ class IDSmokeTests(APITestCase):
         url = reverse("id_assignment_main-detail", args=[pk])
         resp = self.client.get(url)
         self.assertIn(resp.status_code, (status.HTTP_200_OK, status.HTTP_404_NOT_FOUND))
+
+
+class PaginationTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_id_tables()
+        # Created out of number order, so id order and number order differ.
+        for n in [*range(31, 61), *range(1, 31)]:
+            make_row(ApplicationMain, application_number=str(n),
+                     filing_date=datetime.date(2015 if n <= 30 else 2016, 1, 1))
+        cls.ids = list(ApplicationMain.objects.order_by("id").values_list("id", flat=True))
+
+    def get(self, **params):
+        resp = self.client.get(reverse("id_main-list"), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp
+
+    def test_default_page_size(self):
+        resp = self.get()
+        self.assertEqual((resp.data["count"], resp.data["page_size"], resp.data["total_pages"]), (60, 50, 2))
+        self.assertEqual([row["id"] for row in resp.data["results"]], self.ids[:50])
+        self.assertTrue(resp.data["next"].endswith(reverse("id_main-list") + "?page=2"))
+        self.assertIsNone(resp.data["previous"])
+
+    def test_pages_follow_next_link_in_id_order(self):
+        seen, url = [], reverse("id_main-list") + "?page_size=25"
+        while url:
+            resp = self.client.get(url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(resp.data["results"]), 25)
+            seen += [row["id"] for row in resp.data["results"]]
+            url = resp.data["next"]
+        self.assertEqual(seen, self.ids)
+        self.assertEqual(len(self.get(page=3, page_size=25).data["results"]), 10)
+
+    def test_page_size_is_capped(self):
+        resp = self.get(page_size=100_000)
+        self.assertEqual(resp.data["page_size"], 10_000)
+        self.assertIsNone(resp.data["next"])
+
+    def test_explicit_ordering_is_kept(self):
+        resp = self.get(ordering="-application_number", page_size=3)
+        self.assertEqual([row["application_number"] for row in resp.data["results"]], ["9", "8", "7"])
+
+    def test_all_streams_every_filtered_row_in_id_order(self):
+        # Several batches, and a last one that is not full.
+        with mock.patch.object(ReadOnlyMixin, "all_chunk_size", 7):
+            resp = self.get(all="true", filing_date_after="2016-01-01")
+            self.assertEqual(resp["Content-Type"], "application/json")
+            rows = json.loads(b"".join(resp.streaming_content))
+        self.assertEqual([row["id"] for row in rows], self.ids[:30])
+        self.assertEqual({row["application_number"] for row in rows}, {str(n) for n in range(31, 61)})
+
+    def test_all_refused_without_server_side_cursors(self):
+        with mock.patch.dict(connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True):
+            resp = self.client.get(reverse("id_main-list"), {"all": "true"})
+        self.assertEqual(resp.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        # Paginated lists do not need a server-side cursor.
+        with mock.patch.dict(connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True):
+            self.assertEqual(len(self.get(page_size=5).data["results"]), 5)
+
+    def test_by_number_is_paginated(self):
+        resp = self.client.get(reverse("id_main-by-number", args=["42"]))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual((resp.data["count"], resp.data["results"][0]["application_number"]), (1, "42"))
+
+
+class ModifiedSinceTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_id_tables()
+        make_row(ApplicationMain, application_number="1")
+
+    def get(self, raw):
+        return self.client.get(reverse("id_main-list"), {"modified_since": raw})
+
+    def test_all_or_nothing_by_schema_extract_date(self):
+        # The schema is id_csv_2024_03_07: rows changed on 2024-03-07.
+        resp = self.get("2024-03-06")
+        self.assertEqual([row["application_number"] for row in resp.data["results"]], ["1"])
+        self.assertEqual(self.get("2024-03-07").data["results"], [])
+
+    def test_bad_date(self):
+        self.assertEqual(self.get("07/03/2024").status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ParquetExportTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_id_tables()
+        for n in range(1, 6):
+            make_row(ApplicationMain, application_number=str(n), design_current_status_code="REG")
+
+    def test_command_writes_partitioned_files(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            call_command("export_parquet", directory, "application_main", rows_per_file=2, batch_size=2,
+                         stdout=io.StringIO())
+            parts = sorted(os.listdir(os.path.join(directory, "application_main")))
+            table = pq.read_table(os.path.join(directory, "application_main"))
+
+        self.assertEqual(parts, ["part-00000.parquet", "part-00001.parquet", "part-00002.parquet"])
+        self.assertEqual(table.column("application_number").to_pylist(), [str(n) for n in range(1, 6)])
+        self.assertEqual(table.schema.field("design_current_status_code").type,
+                         pa.dictionary(pa.int32(), pa.string()))
+        # The extract date the schema is named after.
+        self.assertEqual(table.schema.metadata[b"extract_date"], b"2024-03-07")
+
+    def test_endpoint_streams_one_file(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        resp = self.client.get(reverse("id_parquet-detail", args=["application_main"]))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        table = pq.read_table(pa.BufferReader(b"".join(resp.streaming_content)))
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(self.client.get(reverse("id_parquet-list")).data["extract_date"], "2024-03-07")
+        resp = self.client.get(reverse("id_parquet-detail", args=["id_nope"]))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_refused_without_server_side_cursors(self):
+        with mock.patch.dict(connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True):
+            resp = self.client.get(reverse("id_parquet-detail", args=["application_main"]))
+            self.assertEqual(resp.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            with tempfile.TemporaryDirectory() as directory:
+                with self.assertRaisesMessage(CommandError, "DB_EXPORT_HOST"):
+                    call_command("export_parquet", directory, "application_main", stdout=io.StringIO())
+
+
+class FilterSetRegistryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_id_tables()
+        for year in (2014, 2015, 2016):
+            make_row(ApplicationMain, application_number=str(year), filing_date=datetime.date(year, 6, 1))
+
+    def test_built_at_startup_for_every_list_view(self):
+        self.assertEqual(set(AB_FILTERSETS), {view.queryset.model for view in ReadOnlyMixin.__subclasses__()})
+
+    def test_requests_reuse_the_registered_filterset(self):
+        filterset = AB_FILTERSETS[ApplicationMain]
+        self.assertIn("filing_date_after", filterset.base_filters)
+        with mock.patch("industrial_designs.views.make_ab_filterset") as make:
+            for params, numbers in [
+                ({"filing_date_after": "2015-01-01"}, ["2015", "2016"]),
+                ({"filing_date_after": "2015-01-01", "filing_date_before": "2015-12-31"}, ["2015"]),
+                ({"application_number": "2014"}, ["2014"]),
+            ]:
+                resp = self.client.get(reverse("id_main-list"), params)
+                self.assertEqual(resp.status_code, status.HTTP_200_OK)
+                self.assertEqual([row["application_number"] for row in resp.data["results"]], numbers)
+        make.assert_not_called()
+        self.assertIs(AB_FILTERSETS[ApplicationMain], filterset)
+
+
+class OmitFilterTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_id_tables()
+        for number, values in enumerate([
+            {"organization_name": "ACME Corporation"},
+            {"first_name": "Wile", "last_name": "Coyote", "city": "Acmeville"},
+            {"organization_name": "Globex Inc.", "address": "1 Globex Way"},
+            {"organization_name": "100% Cotton Ltd"},
+            {"organization_name": "Cotton_Mill"},
+            {"organization_name": "Initech", "province_state": "ON"},
+        ]):
+            make_row(ApplicationInterestedParty, application_number=str(number), **values)
+
+    def omit(self, raw):
+        resp = self.client.get(reverse("id_interested_party-list"), {"omit": raw, "page_size": 100})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return sorted(row["id"] for row in resp.data["results"])
+
+    def per_column(self, *words):
+        """What ?omit= used to do: NOT (col1 ICONTAINS word OR col2 ICONTAINS word ...)."""
+        text_fields = [
+            f.name for f in ApplicationInterestedParty._meta.concrete_fields
+            if isinstance(f, (models.CharField, models.TextField))
+        ]
+        q = models.Q()
+        for word in words:
+            for name in text_fields:
+                q |= models.Q(**{f"{name}__icontains": word})
+        return sorted(ApplicationInterestedParty.objects.exclude(q).values_list("id", flat=True))
+
+    def test_bare_words_match_per_column_icontains(self):
+        for words in [["acme"], ["GLOBEX"], ["acme", "initech"], ["100%"], ["n_m"], ["_"], ["on"], ["nothing"]]:
+            with self.subTest(words=words):
+                self.assertEqual(self.omit(",".join(words)), self.per_column(*words))
+
+    def test_match_does_not_straddle_columns(self):
+        # last_name 'Coyote' is followed by other columns, never by 'Acmeville' directly.
+        self.assertEqual(self.omit("coyoteacme"), self.per_column("coyoteacme"))
+        self.assertEqual(len(self.omit("coyoteacme")), 6)
+
+    def test_column_token_only_checks_that_column(self):
+        self.assertEqual(len(self.omit("organization_name:acme")), 5)
+        self.assertEqual(len(self.omit("city:acme")), 5)
+        self.assertEqual(len(self.omit("city:acme,globex")), 4)
+
+
+class FuzzyPartySearchTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_id_tables()
+        for number, name in [("1", "ACME Corporation"), ("2", "Acme Corp."), ("3", "Globex Inc.")]:
+            make_row(ApplicationInterestedParty, application_number=number, organization_name=name)
+
+    def search(self, **params):
+        resp = self.client.get(reverse("id_interested_party-list"), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data["results"]
+
+    def test_ranked_by_similarity(self):
+        rows = self.search(party_fuzzy="acme corp")
+        self.assertEqual([r["organization_name"] for r in rows], ["Acme Corp.", "ACME Corporation"])
+        self.assertGreater(rows[0]["similarity"], rows[1]["similarity"])
+
+    def test_min_similarity_narrows(self):
+        rows = self.search(party_fuzzy="acme corp", min_similarity=0.9)
+        self.assertEqual([r["organization_name"] for r in rows], ["Acme Corp."])
+
+
+@override_settings(DATA_VERSION_TTL=0)
+class ResponseCacheTests(TransactionTestCase):
+    # Not a TestCase: responses built inside its transaction are never cached.
+    def setUp(self):
+        cache.clear()
+        create_id_tables()
+        make_row(ApplicationMain, application_number="1")
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE')
+
+    def test_hit_conditional_get_and_invalidation(self):
+        url = reverse("id_main-list")
+        first = self.client.get(url, {"application_number": "1", "page_size": 5})
+        self.assertEqual((first.status_code, first["X-Cache"]), (status.HTTP_200_OK, "MISS"))
+
+        # Same parameters in another order: same entry.
+        second = self.client.get(f"{url}?page_size=5&application_number=1")
+        self.assertEqual((second["X-Cache"], second.content), ("HIT", first.content))
+        conditional = self.client.get(f"{url}?page_size=5&application_number=1", HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(conditional.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # A reload: the new rows are served, not the cached page.
+        make_row(ApplicationMain, application_number="1")
+        call_command("bump_data_version", stdout=io.StringIO())
+        third = self.client.get(url, {"application_number": "1", "page_size": 5})
+        self.assertEqual((third["X-Cache"], third.data["count"]), ("MISS", 2))
+        self.assertNotEqual(third["ETag"], first["ETag"])
+        stale = self.client.get(url, {"application_number": "1", "page_size": 5}, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(stale.status_code, status.HTTP_200_OK)
+
+    def test_streamed_dump_is_not_cached(self):
+        for _ in range(2):
+            resp = self.client.get(reverse("id_main-list"), {"all": "true"})
+            self.assertEqual(len(json.loads(b"".join(resp.streaming_content))), 1)
+            self.assertFalse(resp.has_header("X-Cache"))
+
+
+class EnsureSearchIndexesTests(TransactionTestCase):
+    # Not a TestCase: CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP SCHEMA IF EXISTS "{SCHEMA}" CASCADE')
+
+    def test_builds_missing_indexes_once_tables_exist(self):
+        with self.assertRaisesMessage(CommandError, "Tables not loaded yet"):
+            call_command("ensure_search_indexes", stdout=io.StringIO())
+
+        create_id_tables()
+        out = io.StringIO()
+        call_command("ensure_search_indexes", stdout=out)
+        indexes = [index for index, _, _ in search_indexes()]
+        self.assertIn(f"{len(indexes)} index(es) created", out.getvalue())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = %s", [SCHEMA])
+            self.assertLessEqual(set(indexes), {row[0] for row in cursor.fetchall()})
+        self.assertEqual(ensure_search_indexes(connection)[0], [])
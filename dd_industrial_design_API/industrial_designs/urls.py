@@ -12,5 +12,6 @@ router.register(r'application_interested_party', ApplicationInterestedPartyViewS
 router.register(r'assignment_correction', AssignmentCorrectionViewSet, basename='id_assignment_correction')
 router.register(r'assignment_interested_party', AssignmentInterestedPartyViewSet, basename='id_assignment_interested_party')
 router.register(r'assignment_main', AssignmentMainViewSet, basename='id_assignment_main')
+router.register(r'parquet', ParquetExportViewSet, basename='id_parquet')
 
 urlpatterns = router.urls
\ No newline at end of file
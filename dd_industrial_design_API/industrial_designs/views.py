@@ -1,8 +1,17 @@
+import json
+from datetime import date
+
 from rest_framework import viewsets
 from rest_framework import filters as drf_filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.utils.encoders import JSONEncoder
+from django.contrib.postgres.search import TrigramSimilarity
 from django.db import models
+from django.db.models.expressions import RawSQL
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 import django_filters as df
 
@@ -31,8 +40,33 @@ from .serializers import (
     AssignmentInterestedPartySerializer,
     AssignmentMainSerializer,
 )
+from .pagination import FlexiblePageNumberPagination
+from .parquet_export import EXPORT_MODELS, default_extract_date, stream_table
+from .streaming import export_database
+
+def omit_document_sql(model):
+    """
+    Every text column of `model` in one string, joined by a unit separator so
+    a match cannot straddle two columns. Each table has a trigram index on
+    exactly this expression (migration 0004).
+    """
+    columns = [
+        f.column for f in model._meta.concrete_fields
+        if isinstance(f, (models.CharField, models.TextField))
+    ]
+    return " || E'\\x1f' || ".join(f"coalesce(\"{column}\", '')" for column in columns)
+
+def like_pattern(word):
+    escaped = word.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
 
 class OmitFilterBackend(drf_filters.BaseFilterBackend):
+    """
+    ?omit=word excludes rows with `word` in any text column; ?omit=col:word
+    only looks at `col`. Bare words are matched against the indexed document
+    (omit_document_sql), and the matching ids are excluded with an anti-join,
+    instead of a NOT (col1 ILIKE ... OR col2 ILIKE ...) over every row.
+    """
     param = "omit"
 
     def filter_queryset(self, request, queryset, view):
@@ -51,22 +85,83 @@ class OmitFilterBackend(drf_filters.BaseFilterBackend):
         }
 
         overall_q = models.Q()
+        words = []
         for token in parts:
             if ":" in token:
                 col, word = token.split(":", 1)
                 if col in text_cols:
                     overall_q |= models.Q(**{f"{col}__icontains": word})
             else:
-                word = token
-                q = models.Q()
-                for col in text_cols:
-                    q |= models.Q(**{f"{col}__icontains": word})
-                overall_q |= q
+                words.append(token)
+
+        if words:
+            meta = queryset.model._meta
+            document = omit_document_sql(queryset.model)
+            matches = RawSQL(
+                f"SELECT {meta.pk.column} FROM {meta.db_table} WHERE "
+                + " OR ".join(f"({document}) ILIKE %s" for _ in words),
+                [like_pattern(word) for word in words],
+            )
+            overall_q |= models.Q(pk__in=matches)
 
         return queryset.exclude(overall_q)
 
+class ModifiedSinceFilterBackend(drf_filters.BaseFilterBackend):
+    """
+    ?modified_since=YYYY-MM-DD for sync clients. ID rows carry no change
+    date of their own, only the extract their schema was loaded from
+    (default_extract_date), so this is all or nothing: every row when that
+    extract is later than the date, none otherwise.
+    """
+    param = "modified_since"
+
+    def filter_queryset(self, request, queryset, view):
+        raw = request.query_params.get(self.param, "").strip()
+        if not raw:
+            return queryset
+        try:
+            since = date.fromisoformat(raw)
+        except ValueError:
+            raise ValidationError({self.param: ["Enter a date as YYYY-MM-DD."]})
+        if date.fromisoformat(default_extract_date()) > since:
+            return queryset
+        return queryset.none()
+
+class FuzzyNameFilterBackend(drf_filters.BaseFilterBackend):
+    """
+    ?party_fuzzy=acme corp&min_similarity=0.4 on views that set
+    `fuzzy_name_field`. Ranked by pg_trgm similarity; at or above the
+    default threshold (0.3) the `%` operator lets the trigram index serve it.
+    """
+    param = "party_fuzzy"
+    threshold_param = "min_similarity"
+    default_threshold = 0.3
+    index_threshold = 0.3
+
+    def get_threshold(self, request):
+        try:
+            threshold = float(request.query_params.get(self.threshold_param, self.default_threshold))
+        except (TypeError, ValueError):
+            threshold = self.default_threshold
+        return min(max(threshold, 0.0), 1.0)
+
+    def filter_queryset(self, request, queryset, view):
+        field = getattr(view, "fuzzy_name_field", None)
+        value = request.query_params.get(self.param, "").strip()
+        if not field or not value:
+            return queryset
+
+        threshold = self.get_threshold(request)
+        if threshold >= self.index_threshold:
+            queryset = queryset.filter(**{f"{field}__trigram_similar": value})
+        return queryset.annotate(
+            similarity=TrigramSimilarity(field, value),
+        ).filter(similarity__gte=threshold).order_by("-similarity")
+
 COMMON_FILTERS = [
+    ModifiedSinceFilterBackend,
     OmitFilterBackend,
+    FuzzyNameFilterBackend,
     DjangoFilterBackend,
     drf_filters.OrderingFilter,
     drf_filters.SearchFilter,
@@ -88,25 +183,82 @@ def make_ab_filterset(model):
 
     return type(f"{model.__name__}FilterSet", (df.FilterSet,), attrs)
 
+# Generated FilterSets, one per model for the life of the process. Filled for
+# every ReadOnlyMixin view at startup (IndustrialDesignsConfig.ready), so no
+# request pays for building one.
+AB_FILTERSETS = {}
+
+def ab_filterset_for(model):
+    filterset = AB_FILTERSETS.get(model)
+    if filterset is None:
+        filterset = AB_FILTERSETS[model] = make_ab_filterset(model)
+    return filterset
+
 class ReadOnlyMixin(viewsets.ReadOnlyModelViewSet):
+    """
+    List endpoints are paginated (`?page=`, `?page_size=` up to
+    FlexiblePageNumberPagination.max_page_size). `?all=true` is the explicit
+    full dump: the filtered rows are streamed as one JSON array, read from a
+    server-side cursor `all_chunk_size` rows at a time, so memory stays flat
+    however large the table (see streaming.export_database).
+    """
     lookup_field = "id"
     lookup_url_kwarg = "pk"
-    pagination_class = None
+    pagination_class = FlexiblePageNumberPagination
     filter_backends = COMMON_FILTERS
     ordering_fields = "__all__"
     search_fields = "__all__"
+    all_param = "all"
+    all_chunk_size = 2000
 
     # helper route
     @property
     def filterset_class(self):
-        if not hasattr(self, "_ab_filterset"):
-            self._ab_filterset = make_ab_filterset(self.queryset.model)
-        return self._ab_filterset
-    
+        return ab_filterset_for(self.queryset.model)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Pages (and the streamed dump) need a stable order.
+        return queryset if queryset.ordered else queryset.order_by(self.lookup_field)
+
+    def wants_all(self):
+        return self.request.query_params.get(self.all_param, "").lower() in ("true", "1", "yes")
+
+    def list(self, request, *args, **kwargs):
+        if self.wants_all():
+            return self.stream_all(self.filter_queryset(self.get_queryset()))
+        return super().list(request, *args, **kwargs)
+
+    def stream_all(self, queryset):
+        queryset = queryset.using(export_database(queryset.model))
+        response = StreamingHttpResponse(self._json_array(queryset), content_type="application/json")
+        response["Content-Disposition"] = f'attachment; filename="{self.basename}.json"'
+        return response
+
+    def _json_array(self, queryset):
+        # Same rows as the unpaginated list used to return, one chunk at a time.
+        yield b"["
+        separator = b""
+        batch = []
+        for obj in queryset.iterator(chunk_size=self.all_chunk_size):
+            batch.append(obj)
+            if len(batch) >= self.all_chunk_size:
+                yield separator + self._serialize_batch(batch)
+                separator, batch = b",", []
+        if batch:
+            yield separator + self._serialize_batch(batch)
+        yield b"]"
+
+    def _serialize_batch(self, batch):
+        data = self.get_serializer(batch, many=True).data
+        return ",".join(json.dumps(row, cls=JSONEncoder, ensure_ascii=False) for row in data).encode("utf-8")
+
     @action(detail=False, url_path=r"by-number/(?P<number>[^/]+)")
     def by_number(self, request, number=None):
         field = getattr(self, "number_field", "application_number")
         qs = self.filter_queryset(self.get_queryset().filter(**{field: number}))
+        if self.wants_all():
+            return self.stream_all(qs)
         page = self.paginate_queryset(qs)
         if page is not None:
             return self.get_paginated_response(self.get_serializer(page, many=True).data)
@@ -164,6 +316,7 @@ class ApplicationInterestedPartyViewSet(ReadOnlyMixin):
     filter_backends = COMMON_FILTERS
     search_fields = ["application_number", "last_name", "organization_name"]
     ordering_fields = ["application_number", "last_name", "organization_name"]
+    fuzzy_name_field = "organization_name"
 
 # ---------------------------------------------------------------------------------------
 
@@ -193,6 +346,7 @@ class AssignmentInterestedPartyViewSet(ReadOnlyMixin):
     filter_backends = COMMON_FILTERS
     search_fields = ["assignment_number", "last_name", "organization_name"]
     ordering_fields = ["assignment_number", "last_name", "organization_name"]
+    fuzzy_name_field = "organization_name"
 
 # ---------------------------------------------------------------------------------------
 
@@ -206,3 +360,36 @@ class AssignmentMainViewSet(ReadOnlyMixin):
         "assignment_registration_date",
         "assignment_status",
     ]
+
+# ---------------------------------------------------------------------------------------
+
+class ParquetExportViewSet(viewsets.ViewSet):
+    """
+    Whole-table Parquet snapshots for analytics, instead of paging through
+    the JSON endpoints.
+
+    * `/designs/parquet/` lists the tables and the extract date of the data.
+    * `/designs/parquet/<table>/` streams that table as one Parquet file,
+      read from a server-side cursor a row group at a time. Code columns are
+      dictionary-encoded; the extract date is in the file metadata.
+
+    For partitioned files on disk use `manage.py export_parquet`.
+    """
+    lookup_value_regex = "[a-z_]+"
+
+    def list(self, request):
+        return Response({
+            "extract_date": default_extract_date(),
+            "tables": {
+                name: reverse("id_parquet-detail", args=[name], request=request)
+                for name in EXPORT_MODELS
+            },
+        })
+
+    def retrieve(self, request, pk=None):
+        if pk not in EXPORT_MODELS:
+            raise Http404(f"No Parquet export for '{pk}'.")
+        response = StreamingHttpResponse(stream_table(pk, using=export_database(EXPORT_MODELS[pk])),
+                                         content_type="application/vnd.apache.parquet")
+        response["Content-Disposition"] = f'attachment; filename="{pk}.parquet"'
+        return response
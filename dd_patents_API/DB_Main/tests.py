@@ -10,3 +10,11 @@ class HealthCheckTest(TestCase):
         url = reverse('health_check')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_db_health_check(self):
+        """
+        Reports every database and the configured pool mode.
+        """
+        response = self.client.get(reverse('db_health_check'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['databases']['default']['status'], 'ok')
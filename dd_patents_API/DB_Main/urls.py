@@ -1,4 +1,8 @@
+import time
+
+from django.conf import settings
 from django.contrib import admin
+from django.db import DatabaseError, connections
 from django.urls import path, include
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
@@ -6,6 +10,7 @@ from rest_framework import permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.http import JsonResponse
+from patents.views_applicants import ApplicantSearchView
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -21,10 +26,35 @@ schema_view = get_schema_view(
 def health(request):
     return JsonResponse({"status": "ok"})
 
+
+def db_health(request):
+    """Round trip to every configured database, with the connection pool's statistics."""
+    databases, healthy = {}, True
+    for connection in connections.all():
+        started = time.monotonic()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            entry = {'status': 'ok', 'latency_ms': round((time.monotonic() - started) * 1000, 2)}
+        except DatabaseError as e:
+            healthy = False
+            entry = {'status': 'error', 'error': str(e)}
+        pool = getattr(connection, 'pool', None)
+        if pool is not None:
+            entry['pool'] = pool.get_stats()
+        databases[connection.alias] = entry
+    return JsonResponse(
+        {'status': 'ok' if healthy else 'error', 'pool_mode': settings.DB_POOL_MODE, 'databases': databases},
+        status=200 if healthy else 503,
+    )
+
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('health/', health, name='health_check'),
+    path('health/db/', db_health, name='db_health_check'),
     path("patents/", include("patents.urls")),
+    path('applicants/', ApplicantSearchView.as_view(), name='applicant_search'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     # Export endpoints:
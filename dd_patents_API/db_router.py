@@ -1,24 +1,64 @@
+"""
+Primary/replica routing.
+
+Writes, migrations and anything inside a transaction on the primary go to
+'default'. Other reads are spread round-robin over the read replicas
+configured in settings (the `replica_*` aliases built from DB_REPLICA_HOSTS).
+With no replicas configured every query stays on 'default'.
+
+Import jobs, and any other code that has to read its own writes, can pin
+their reads to the primary with `use_primary()`.
+"""
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import cycle
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_PREFIX = 'replica_'
+
+_pinned = ContextVar('db_router_pinned', default=False)
+
+
+@contextmanager
+def use_primary():
+    """Send every read made inside the block to the primary."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
 class DBRouter:
+    def __init__(self):
+        self.replicas = [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+        self.aliases = {DEFAULT_DB_ALIAS, *self.replicas}
+        self._next_replica = cycle(self.replicas).__next__ if self.replicas else None
+
     def db_for_read(self, model, **hints):
-        print(f"Reading from: {model._meta.app_label}")
-        if model._meta.app_label == 'trademarks':
-            return 'trademarks_db'
-        return 'default'
+        if self._next_replica is None or _pinned.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        alias = self._next_replica()
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Reading %s from %s", model._meta.label, alias)
+        return alias
 
     def db_for_write(self, model, **hints):
-        print(f"Writing to: {model._meta.app_label}")
-        if model._meta.app_label == 'trademarks':
-            return 'trademarks_db'
-        return 'default'
+        return DEFAULT_DB_ALIAS
 
     def allow_relation(self, obj1, obj2, **hints):
-        print(f"Allow relation between: {obj1._meta.app_label} and {obj2._meta.app_label}")
-        if obj1._meta.app_label == 'trademarks' or obj2._meta.app_label == 'trademarks':
+        # Replicas hold the same data as the primary.
+        if obj1._state.db in self.aliases and obj2._state.db in self.aliases:
             return True
         return None
 
     def allow_migrate(self, db, app_label, model_name=None, **hints):
-        print(f"Allow migrate: db={db}, app_label={app_label}")
-        if app_label == 'trademarks':
-            return db == 'trademarks_db'
-        return db == 'default'
+        return db == DEFAULT_DB_ALIAS
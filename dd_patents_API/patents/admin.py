@@ -1,6 +1,6 @@
 
 from django.contrib import admin
-from .models import PT_Main, PT_Priority_Claim, PT_Interested_Party, PT_Abstract, PT_Disclosure, PT_Claim, PT_IPC_Classification
+from .models import PT_Main, PT_Priority_Claim, PT_Interested_Party, PT_Abstract, PT_Disclosure, PT_Claim, PT_IPC_Classification, PT_Import_File
 
 class PTMainAdmin(admin.ModelAdmin):
     list_display = ('patent_number', 'filing_date', 'grant_date', 'application_patent_title_english')
@@ -30,6 +30,11 @@ class PTIPCClassificationAdmin(admin.ModelAdmin):
     list_display = ('patent_number', 'ipc_classification_sequence_number', 'ipc_section_code')
     search_fields = ('patent_number__patent_number', 'ipc_section_code')
 
+class PTImportFileAdmin(admin.ModelAdmin):
+    list_display = ('loader', 'file_name', 'member_name', 'status', 'row_offset', 'rows_loaded', 'finished_at')
+    list_filter = ('loader', 'status')
+    search_fields = ('file_name', 'member_name')
+
 admin.site.register(PT_Main, PTMainAdmin)
 admin.site.register(PT_Priority_Claim, PTPriorityClaimAdmin)
 admin.site.register(PT_Interested_Party, PTInterestedPartyAdmin)
@@ -37,3 +42,4 @@ admin.site.register(PT_Abstract, PTAbstractAdmin)
 admin.site.register(PT_Disclosure, PTDisclosureAdmin)
 admin.site.register(PT_Claim, PTClaimAdmin)
 admin.site.register(PT_IPC_Classification, PTIPCClassificationAdmin)
+admin.site.register(PT_Import_File, PTImportFileAdmin)
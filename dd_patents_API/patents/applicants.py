@@ -0,0 +1,186 @@
+"""
+Cross-IP applicant search: every patent, trademark and industrial design
+one party holds.
+
+The three datasets live in three databases. A party name is reduced to a
+key: case, accents, punctuation and trailing legal forms are dropped, so
+'ACME Widgets, Inc.' and 'Acme Widgets' share the key 'acme widgets'. Each
+database is searched on its own worker thread. The trigram index on its
+party-name column finds the candidate rows, and a row belongs to the party
+when its name reduces to the same key.
+
+Every source gets APPLICANT_SEARCH_TIMEOUT seconds. The limit is enforced
+here and also as the query's statement_timeout, so an abandoned query does
+not keep running. A source that is slow, failing or not configured is
+reported in the result instead of failing the whole search.
+
+Each source returns at most APPLICANT_SEARCH_MAX_CANDIDATES candidate rows,
+closest names first; a source that had more is reported as truncated. A
+complete result is cached for APPLICANT_SEARCH_CACHE_TIMEOUT seconds, so
+paging through it does not search every database again.
+"""
+import hashlib
+import re
+import time
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connections, router, transaction
+
+from .models import PT_Interested_Party, PT_Main
+
+# Dropped from the end of a name, after punctuation is gone ('S.A.' -> 'sa').
+LEGAL_FORMS = frozenset({
+    'ab', 'ag', 'as', 'bv', 'co', 'company', 'corp', 'corporation', 'gmbh', 'inc', 'incorporated', 'kg', 'kk',
+    'limited', 'llc', 'llp', 'lp', 'ltd', 'ltee', 'nv', 'oy', 'plc', 'pty', 'sa', 'sarl', 'sas', 'spa', 'srl',
+})
+
+QUERY_CANCELED = '57014'  # SQLSTATE of a query stopped by statement_timeout
+
+# Schema the industrial design API reads (industrial_designs.models.SCHEMA).
+DESIGNS_SCHEMA = 'id_csv_2024_03_07'
+
+# Source -> query returning (number, party name, role, country code, title)
+# for the candidate rows. The parameters are an ILIKE pattern and the key for
+# pg_trgm's % operator, both served by the party-name trigram index, then the
+# key again to rank the candidates by similarity and the row limit.
+SOURCE_QUERIES = {
+    'patents': f"""
+        SELECT ip.patent_number_id, ip.party_name, ip.interested_party_type, ip.party_country_code,
+               m.application_patent_title_english
+        FROM {PT_Interested_Party._meta.db_table} ip
+        JOIN {PT_Main._meta.db_table} m ON m.patent_number = ip.patent_number_id
+        WHERE ip.party_name ILIKE %s OR ip.party_name %% %s
+        ORDER BY similarity(ip.party_name, %s) DESC
+        LIMIT %s
+    """,
+    'trademarks': """
+        SELECT ip.application_number, ip.party_name, ip.party_type_code::text, ip.party_country_code,
+               m.mark_verbal_element_text
+        FROM tm_interested_party ip
+        LEFT JOIN tm_main m ON m.application_number = ip.application_number
+        WHERE ip.party_name ILIKE %s OR ip.party_name %% %s
+        ORDER BY similarity(ip.party_name, %s) DESC
+        LIMIT %s
+    """,
+    'designs': f"""
+        SELECT ip.application_number, ip.organization_name, ip.role, ip.country_code, m.design_title
+        FROM "{DESIGNS_SCHEMA}".application_interested_party ip
+        LEFT JOIN "{DESIGNS_SCHEMA}".application_main m
+               ON m.application_number = ip.application_number AND m.extension_number = ip.extension_number
+        WHERE ip.organization_name ILIKE %s OR ip.organization_name %% %s
+        ORDER BY similarity(ip.organization_name, %s) DESC
+        LIMIT %s
+    """,
+}
+
+
+def party_key(name):
+    """'Société ACME Widgets, Inc.' -> 'societe acme widgets'."""
+    text = unicodedata.normalize('NFKD', name or '').replace('.', '')
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    words = re.sub(r'[\W_]+', ' ', text).split()
+    while len(words) > 1 and words[-1] in LEGAL_FORMS:
+        words.pop()
+    return ' '.join(words)
+
+
+def source_aliases():
+    """Source -> database alias. Sources without a configured database are left out."""
+    return {'patents': router.db_for_read(PT_Interested_Party), **settings.APPLICANT_SEARCH_DATABASES}
+
+
+@lru_cache(maxsize=None)
+def _executor():
+    # Shared by every request, so each worker keeps its connections between searches (CONN_MAX_AGE / pool).
+    return ThreadPoolExecutor(max_workers=settings.APPLICANT_SEARCH_WORKERS, thread_name_prefix='applicants')
+
+
+def _query(alias, sql, params, timeout):
+    """Run on a worker thread: (rows, milliseconds taken)."""
+    started = time.monotonic()
+    connection = connections[alias]
+    connection.close_if_unusable_or_obsolete()
+    try:
+        with transaction.atomic(using=alias), connection.cursor() as cursor:
+            cursor.execute("SELECT set_config('statement_timeout', %s, true)", [str(max(1, int(timeout * 1000)))])
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    finally:
+        connection.close_if_unusable_or_obsolete()
+    return rows, round((time.monotonic() - started) * 1000, 2)
+
+
+def holdings(source, rows, key):
+    """One entry per IP number among `rows` whose party name reduces to `key`."""
+    grouped = {}
+    for number, party_name, role, country_code, title in rows:
+        if party_key(party_name) != key:
+            continue
+        holding = grouped.setdefault(number, {
+            'source': source, 'number': number, 'title': title, 'party_names': [], 'roles': [], 'country_codes': [],
+        })
+        for field, value in (('party_names', party_name), ('roles', role), ('country_codes', country_code)):
+            if value and value not in holding[field]:
+                holding[field].append(value)
+    return [grouped[number] for number in sorted(grouped, key=lambda number: (len(number), number))]
+
+
+def find_party(key, timeout=None):
+    """
+    Search every source for `key` (see party_key) concurrently.
+    Returns (holdings, sources): holdings in source order, then by number,
+    and each source's status -- ok (with its count and time), timeout,
+    error or not_configured.
+    """
+    timeout = settings.APPLICANT_SEARCH_TIMEOUT if timeout is None else timeout
+    limit = settings.APPLICANT_SEARCH_MAX_CANDIDATES
+    # One row more than the limit tells a source that was cut short.
+    params = [f"%{'%'.join(key.split())}%", key, key, limit + 1]
+    futures = {
+        source: _executor().submit(_query, alias, SOURCE_QUERIES[source], params, timeout)
+        for source, alias in source_aliases().items()
+    }
+    wait(futures.values(), timeout=timeout)
+
+    found, sources = [], {}
+    for source in SOURCE_QUERIES:
+        future = futures.get(source)
+        if future is None:
+            sources[source] = {'status': 'not_configured'}
+        elif not future.done():
+            future.cancel()
+            sources[source] = {'status': 'timeout'}
+        else:
+            try:
+                rows, elapsed = future.result()
+            except DatabaseError as e:
+                if getattr(e.__cause__, 'sqlstate', None) == QUERY_CANCELED:
+                    sources[source] = {'status': 'timeout'}
+                else:
+                    sources[source] = {'status': 'error', 'error': str(e)}
+                continue
+            truncated = len(rows) > limit
+            matched = holdings(source, rows[:limit], key)
+            sources[source] = {'status': 'ok', 'count': len(matched), 'ms': elapsed, 'truncated': truncated}
+            found.extend(matched)
+    return found, sources
+
+
+def cached_find_party(key):
+    """
+    find_party(key), served from the cache when the same search, against
+    the same databases, completed in the last APPLICANT_SEARCH_CACHE_TIMEOUT
+    seconds. Results with a source that timed out or failed are not kept.
+    """
+    aliases = sorted(source_aliases().items())
+    cache_key = 'applicants:' + hashlib.sha1(repr((key, aliases)).encode()).hexdigest()
+    result = cache.get(cache_key)
+    if result is None:
+        result = find_party(key)
+        if all(source['status'] in ('ok', 'not_configured') for source in result[1].values()):
+            cache.set(cache_key, result, settings.APPLICANT_SEARCH_CACHE_TIMEOUT)
+    return result
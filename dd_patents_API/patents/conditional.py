@@ -0,0 +1,68 @@
+"""
+Conditional GETs keyed on PT_Main.bibliographic_file_extract_date.
+
+A patent's rows are only rewritten by a newer bibliographic extract, so the
+extract date is when the record last changed. Detail responses carry that
+date as Last-Modified; list pages carry the newest date on the page. Both
+also get an ETag over the URL and the (key, extract date) pairs behind the
+response. A sync client that sends If-None-Match or If-Modified-Since gets
+a 304, without serialization, when nothing it asked for has changed.
+"""
+import hashlib
+from datetime import datetime, timezone
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .models import PT_Main
+
+EXTRACT_DATE = 'bibliographic_file_extract_date'
+
+
+class ExtractDateConditionalMixin:
+    """For read-only viewsets over PT_Main or a table keyed on it by `patent_number`."""
+
+    def extract_dates(self, rows):
+        """Extract date of every row, in order. Child rows cost one PT_Main lookup per page."""
+        if not rows or isinstance(rows[0], PT_Main):
+            return [getattr(row, EXTRACT_DATE) for row in rows]
+        patents = PT_Main.objects.filter(pk__in={row.patent_number_id for row in rows})
+        dates = dict(patents.values_list('pk', EXTRACT_DATE))
+        return [dates.get(row.patent_number_id) for row in rows]
+
+    def validators(self, request, rows, count=None):
+        """(ETag, Last-Modified timestamp or None) for a response built from `rows`."""
+        dates = self.extract_dates(rows)
+        digest = hashlib.sha1(request.get_full_path().encode())
+        digest.update(repr((count, [(row.pk, date) for row, date in zip(rows, dates)])).encode())
+        latest = max(filter(None, dates), default=None)
+        if latest is not None:
+            latest = int(datetime(latest.year, latest.month, latest.day, tzinfo=timezone.utc).timestamp())
+        return f'W/"{digest.hexdigest()[:24]}"', latest
+
+    def conditional(self, request, rows, build, count=None):
+        """Answer with a 304 when the client's copy of `rows` is current, else `build()` it."""
+        etag, last_modified = self.validators(request, rows, count)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified) or build()
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        return self.conditional(request, [instance], lambda: Response(self.get_serializer(instance).data))
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            rows = list(queryset)
+            return self.conditional(request, rows, lambda: Response(self.get_serializer(rows, many=True).data))
+        page = list(page)
+        paginated = getattr(self.paginator, 'page', None)
+        count = None if getattr(self.paginator, 'keyset_mode', False) or paginated is None else paginated.paginator.count
+        return self.conditional(
+            request, page, lambda: self.get_paginated_response(self.get_serializer(page, many=True).data), count,
+        )
@@ -1,4 +1,14 @@
+from functools import reduce
+from operator import or_
+
 import django_filters
+from django.contrib.postgres.search import (
+    SearchHeadline, SearchQuery, SearchRank, TrigramSimilarity,
+)
+from django.db.models import F
+from rest_framework.filters import BaseFilterBackend
+
+from .models import FTS_CONFIGS, filing_language_config
 
 class OmitFilter(django_filters.CharFilter):
     """
@@ -18,3 +28,70 @@ class ListFilter(django_filters.BaseInFilter, django_filters.CharFilter):
     Example: ?field__in=value1,value2,value3
     """
     pass
+
+class TrigramSimilarityFilter(django_filters.CharFilter):
+    """
+    Fuzzy name match ranked by pg_trgm similarity, best match first.
+    Example: ?party_fuzzy=acme corp&min_similarity=0.4
+    At or above pg_trgm's default threshold (0.3) the `%` operator is used
+    so the trigram GIN index can serve the lookup; lower thresholds fall
+    back to scoring every row. Hits carry a `similarity` score.
+    """
+    threshold_param = 'min_similarity'
+    default_threshold = 0.3
+    index_threshold = 0.3
+
+    def get_threshold(self):
+        try:
+            threshold = float(self.parent.data.get(self.threshold_param, self.default_threshold))
+        except (TypeError, ValueError):
+            threshold = self.default_threshold
+        return min(max(threshold, 0.0), 1.0)
+
+    def filter(self, qs, value):
+        value = (value or '').strip()
+        if not value:
+            return qs
+        threshold = self.get_threshold()
+        if threshold >= self.index_threshold:
+            qs = qs.filter(**{f'{self.field_name}__trigram_similar': value})
+        return qs.annotate(
+            similarity=TrigramSimilarity(self.field_name, value),
+        ).filter(similarity__gte=threshold).order_by('-similarity')
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search over the view's `search_text_field`, backed by
+    the stored `search_vector` column and its GIN index.
+    Example: ?q=lithium battery -cobalt&q_lang=en
+    `q` takes web-search syntax (quotes, OR, -word). Without `q_lang` the
+    query is parsed as both English and French so filings in either
+    language match. Hits carry `rank` and a highlighted `headline`.
+    """
+    search_param = 'q'
+    language_param = 'q_lang'
+
+    def get_search_query(self, request):
+        terms = request.query_params.get(self.search_param, '').strip()
+        if not terms:
+            return None
+        lang = request.query_params.get(self.language_param, '').strip().lower()
+        configs = [FTS_CONFIGS[lang]] if lang in FTS_CONFIGS else FTS_CONFIGS.values()
+        return reduce(or_, (SearchQuery(terms, config=c, search_type='websearch') for c in configs))
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_search_query(request)
+        if query is None:
+            return queryset
+        return queryset.filter(search_vector=query).annotate(
+            rank=SearchRank(F('search_vector'), query),
+            headline=SearchHeadline(
+                view.search_text_field,
+                query,
+                config=filing_language_config(),
+                start_sel='<b>',
+                stop_sel='</b>',
+                max_fragments=3,
+            ),
+        ).order_by('-rank')
@@ -0,0 +1,90 @@
+"""
+Cleaning of raw CSV values before COPY, shared by the patents loaders.
+
+clean_cell() is the rule for one value. clean_frame() applies the same rule
+a column at a time to a chunk read with pandas, which is how the loaders
+clean whole files; the two are tested against each other.
+"""
+from datetime import datetime
+
+import pandas as pd
+
+COPY_NULL = r'\N'
+INVALID_DATES = ('', 'NULL', '-1')
+CHUNK_SIZE = 50_000  # Rows cleaned per vectorised pass
+
+
+def clean_cell(value, rule):
+    """Clean one raw CSV value; returns None for SQL NULL."""
+    if value is not None:
+        value = ''.join(char for char in value if char.isprintable()).strip()
+
+    kind = rule['kind']
+    if kind == 'date':
+        if value in INVALID_DATES or value is None:
+            return None
+        try:
+            datetime.strptime(value, '%Y-%m-%d')
+        except ValueError:
+            return None
+        return value
+    if kind == 'bool':
+        return 'FALSE' if value in ('', 'NULL', None) else value
+
+    if value is None or (rule['null'] and value in ('', 'NULL')):
+        return None
+    if rule['max_length'] and len(value) > rule['max_length']:
+        value = value[:rule['max_length']]
+    return value
+
+
+def _printable(value):
+    return ''.join(char for char in value if char.isprintable())
+
+
+def clean_frame(df, rules):
+    """
+    clean_cell() over a whole chunk. `df` holds the raw values as strings,
+    with NaN for a field missing from a short row, and `rules` maps each of
+    its columns to a rule. Returns an object frame with None for NULL.
+    """
+    cleaned = {}
+    for column, rule in rules.items():
+        missing = df[column].isna()
+        text = df[column].fillna('').astype(object)
+        # Nearly every value is printable already; only the rest are filtered a character at a time.
+        unprintable = ~text.map(str.isprintable)
+        if unprintable.any():
+            text[unprintable] = text[unprintable].map(_printable)
+        text = text.str.strip()
+
+        kind = rule['kind']
+        if kind == 'date':
+            parsed = pd.to_datetime(text, format='%Y-%m-%d', errors='coerce')
+            null = missing | text.isin(INVALID_DATES) | parsed.isna()
+        elif kind == 'bool':
+            text = text.mask(missing | text.isin(['', 'NULL']), 'FALSE')
+            null = pd.Series(False, index=df.index)
+        else:
+            null = missing | text.isin(['', 'NULL']) if rule['null'] else missing
+            if rule['max_length']:
+                text = text.str.slice(0, rule['max_length'])
+        cleaned[column] = text.astype(object).mask(null, None)
+    return pd.DataFrame(cleaned, index=df.index)
+
+
+def read_chunks(stream, columns, skip_rows=0, chunk_size=CHUNK_SIZE):
+    """
+    Read the rest of a pipe-delimited CSV (after its header), less its first
+    `skip_rows` rows, as string DataFrames of up to `chunk_size` rows with
+    the given column names.
+    """
+    return pd.read_csv(
+        stream, sep='|', header=None, names=columns, dtype=str, keep_default_na=False,
+        skiprows=skip_rows, chunksize=chunk_size,
+    )
+
+
+def to_copy_csv(df):
+    """A cleaned chunk as COPY-ready CSV text, NULL written as COPY_NULL."""
+    return df.to_csv(sep='|', index=False, header=False, na_rep=COPY_NULL, lineterminator='\n')
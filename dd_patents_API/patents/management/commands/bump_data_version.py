@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from patents.management.import_ledger import bump_data_version
+
+
+class Command(BaseCommand):
+    help = (
+        'Invalidates every cached API response. The import ledger does this when a '
+        'file finishes loading; run it after changing the data any other way.'
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            bump_data_version(cursor)
+            cursor.execute('SELECT version FROM patents_pt_data_version WHERE id = 1')
+            version = cursor.fetchone()[0]
+        self.stdout.write(self.style.SUCCESS(f'Data version is now {version}.'))
@@ -0,0 +1,53 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from patents.parquet_export import BATCH_SIZE, COMPRESSION, EXPORT_MODELS, ROWS_PER_FILE, default_extract_date, export_table
+from patents.streaming import ExportUnavailable
+
+
+class Command(BaseCommand):
+    help = (
+        'Writes patents tables to partitioned, compressed Parquet files '
+        '(<directory>/<table>/part-NNNNN.parquet) for analytics.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Directory the table directories are written to.')
+        parser.add_argument('tables', nargs='*', metavar='table',
+                            help=f"Tables to export (default: all of {', '.join(EXPORT_MODELS)}).")
+        parser.add_argument(
+            '--extract-date',
+            help='Extract date recorded in the file metadata (default: latest bibliographic_file_extract_date).',
+        )
+        parser.add_argument('--rows-per-file', type=int, default=ROWS_PER_FILE,
+                            help='Rows per part file (default: %(default)s).')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help='Rows per cursor fetch and Parquet row group (default: %(default)s).')
+        parser.add_argument('--compression', default=COMPRESSION,
+                            help='Parquet compression codec (default: %(default)s).')
+
+    def handle(self, *args, **options):
+        unknown = [t for t in options['tables'] if t not in EXPORT_MODELS]
+        if unknown:
+            raise CommandError(f"Unknown table(s): {', '.join(unknown)}")
+        if options['rows_per_file'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--rows-per-file and --batch-size must be at least 1')
+
+        os.makedirs(options['directory'], exist_ok=True)
+        extract_date = options['extract_date']
+        if extract_date is None:
+            extract_date = default_extract_date()
+        for name in options['tables'] or EXPORT_MODELS:
+            try:
+                rows, files = export_table(
+                    name,
+                    options['directory'],
+                    extract_date=extract_date,
+                    rows_per_file=options['rows_per_file'],
+                    batch_size=options['batch_size'],
+                    compression=options['compression'],
+                )
+            except ExportUnavailable as e:
+                raise CommandError(e.detail)
+            self.stdout.write(self.style.SUCCESS(f'{name}: {rows} rows in {files} file(s).'))
@@ -0,0 +1,69 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from patents.management.copy_loader import DATASETS, bulk_load, load_parallel
+
+
+class Command(BaseCommand):
+    help = (
+        'Streams every CSV (loose or inside ZIPs) under a directory into a patents '
+        'table with COPY, one worker process and connection per file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(DATASETS))
+        parser.add_argument('directory', help='Directory (or single file) holding the ZIP/CSV extracts.')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count(),
+            help='Files loaded at once (default: CPU count).',
+        )
+        parser.add_argument(
+            '--work-mem', default='256MB',
+            help="work_mem for each worker's session (default: 256MB).",
+        )
+        parser.add_argument(
+            '--defer-constraints', action='store_true',
+            help='Drop secondary indexes and foreign keys for the load, then rebuild and validate them.',
+        )
+        parser.add_argument(
+            '--maintenance-work-mem', default='1GB',
+            help='maintenance_work_mem used to rebuild deferred indexes (default: 1GB).',
+        )
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options['directory']):
+            raise CommandError(f"Not found: {options['directory']}")
+        if options['workers'] < 1:
+            raise CommandError('--workers must be at least 1')
+
+        violations = {}
+        if options['defer_constraints']:
+            results, violations = bulk_load(
+                options['dataset'],
+                options['directory'],
+                workers=options['workers'],
+                work_mem=options['work_mem'],
+                maintenance_work_mem=options['maintenance_work_mem'],
+            )
+        else:
+            results = load_parallel(
+                options['dataset'],
+                options['directory'],
+                workers=options['workers'],
+                work_mem=options['work_mem'],
+            )
+
+        failed = sorted(label for label, rows in results.items() if rows is None)
+        loaded = sum(rows for rows in results.values() if rows)
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {loaded} rows from {len(results) - len(failed)} file(s) into {options['dataset']}."
+        ))
+        for label in failed:
+            self.stderr.write(self.style.ERROR(f'Failed: {label}'))
+        for name, count in sorted(violations.items()):
+            self.stderr.write(self.style.ERROR(f'{name}: {count} violating row(s)'))
+        if failed:
+            raise CommandError(f'{len(failed)} file(s) failed to load.')
+        if violations:
+            raise CommandError(f'{len(violations)} constraint(s) could not be validated.')
@@ -1,12 +1,11 @@
 import os
+import io
 import sys
 import psycopg2
 import zipfile
 import csv
 import logging
 from django.conf import settings
-from datetime import datetime
-from psycopg2.extras import execute_values
 import traceback
 
 # Add the project directory to the Python path
@@ -15,6 +14,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'DB_Main.settings')
 import django
 django.setup()
 
+from patents.management.import_ledger import bump_data_version
+
 # Define the directory for ZIP files and the table name
 directory = 'c:/Users/Intern_1/Documents/PT_Data/PT_ipc'
 table_schema = 'public'  # Update if your table is in a different schema
@@ -63,111 +64,108 @@ CSV_TO_DB_FIELD_MAPPING = {
     'IPC Subgroup - Sous-groupe de la CIB': 'ipc_subgroup',
 }
 
-def clean_value(value, max_length=None, field_type=str):
+# Columns that are not plain text; everything else is truncated to its max length.
+FIELD_TYPES = {
+    'ipc_classification_sequence_number': 'integer',
+    'ipc_version_date': 'date',
+}
+DATE_PATTERN = r'^[0-9]{4}-(0[1-9]|1[0-2])-(0[1-9]|[12][0-9]|3[01])$'
+
+# Raw CSV text is COPY'd here first. UNLOGGED skips WAL for rows that only
+# live until the merge below.
+staging_table = f'"{table_schema}"."{table_name}_stage"'
+main_table = f'"{table_schema}"."patents_pt_main"'
+
+def create_staging_table(conn):
     """
-    Cleans a field value, truncating it if it exceeds the max length and converting to the appropriate type.
+    (Re)creates the all-text staging table, one column per target column.
     """
-    if value is None or value == '':
-        return None
-    value = ''.join(char for char in str(value) if char.isprintable()).strip()
+    columns = ', '.join(f"{field} text" for field in FIELD_MAX_LENGTHS)
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        cur.execute(f"CREATE UNLOGGED TABLE {staging_table} ({columns})")
+    conn.commit()
+
+def clean_expression(field):
+    """
+    Per-column cleaning done by PostgreSQL: strip control characters and
+    whitespace, empty -> NULL, then cast or truncate. A value the cast would
+    reject (out of range, or a day the month does not have) becomes NULL,
+    so one bad row cannot abort the merge. The nested CASEs make sure each
+    check runs before the cast it guards.
+    """
+    value = f"NULLIF(btrim(regexp_replace({field}, '[[:cntrl:]]', '', 'g')), '')"
+    field_type = FIELD_TYPES.get(field)
+    if field_type == 'integer':
+        return (
+            f"CASE WHEN {value} ~ '^-?[0-9]{{1,18}}$' THEN "
+            f"CASE WHEN ({value})::bigint BETWEEN -2147483648 AND 2147483647 THEN ({value})::integer END END"
+        )
     if field_type == 'date':
-        try:
-            return datetime.strptime(value, '%Y-%m-%d').date()
-        except ValueError:
-            logging.warning(f"Invalid date format: {value}")
-            return None
-    elif field_type == 'int':
-        try:
-            return int(value)
-        except ValueError:
-            logging.warning(f"Invalid integer value: {value}")
-            return None
-    if max_length and len(value) > max_length:
-        logging.warning(f"Value truncated: {value} to {value[:max_length]}")
-        return value[:max_length]
+        # The first of the month is always valid once the pattern matched and the year is not 0000.
+        last_day = f"extract(day from (left({value}, 8) || '01')::date + interval '1 month' - interval '1 day')"
+        return (
+            f"CASE WHEN {value} ~ '{DATE_PATTERN}' AND left({value}, 4) <> '0000' THEN "
+            f"CASE WHEN right({value}, 2)::integer <= {last_day} THEN ({value})::date END END"
+        )
+    if FIELD_MAX_LENGTHS[field]:
+        return f"left({value}, {FIELD_MAX_LENGTHS[field]})"
     return value
 
-def preprocess_headers(reader):
+def merge_sql():
     """
-    Maps the complex CSV headers to simple field names based on the mapping dictionary.
+    One set-based INSERT ... SELECT from staging. Rows with a missing value or
+    no parent patent are left behind instead of failing the whole statement.
+    """
+    fields = list(FIELD_MAX_LENGTHS)
+    cleaned = ',\n            '.join(f"{clean_expression(f)} AS {f}" for f in fields)
+    columns = ', '.join(fields)
+    return f"""
+    WITH cleaned AS (
+        SELECT
+            {cleaned}
+        FROM {staging_table}
+    )
+    INSERT INTO {full_table_name} ({columns})
+    SELECT DISTINCT ON (patent_number_id, ipc_classification_sequence_number) {columns}
+    FROM cleaned c
+    WHERE c IS NOT NULL
+      AND EXISTS (SELECT 1 FROM {main_table} m WHERE m.patent_number = c.patent_number_id)
+    ON CONFLICT (patent_number_id, ipc_classification_sequence_number)
+    DO NOTHING;
     """
-    new_fieldnames = []
-    for header in reader.fieldnames:
-        mapped = CSV_TO_DB_FIELD_MAPPING.get(header, header)
-        new_fieldnames.append(mapped)
-    reader.fieldnames = new_fieldnames
-    return reader
 
-def process_rows(rows, conn):
+def load_csv(csv_stream, conn, label):
     """
-    Inserts a batch of rows into the database using execute_values for efficiency.
+    Streams one CSV into staging with COPY and merges it in a single
+    transaction, which also bumps the data version when rows were added.
+    Returns (rows staged, rows inserted).
     """
+    header = next(csv.reader([csv_stream.readline()], delimiter='|'))
+    columns = [CSV_TO_DB_FIELD_MAPPING.get(h, h) for h in header]
+    unknown = [c for c in columns if c not in FIELD_MAX_LENGTHS]
+    if unknown:
+        raise ValueError(f"Unexpected columns in {label}: {unknown}")
+
     try:
         with conn.cursor() as cur:
-            query = f"""
-            INSERT INTO {full_table_name} (
-                patent_number_id, ipc_classification_sequence_number, ipc_version_date, classification_level,
-                classification_status_code, classification_status, ipc_section_code, ipc_section,
-                ipc_class_code, ipc_class, ipc_subclass_code, ipc_subclass, ipc_main_group_code, ipc_group,
-                ipc_subgroup_code, ipc_subgroup
-            ) VALUES %s
-            ON CONFLICT (patent_number_id, ipc_classification_sequence_number)
-            DO NOTHING;
-            """
-            values = [
-                (
-                    clean_value(row.get('patent_number_id'), FIELD_MAX_LENGTHS['patent_number_id']),
-                    clean_value(row.get('ipc_classification_sequence_number'), field_type='int'),
-                    clean_value(row.get('ipc_version_date'), field_type='date'),
-                    clean_value(row.get('classification_level'), FIELD_MAX_LENGTHS['classification_level']),
-                    clean_value(row.get('classification_status_code'), FIELD_MAX_LENGTHS['classification_status_code']),
-                    clean_value(row.get('classification_status'), FIELD_MAX_LENGTHS['classification_status']),
-                    clean_value(row.get('ipc_section_code'), FIELD_MAX_LENGTHS['ipc_section_code']),
-                    clean_value(row.get('ipc_section'), FIELD_MAX_LENGTHS['ipc_section']),
-                    clean_value(row.get('ipc_class_code'), FIELD_MAX_LENGTHS['ipc_class_code']),
-                    clean_value(row.get('ipc_class'), FIELD_MAX_LENGTHS['ipc_class']),
-                    clean_value(row.get('ipc_subclass_code'), FIELD_MAX_LENGTHS['ipc_subclass_code']),
-                    clean_value(row.get('ipc_subclass'), FIELD_MAX_LENGTHS['ipc_subclass']),
-                    clean_value(row.get('ipc_main_group_code'), FIELD_MAX_LENGTHS['ipc_main_group_code']),
-                    clean_value(row.get('ipc_group'), FIELD_MAX_LENGTHS['ipc_group']),
-                    clean_value(row.get('ipc_subgroup_code'), FIELD_MAX_LENGTHS['ipc_subgroup_code']),
-                    clean_value(row.get('ipc_subgroup'), FIELD_MAX_LENGTHS['ipc_subgroup']),
-                )
-                for row in rows
-            ]
-            execute_values(cur, query, values)
-            conn.commit()
-            logging.info(f"Inserted batch of {len(rows)} rows.")
-    except Exception as e:
-        logging.error(f"Error inserting batch: {e}\n{traceback.format_exc()}")
+            cur.execute(f"TRUNCATE {staging_table}")
+            cur.copy_expert(
+                f"COPY {staging_table} ({', '.join(columns)}) FROM STDIN "
+                f"WITH (FORMAT csv, DELIMITER '|')",
+                csv_stream,
+            )
+            staged = cur.rowcount
+            cur.execute(merge_sql())
+            inserted = cur.rowcount
+            if inserted:
+                bump_data_version(cur)
+        conn.commit()
+    except Exception:
         conn.rollback()
-
-def process_csv_file(csv_file, conn, zip_filename, csv_filename):
-    """
-    Processes a single CSV file for insertion into the database.
-    """
-    try:
-        content = csv_file.read().decode('utf-8')
-        reader = csv.DictReader(content.splitlines(), delimiter='|')
-        reader = preprocess_headers(reader)
-        batch = []
-        batch_size = 100
-        for row_number, row in enumerate(reader, start=1):
-            try:
-                # Map complex headers to simple field names
-                mapped_row = {CSV_TO_DB_FIELD_MAPPING.get(k, k): v for k, v in row.items()}
-                # Clean the row data
-                cleaned_row = {k: v for k, v in mapped_row.items()}
-                batch.append(cleaned_row)
-                if len(batch) >= batch_size:
-                    process_rows(batch, conn)
-                    batch.clear()
-            except Exception as e:
-                logging.error(f"Skipping row {row_number} in {csv_filename} within {zip_filename} due to error: {e}\n{traceback.format_exc()}")
-        if batch:
-            process_rows(batch, conn)
-    except Exception as e:
-        logging.error(f"Error processing CSV file {csv_filename} in ZIP {zip_filename}: {e}\n{traceback.format_exc()}")
+        raise
+    logging.info(f"{label}: staged {staged} rows, inserted {inserted}, skipped {staged - inserted}.")
+    return staged, inserted
 
 def main():
     """
@@ -182,15 +180,25 @@ def main():
             port=settings.DATABASES['default']['PORT']
         )
         logging.info("Database connection established.")
+        create_staging_table(conn)
         for filename in os.listdir(directory):
             if filename.endswith('.zip'):
                 zip_path = os.path.join(directory, filename)
                 logging.info(f"Processing ZIP file: {filename}")
                 with zipfile.ZipFile(zip_path, 'r') as z:
                     for csv_filename in z.namelist():
+                        if not csv_filename.endswith('.csv'):
+                            continue
+                        # Decompressed straight into COPY, never held in memory.
                         with z.open(csv_filename) as csv_file:
                             logging.info(f"Processing CSV file: {csv_filename} in ZIP: {filename}")
-                            process_csv_file(csv_file, conn, filename, csv_filename)
+                            try:
+                                load_csv(io.TextIOWrapper(csv_file, encoding='utf-8', newline=''), conn, f"{filename}:{csv_filename}")
+                            except Exception as e:
+                                logging.error(f"Error processing CSV file {csv_filename} in ZIP {filename}: {e}\n{traceback.format_exc()}")
+        with conn.cursor() as cur:
+            cur.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        conn.commit()
     except Exception as e:
         logging.error(f"Critical error: {e}\n{traceback.format_exc()}")
     finally:
@@ -5,65 +5,25 @@ import django
 from django.conf import settings
 import csv
 import logging
-import zipfile
-import tempfile
+import time
 
 # Add the project directory to the Python path
 sys.path.append('c:/Users/Intern_1/Documents/GitHub/dd_patents_database')
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'DB_Main.settings')
 django.setup()
 
+from patents.management.import_ledger import begin_file, fail_file, file_is_loaded, finish_file, record_chunk
+from patents.management.zip_stream import iter_members
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 directory = 'c:/Users/Intern_1/Documents/PT_Data/PT_abstract'
 table_name = 'patents_pt_abstract'
 
-# Logs to track progress
-processed_files_log = 'processed_abstract_files.log'
-processed_rows_log = 'processed_abstract_rows.log'
-
-def is_file_processed(filename):
-    """Check if a file has been processed by reading the log file."""
-    if not os.path.exists(processed_files_log):
-        return False
-    with open(processed_files_log, 'r') as f:
-        processed_files = f.read().splitlines()
-    return filename in processed_files
-
-def mark_file_processed(filename):
-    """Mark a file as processed by writing to the log file."""
-    with open(processed_files_log, 'a') as f:
-        f.write(f"{filename}\n")
-
-def get_last_processed_row(filename):
-    """Retrieve the last processed row number for a given file."""
-    if not os.path.exists(processed_rows_log):
-        return 0
-    with open(processed_rows_log, 'r') as f:
-        for line in f:
-            log_filename, last_row = line.strip().split(',')
-            if log_filename == filename:
-                return int(last_row)
-    return 0
-
-def mark_row_processed(filename, row_number):
-    """Update the last processed row number for a given file."""
-    lines = []
-    if os.path.exists(processed_rows_log):
-        with open(processed_rows_log, 'r') as f:
-            lines = f.readlines()
-
-    with open(processed_rows_log, 'w') as f:
-        updated = False
-        for line in lines:
-            log_filename, last_row = line.strip().split(',')
-            if log_filename == filename:
-                f.write(f"{filename},{row_number}\n")
-                updated = True
-            else:
-                f.write(line)
-        if not updated:
-            f.write(f"{filename},{row_number}\n")
+# Progress is tracked in the import ledger under this name, committed with
+# the rows every CHECKPOINT_ROWS rows.
+loader_name = 'abstracts3'
+CHECKPOINT_ROWS = 10_000
 
 def clean_value(value, max_length=None):
     if value is not None:
@@ -72,7 +32,7 @@ def clean_value(value, max_length=None):
             value = value[:max_length]
     return value
 
-def update_or_create_record(row, cur, conn):
+def update_or_create_record(row, cur):
     query = f"""
     INSERT INTO patents_pt_abstract (patent_number_id, abstract_text_sequence_number, language_of_filing_code, abstract_language_code, abstract_text)
     VALUES (%s, %s, %s, %s, %s)
@@ -89,12 +49,44 @@ def update_or_create_record(row, cur, conn):
         row['Abstract Language Code - Code de la langue du résumé'],
         row['Abstract Text - Texte de l’abrégé']
     )
+    # A bad row only undoes itself, not the rest of its checkpoint batch.
+    cur.execute("SAVEPOINT abstract_row")
     try:
         cur.execute(query, values)
-        conn.commit()
+        cur.execute("RELEASE SAVEPOINT abstract_row")
+        return 1
     except Exception as e:
         logging.error(f"Error executing query for patent number {row['Patent Number - Numéro du brevet']}: {e}")
+        cur.execute("ROLLBACK TO SAVEPOINT abstract_row")
+        return 0
+
+def load_csv(infile, conn, entry):
+    """Upserts every row past the entry's row_offset, checkpointing as it goes."""
+    reader = csv.DictReader(infile, delimiter='|')
+    try:
+        with conn.cursor() as cur:
+            # Django's FKs are deferred; check each row where its savepoint can catch it.
+            cur.execute("SET CONSTRAINTS ALL IMMEDIATE")
+            pending, loaded, started = 0, 0, time.monotonic()
+            row_number = entry['row_offset']
+            for row_number, row in enumerate(reader, start=1):
+                if row_number <= entry['row_offset']:
+                    continue  # Committed by an earlier run
+                loaded += update_or_create_record(row, cur)
+                pending += 1
+                if pending == CHECKPOINT_ROWS:
+                    record_chunk(cur, entry, loaded, row_number, started=started)
+                    conn.commit()
+                    cur.execute("SET CONSTRAINTS ALL IMMEDIATE")
+                    pending, loaded, started = 0, 0, time.monotonic()
+            if pending:
+                record_chunk(cur, entry, loaded, row_number, started=started)
+            finish_file(cur, entry)
+        conn.commit()
+    except Exception as e:
         conn.rollback()
+        fail_file(conn, entry, e)
+        raise
 
 try:
     conn = psycopg2.connect(
@@ -110,46 +102,29 @@ try:
 
     for filename in os.listdir(directory):
         filepath = os.path.join(directory, filename)
+        if not filename.endswith(('.zip', '.csv')):
+            continue
 
-        if is_file_processed(filename):
+        if file_is_loaded(conn, loader_name, filepath):
             logging.info(f"Skipping already processed file: {filename}")
             continue
 
-        last_processed_row = get_last_processed_row(filename)
-
         if filename.endswith('.zip'):
-            with tempfile.TemporaryDirectory() as temp_dir:
-                with zipfile.ZipFile(filepath, 'r') as zip_ref:
-                    zip_ref.extractall(temp_dir)
-                    logging.info(f"Extracted {filename} to temporary directory.")
-
-                    for csv_filename in os.listdir(temp_dir):
-                        if csv_filename.endswith('.csv'):
-                            csv_path = os.path.join(temp_dir, csv_filename)
-                            logging.info(f"Processing CSV file: {csv_path}")
-                            with open(csv_path, 'r', encoding='utf-8') as infile:
-                                reader = csv.DictReader(infile, delimiter='|')
-                                with conn.cursor() as cur:
-                                    for row_number, row in enumerate(reader, start=1):
-                                        if row_number <= last_processed_row:
-                                            continue  # Skip rows already processed
-                                        update_or_create_record(row, cur, conn)
-                                        mark_row_processed(filename, row_number)
-
-            mark_file_processed(filename)
-
-        elif filename.endswith('.csv'):
+            # Members are read straight out of the archive, never extracted to disk.
+            for csv_filename, infile in iter_members(filepath):
+                entry = begin_file(conn, loader_name, filepath, csv_filename)
+                if entry['skip']:
+                    continue
+                logging.info(f"Processing CSV file: {filename}:{csv_filename}")
+                load_csv(infile, conn, entry)
+
+        else:
+            entry = begin_file(conn, loader_name, filepath)
+            if entry['skip']:
+                continue
             logging.info(f"Processing standalone CSV file: {filepath}")
             with open(filepath, 'r', encoding='utf-8') as infile:
-                reader = csv.DictReader(infile, delimiter='|')
-                with conn.cursor() as cur:
-                    for row_number, row in enumerate(reader, start=1):
-                        if row_number <= last_processed_row:
-                            continue  # Skip rows already processed
-                        update_or_create_record(row, cur, conn)
-                        mark_row_processed(filename, row_number)
-
-            mark_file_processed(filename)
+                load_csv(infile, conn, entry)
 
     conn.commit()
     logging.info("Import completed successfully.")
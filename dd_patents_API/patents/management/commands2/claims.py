@@ -13,6 +13,8 @@ sys.path.append('c:/Users/Intern_1/Documents/GitHub/dd_patents_database')
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'DB_Main.settings')
 django.setup()
 
+from patents.management.import_ledger import bump_data_version
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', filename='claims_import.log')
 
 directory = 'c:/Users/Intern_1/Documents/PT_Data/PT_claim'
@@ -89,6 +91,10 @@ try:
                 logging.error(f"Error processing {filename}: {e}")
                 conn.rollback()
 
+    # One bump for the whole run, so cached API responses are rebuilt from the new rows.
+    with conn.cursor() as cur:
+        bump_data_version(cur)
+    conn.commit()
     logging.info("Claims import completed successfully.")
 
 except psycopg2.Error as e:
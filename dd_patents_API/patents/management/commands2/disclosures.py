@@ -13,6 +13,8 @@ sys.path.append('c:/Users/Intern_1/Documents/GitHub/dd_patents_database')
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'DB_Main.settings')
 django.setup()
 
+from patents.management.import_ledger import bump_data_version
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 directory = 'c:/Users/Intern_1/Documents/PT_Data/PT_disclosure'
@@ -82,6 +84,9 @@ try:
                             csv_path = os.path.join(temp_dir, csv_filename)
                             process_csv_file(csv_path, conn)
 
+    # One bump for the whole run, so cached API responses are rebuilt from the new rows.
+    with conn.cursor() as cur:
+        bump_data_version(cur)
     conn.commit()
     logging.info("Import completed successfully.")
 
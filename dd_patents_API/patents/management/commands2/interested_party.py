@@ -14,6 +14,8 @@ sys.path.append('c:/Users/Intern_1/Documents/GitHub/dd_patents_database')
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'DB_Main.settings')
 django.setup()
 
+from patents.management.import_ledger import bump_data_version
+
 # Directory for ZIP files
 directory = 'c:/Users/Intern_1/Documents/PT_Data/PT_interested_party'
 table_name = 'pt_interested_party'
@@ -164,6 +166,10 @@ try:
         elif filename.endswith('.csv'):
             process_csv_file(filepath, conn)
 
+    # One bump for the whole run, so cached API responses are rebuilt from the new rows.
+    with conn.cursor() as cur:
+        bump_data_version(cur)
+    conn.commit()
     logging.info("Import process completed successfully.")
 
 except psycopg2.Error as e:
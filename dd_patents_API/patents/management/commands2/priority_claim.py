@@ -13,6 +13,8 @@ sys.path.append('c:/Users/Intern_1/Documents/GitHub/dd_patents_database')
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'DB_Main.settings')
 django.setup()
 
+from patents.management.import_ledger import bump_data_version
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 directory = 'c:/Users/Intern_1/Documents/PT_Data/PT_priority_claim'  # directory containing the zips
@@ -108,6 +110,10 @@ if __name__ == "__main__":
     if conn:
         try:
             process_all_zips(directory, conn)
+            # One bump for the whole run, so cached API responses are rebuilt from the new rows.
+            with conn.cursor() as cur:
+                bump_data_version(cur)
+            conn.commit()
         except Exception as e:
             logging.error(f"Error processing zip files: {e}")
         finally:
@@ -0,0 +1,452 @@
+"""
+Streaming COPY loader shared by the patents import commands.
+
+Each CSV (loose, or a member of a ZIP) is read once, cleaned a chunk at a
+time (patents.management.cleaning) and fed straight into
+`COPY ... FROM STDIN` -- no `_preprocessed.csv` temp files.
+Files are loaded in parallel: one worker process, with its own connection,
+per file.
+
+Rows land in a temp staging table first and are then upserted into the
+real table on its natural key, so re-running a file is safe.
+
+For large initial loads, bulk_load() first drops the table's secondary
+indexes, foreign keys and unique constraints other than that key. It
+rebuilds them after the load with a larger maintenance_work_mem, then
+validates them and reports any violations.
+"""
+import csv
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+
+import psycopg2
+
+from patents.management.cleaning import COPY_NULL, clean_frame, read_chunks, to_copy_csv
+from patents.management.import_ledger import begin_file, fail_file, finish_file, record_chunk, source_checksums
+from patents.management.zip_stream import csv_members, open_member
+
+# Text columns (claims, disclosures) run well past the csv module's default.
+try:
+    csv.field_size_limit(10 * 1024 * 1024)
+except OverflowError:
+    csv.field_size_limit(2 ** 31 - 1)
+
+# CSV header -> db column for datasets whose files carry a known header.
+# Datasets without a map are loaded positionally onto the model's columns,
+# which is how PT_main has always been COPY'd.
+CLAIM_HEADERS = {
+    'Patent Number - Numéro du brevet': 'patent_number_id',
+    'Claim text sequence number - Texte des revendications numéro de séquence': 'claim_text_sequence_number',
+    'Language of Filing Code - Langue du type de dépôt': 'language_of_filing_code',
+    'Claims Text - Texte des revendications': 'claims_text',
+}
+DISCLOSURE_HEADERS = {
+    'Patent Number - Numéro du brevet': 'patent_number_id',
+    'Disclosure text sequence number - Texte de la divulgation numéro de séquence': 'disclosure_text_sequence_number',
+    'Language of Filing Code - Langue du type de dépôt': 'language_of_filing_code',
+    'Disclosure Text - Texte de la divulgation': 'disclosure_text',
+}
+
+DATASETS = {
+    'main': {'model': 'PT_Main', 'headers': None},
+    'claims': {'model': 'PT_Claim', 'headers': CLAIM_HEADERS},
+    'disclosures': {'model': 'PT_Disclosure', 'headers': DISCLOSURE_HEADERS},
+}
+
+
+def build_spec(dataset):
+    """
+    Describe a dataset's target table in plain, picklable data so worker
+    processes never need Django set up.
+    """
+    from django.apps import apps
+    from django.db import models
+
+    config = DATASETS[dataset]
+    model = apps.get_model('patents', config['model'])
+    opts = model._meta
+
+    columns = {}
+    for field in opts.concrete_fields:
+        # Search vectors are filled in by their trigger.
+        if field.auto_created or not field.editable:
+            continue
+        if isinstance(field, models.DateField):
+            kind = 'date'
+        elif isinstance(field, models.BooleanField):
+            kind = 'bool'
+        else:
+            kind = 'text'
+        columns[field.column] = {
+            'kind': kind,
+            'max_length': getattr(field, 'max_length', None),
+            'null': field.null,
+        }
+
+    if opts.unique_together:
+        key = [opts.get_field(name).column for name in opts.unique_together[0]]
+    else:
+        key = [opts.pk.column]
+
+    return {
+        'dataset': dataset,
+        'table': opts.db_table,
+        'columns': columns,
+        'headers': config['headers'],
+        'key': key,
+    }
+
+
+def resolve_columns(spec, header):
+    """Map a file's header row onto db columns, in file order."""
+    if spec['headers'] is None:
+        columns = list(spec['columns'])
+        if len(header) != len(columns):
+            raise ValueError(f"Expected {len(columns)} columns, found {len(header)}")
+        return columns
+    missing = [h for h in header if h not in spec['headers']]
+    if missing:
+        raise ValueError(f"Unknown CSV columns: {missing}")
+    return [spec['headers'][h] for h in header]
+
+
+class CleanedCSVStream:
+    """
+    Read-only file object over an iterator of text pieces, so copy_expert
+    can pull cleaned rows as fast as the server takes them.
+    """
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self._buffer = ''
+
+    def read(self, size=-1):
+        parts, length = [self._buffer], len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            parts.append(line)
+            length += len(line)
+        data = ''.join(parts)
+        if size < 0:
+            size = len(data)
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def cleaned_chunks(stream, columns, spec):
+    """Yield COPY-ready CSV text for the rest of `stream` (after its header), a chunk at a time."""
+    rules = {c: spec['columns'][c] for c in columns}
+    for chunk in read_chunks(stream, columns):
+        yield to_copy_csv(clean_frame(chunk, rules))
+
+
+def open_sources(path):
+    """
+    Yield (label, source) for every CSV under `path` -- each loose file and
+    each CSV member of every ZIP. `source` is a picklable (path, member)
+    pair; ZIP members are decompressed on the fly, never extracted to disk.
+    """
+    names = [path] if os.path.isfile(path) else [
+        os.path.join(path, name) for name in sorted(os.listdir(path))
+    ]
+    for name in names:
+        if name.endswith('.zip'):
+            for member in csv_members(name):
+                yield f"{name}:{member}", (name, member)
+        elif name.endswith('.csv') and not name.endswith('_preprocessed.csv'):
+            yield name, (name, None)
+
+
+@contextmanager
+def _open_text(source):
+    path, member = source
+    if member is None:
+        with open(path, 'r', encoding='utf-8', newline='') as stream:
+            yield stream
+        return
+    with open_member(path, member) as stream:
+        yield stream
+
+
+def upsert_sql(spec, staging, columns):
+    key = spec['key']
+    cols = ', '.join(columns)
+    updates = [c for c in columns if c not in key]
+    action = 'DO NOTHING' if not updates else 'DO UPDATE SET ' + ', '.join(
+        f"{c} = EXCLUDED.{c}" for c in updates
+    )
+    return (
+        f"INSERT INTO {spec['table']} ({cols}) "
+        f"SELECT DISTINCT ON ({', '.join(key)}) {cols} FROM {staging} "
+        f"ON CONFLICT ({', '.join(key)}) {action}"
+    )
+
+
+def ledger_name(spec):
+    return f"import_parallel:{spec['dataset']}"
+
+
+def load_source(spec, source, db_params, work_mem='256MB', checksum=None):
+    """
+    Worker entry point: stream one CSV into the database on its own
+    connection. Returns the number of rows staged, or 0 when the import
+    ledger shows the source was already loaded with identical content.
+    `checksum` is the SHA-256 of the source's file, if already computed.
+    """
+    staging = f"{spec['table']}_stage"
+    path, member = source
+    conn = psycopg2.connect(**db_params)
+    try:
+        entry = begin_file(conn, ledger_name(spec), path, member or '', checksum)
+        if entry['skip']:
+            return 0
+        started = time.monotonic()
+        try:
+            with _open_text(source) as stream, conn.cursor() as cur:
+                columns = resolve_columns(spec, next(csv.reader(stream, delimiter='|')))
+                cur.execute(f"SET work_mem TO '{work_mem}'")
+                # Only the loaded columns, no constraints: the upsert checks those.
+                cur.execute(
+                    f"CREATE TEMP TABLE {staging} ON COMMIT DROP AS "
+                    f"SELECT {', '.join(columns)} FROM {spec['table']} WITH NO DATA"
+                )
+                cur.copy_expert(
+                    f"COPY {staging} ({', '.join(columns)}) FROM STDIN "
+                    f"WITH (FORMAT csv, DELIMITER '|', NULL '{COPY_NULL}')",
+                    CleanedCSVStream(cleaned_chunks(stream, columns, spec)),
+                )
+                cur.execute(f"SELECT COUNT(*) FROM {staging}")
+                staged = cur.fetchone()[0]
+                cur.execute(upsert_sql(spec, staging, columns))
+                # The whole file is one chunk, committed with its rows: a failed file is reloaded in full.
+                record_chunk(cur, entry, cur.rowcount, staged, started=started)
+                finish_file(cur, entry)
+            conn.commit()
+            return staged
+        except Exception as e:
+            conn.rollback()
+            fail_file(conn, entry, e)
+            raise
+    finally:
+        conn.close()
+
+
+def db_params_from_settings(alias='default'):
+    from django.db import connections
+
+    settings_dict = connections[alias].settings_dict
+    return {
+        'dbname': settings_dict['NAME'],
+        'user': settings_dict['USER'],
+        'password': settings_dict['PASSWORD'],
+        'host': settings_dict['HOST'],
+        'port': settings_dict['PORT'],
+    }
+
+
+def load_parallel(dataset, path, workers=None, db_params=None, work_mem='256MB'):
+    """
+    Load every CSV under `path` into `dataset`'s table with up to `workers`
+    processes. Returns {source label: rows staged}; a failed file is logged
+    and reported as None without stopping the others.
+    """
+    spec = build_spec(dataset)
+    db_params = db_params or db_params_from_settings()
+    sources = list(open_sources(path))
+    results = {}
+    if not sources:
+        logging.warning(f"No CSV or ZIP files found under {path}")
+        return results
+
+    # Hash each changed file here, once, rather than in every worker loading one of its members.
+    conn = psycopg2.connect(**db_params)
+    try:
+        checksums = source_checksums(conn, ledger_name(spec), [source for _, source in sources])
+    finally:
+        conn.close()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(load_source, spec, source, db_params, work_mem, checksums.get(source[0])): label
+            for label, source in sources
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                results[label] = future.result()
+                logging.info(f"Loaded {results[label]} rows from {label}")
+            except Exception as e:
+                results[label] = None
+                logging.error(f"Error loading {label}: {e}")
+    return results
+
+
+# Constraints and indexes of a table, with their column names in key order.
+CONSTRAINTS_SQL = """
+    SELECT c.conname, c.contype, pg_get_constraintdef(c.oid),
+           ARRAY(SELECT a.attname FROM unnest(c.conkey) WITH ORDINALITY k(attnum, n)
+                 JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum ORDER BY k.n),
+           c.confrelid::regclass::text,
+           ARRAY(SELECT a.attname FROM unnest(c.confkey) WITH ORDINALITY k(attnum, n)
+                 JOIN pg_attribute a ON a.attrelid = c.confrelid AND a.attnum = k.attnum ORDER BY k.n)
+    FROM pg_constraint c
+    WHERE c.conrelid = %s::regclass AND c.contype IN ('u', 'f')
+"""
+INDEXES_SQL = """
+    SELECT i.relname, pg_get_indexdef(x.indexrelid), x.indisunique,
+           ARRAY(SELECT a.attname FROM unnest(x.indkey::int2[]) WITH ORDINALITY k(attnum, n)
+                 JOIN pg_attribute a ON a.attrelid = x.indrelid AND a.attnum = k.attnum ORDER BY k.n)
+    FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+    WHERE x.indrelid = %s::regclass AND NOT x.indisprimary
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid AND c.conrelid = x.indrelid)
+"""
+
+
+def defer_constraints(spec, db_params):
+    """
+    Drop every index and constraint of the table that the upsert does not
+    need: secondary indexes, foreign keys and unique constraints other than
+    the natural key. Returns what was dropped, for restore_constraints().
+    """
+    table = spec['table']
+    deferred = []
+    conn = psycopg2.connect(**db_params)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(CONSTRAINTS_SQL, [table])
+            for name, kind, definition, columns, ref_table, ref_columns in cur.fetchall():
+                if kind == 'u' and list(columns) == spec['key']:
+                    continue
+                deferred.append({
+                    'name': name,
+                    'kind': 'foreign key' if kind == 'f' else 'unique',
+                    'sql': f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}",
+                    'columns': list(columns),
+                    'ref_table': ref_table,
+                    'ref_columns': list(ref_columns or []),
+                })
+            cur.execute(INDEXES_SQL, [table])
+            for name, definition, unique, columns in cur.fetchall():
+                if unique and list(columns) == spec['key']:
+                    continue
+                deferred.append({
+                    'name': name,
+                    'kind': 'unique index' if unique else 'index',
+                    'sql': definition,
+                    'columns': list(columns),
+                })
+
+            for obj in deferred:
+                # Logged in full so a crashed load can be repaired by hand.
+                logging.info(f"Deferring {obj['kind']} {obj['name']}: {obj['sql']}")
+                if obj['kind'] in ('index', 'unique index'):
+                    cur.execute(f"DROP INDEX {obj['name']}")
+                else:
+                    cur.execute(f"ALTER TABLE {table} DROP CONSTRAINT {obj['name']}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return deferred
+
+
+def count_violations(cur, table, obj):
+    """Rows that keep a deferred constraint from being rebuilt."""
+    columns = obj['columns']
+    if obj['kind'] == 'foreign key':
+        present = ' AND '.join(f"t.{c} IS NOT NULL" for c in columns)
+        match = ' AND '.join(f"r.{rc} = t.{c}" for c, rc in zip(columns, obj['ref_columns']))
+        cur.execute(
+            f"SELECT COUNT(*) FROM {table} t WHERE {present} "
+            f"AND NOT EXISTS (SELECT 1 FROM {obj['ref_table']} r WHERE {match})"
+        )
+    else:
+        cols = ', '.join(columns)
+        cur.execute(
+            f"SELECT COALESCE(SUM(n - 1), 0)::bigint FROM ("
+            f"SELECT COUNT(*) AS n FROM {table} WHERE ({cols}) IS NOT NULL "
+            f"GROUP BY {cols} HAVING COUNT(*) > 1) duplicates"
+        )
+    return cur.fetchone()[0]
+
+
+def restore_object(table, obj, db_params, maintenance_work_mem='1GB'):
+    """
+    Rebuild one deferred object on its own connection. Foreign keys are added
+    NOT VALID and only validated when no orphans exist, so a dirty load still
+    gets its constraint enforced for new rows. Returns the violation count.
+    """
+    conn = psycopg2.connect(**db_params)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(f"SET maintenance_work_mem TO '{maintenance_work_mem}'")
+            if obj['kind'] == 'foreign key':
+                cur.execute(f"{obj['sql']} NOT VALID")
+                conn.commit()
+                violations = count_violations(cur, table, obj)
+                if not violations:
+                    cur.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {obj['name']}")
+                conn.commit()
+                return violations
+            try:
+                cur.execute(obj['sql'])
+                conn.commit()
+                return 0
+            except psycopg2.errors.UniqueViolation:
+                conn.rollback()
+                return count_violations(cur, table, obj)
+    finally:
+        conn.close()
+
+
+def restore_constraints(spec, deferred, db_params, workers=None, maintenance_work_mem='1GB'):
+    """
+    Rebuild what defer_constraints() dropped. Plain indexes only take a
+    SHARE lock, so they are built side by side; constraints lock the table
+    exclusively and follow one at a time. Returns {name: violations} for
+    every object that could not be rebuilt cleanly.
+    """
+    table = spec['table']
+    indexes = [obj for obj in deferred if obj['kind'] == 'index']
+    constraints = [obj for obj in deferred if obj['kind'] != 'index']
+    violations = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(restore_object, table, obj, db_params, maintenance_work_mem): obj
+            for obj in indexes
+        }
+        for future in as_completed(futures):
+            future.result()
+            logging.info(f"Rebuilt index {futures[future]['name']}")
+
+    for obj in constraints:
+        count = restore_object(table, obj, db_params, maintenance_work_mem)
+        if count:
+            violations[obj['name']] = count
+            logging.error(f"{obj['kind'].capitalize()} {obj['name']} has {count} violating row(s).")
+        else:
+            logging.info(f"Rebuilt {obj['kind']} {obj['name']}")
+    return violations
+
+
+def bulk_load(dataset, path, workers=None, db_params=None, work_mem='256MB', maintenance_work_mem='1GB'):
+    """
+    load_parallel() with the table's secondary indexes and constraints
+    dropped for the duration of the load and rebuilt afterwards.
+    Returns (results, violations).
+    """
+    spec = build_spec(dataset)
+    db_params = db_params or db_params_from_settings()
+    deferred = defer_constraints(spec, db_params)
+    try:
+        results = load_parallel(dataset, path, workers, db_params, work_mem)
+    finally:
+        violations = restore_constraints(spec, deferred, db_params, workers, maintenance_work_mem)
+    return results, violations
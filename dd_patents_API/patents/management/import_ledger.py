@@ -0,0 +1,213 @@
+"""
+Import ledger shared by the patents loaders.
+
+Every source file (or ZIP member) a loader touches has a row in
+PT_Import_File with its size, mtime and SHA-256, and every committed chunk a
+row in PT_Import_Chunk. Chunks and the file's row offset are written on the
+loader's own connection, in the transaction that loads the chunk, so the
+ledger can never run ahead of (or behind) the data: a rerun resumes at the
+first row that was not committed.
+
+Resume works by row, not by byte: a ZIP member is a deflate stream that
+can only be read from its start, so a rerun re-reads the rows before its
+offset and skips them. main3 and abstracts3 commit the file a chunk of
+rows at a time and resume inside it. import_parallel (copy_loader)
+loads each file in one transaction, recorded as a single chunk, so it
+resumes per file: a file that failed part way is loaded again in full.
+
+Plain SQL over psycopg2 rather than the ORM, so that parallel workers
+without Django set up can use it too.
+"""
+import hashlib
+import logging
+import os
+import time
+
+FILE_TABLE = 'patents_pt_import_file'
+CHUNK_TABLE = 'patents_pt_import_chunk'
+DATA_VERSION_TABLE = 'patents_pt_data_version'
+
+_checksums = {}
+
+
+def file_checksum(path):
+    """SHA-256 of a file, cached per (path, size, mtime) for ZIPs with several members."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime)
+    if key not in _checksums:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as stream:
+            for block in iter(lambda: stream.read(1024 * 1024), b''):
+                digest.update(block)
+        _checksums[key] = digest.hexdigest()
+    return _checksums[key]
+
+
+def file_is_loaded(conn, loader, path):
+    """
+    True when every ledger entry of `path` is done and the file is unchanged:
+    decided from size and mtime alone when those match, so an untouched ZIP
+    is never re-read; otherwise by checksum.
+    """
+    stat = os.stat(path)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT file_size, modified_time, checksum, status FROM {FILE_TABLE} "
+            f"WHERE loader = %s AND file_name = %s",
+            [loader, os.path.basename(path)],
+        )
+        entries = cur.fetchall()
+    if not entries or any(status != 'done' for _, _, _, status in entries):
+        return False
+    if all(size == stat.st_size and mtime == stat.st_mtime for size, mtime, _, _ in entries):
+        return True
+    checksum = file_checksum(path)
+    if all(entry_checksum == checksum for _, _, entry_checksum, _ in entries):
+        with conn.cursor() as cur:
+            cur.execute(
+                f"UPDATE {FILE_TABLE} SET file_size = %s, modified_time = %s "
+                f"WHERE loader = %s AND file_name = %s",
+                [stat.st_size, stat.st_mtime, loader, os.path.basename(path)],
+            )
+        conn.commit()
+        return True
+    return False
+
+
+def source_checksums(conn, loader, sources):
+    """
+    {path: SHA-256} for the files among `sources` ((path, member) pairs) that
+    begin_file() would have to hash: all but those whose every member is
+    already done with the same size and mtime. Lets a parent process hash
+    each ZIP once for the workers loading its members, which would otherwise
+    each hash it again (the _checksums cache is per process).
+    """
+    members = {}
+    for path, member in sources:
+        members.setdefault(path, set()).add(member or '')
+    checksums = {}
+    with conn.cursor() as cur:
+        for path, names in members.items():
+            stat = os.stat(path)
+            cur.execute(
+                f"SELECT member_name FROM {FILE_TABLE} WHERE loader = %s AND file_name = %s "
+                f"AND status = 'done' AND file_size = %s AND modified_time = %s",
+                [loader, os.path.basename(path), stat.st_size, stat.st_mtime],
+            )
+            if not names <= {name for name, in cur.fetchall()}:
+                checksums[path] = file_checksum(path)
+    conn.rollback()
+    return checksums
+
+
+def begin_file(conn, loader, path, member='', checksum=None):
+    """
+    Claim `path` (or one `member` of it) for `loader` and return its ledger
+    entry. entry['skip'] is True when it was already loaded with identical
+    content; otherwise entry['row_offset'] is the number of rows to skip --
+    zero for a new file or one whose content changed. Commits.
+    Pass `checksum` when the caller already has the file's SHA-256.
+    """
+    stat = os.stat(path)
+    file_name = os.path.basename(path)
+    with conn.cursor() as cur:
+        cur.execute(
+            f"SELECT id, file_size, modified_time, checksum, status, row_offset, rows_loaded, "
+            f"(SELECT COUNT(*) FROM {CHUNK_TABLE} c WHERE c.import_file_id = f.id) "
+            f"FROM {FILE_TABLE} f WHERE loader = %s AND file_name = %s AND member_name = %s FOR UPDATE",
+            [loader, file_name, member],
+        )
+        row = cur.fetchone()
+        entry = {'loader': loader, 'file_name': file_name, 'member_name': member, 'skip': False}
+
+        if row and row[4] == 'done' and row[1] == stat.st_size and row[2] == stat.st_mtime:
+            entry.update(id=row[0], skip=True)
+            conn.rollback()
+            return entry
+
+        checksum = checksum or file_checksum(path)
+        if row and row[3] == checksum:
+            file_id, status = row[0], row[4]
+            entry.update(id=file_id, skip=status == 'done', row_offset=row[5], rows_loaded=row[6],
+                         chunk_number=row[7])
+            cur.execute(
+                f"UPDATE {FILE_TABLE} SET file_size = %s, modified_time = %s, "
+                f"status = CASE WHEN status = 'done' THEN status ELSE 'in_progress' END, "
+                f"started_at = CASE WHEN status = 'done' THEN started_at ELSE now() END "
+                f"WHERE id = %s",
+                [stat.st_size, stat.st_mtime, file_id],
+            )
+        elif row:
+            # New content under a known name: start over.
+            entry.update(id=row[0], row_offset=0, rows_loaded=0, chunk_number=0)
+            cur.execute(f"DELETE FROM {CHUNK_TABLE} WHERE import_file_id = %s", [row[0]])
+            cur.execute(
+                f"UPDATE {FILE_TABLE} SET file_size = %s, modified_time = %s, checksum = %s, "
+                f"status = 'in_progress', row_offset = 0, rows_loaded = 0, "
+                f"error = '', started_at = now(), finished_at = NULL WHERE id = %s",
+                [stat.st_size, stat.st_mtime, checksum, row[0]],
+            )
+        else:
+            cur.execute(
+                f"INSERT INTO {FILE_TABLE} (loader, file_name, member_name, file_size, modified_time, checksum, "
+                f"status, row_offset, rows_loaded, error, started_at) "
+                f"VALUES (%s, %s, %s, %s, %s, %s, 'in_progress', 0, 0, '', now()) RETURNING id",
+                [loader, file_name, member, stat.st_size, stat.st_mtime, checksum],
+            )
+            entry.update(id=cur.fetchone()[0], row_offset=0, rows_loaded=0, chunk_number=0)
+    conn.commit()
+
+    if entry['skip']:
+        logging.info(f"{file_name} {member} is unchanged since it was loaded, skipping.")
+    elif entry['row_offset']:
+        logging.info(f"Resuming {file_name} {member} after row {entry['row_offset']}.")
+    return entry
+
+
+def record_chunk(cur, entry, rows_loaded, row_end, started=None):
+    """
+    Checkpoint a chunk ending at `row_end` (rows of the file consumed so far)
+    on the caller's cursor; it is durable once the caller commits the chunk.
+    """
+    duration = time.monotonic() - started if started is not None else 0.0
+    cur.execute(
+        f"INSERT INTO {CHUNK_TABLE} (import_file_id, chunk_number, row_start, row_end, "
+        f"rows_loaded, duration_seconds, committed_at) VALUES (%s, %s, %s, %s, %s, %s, now())",
+        [entry['id'], entry['chunk_number'], entry['row_offset'], row_end, rows_loaded, duration],
+    )
+    cur.execute(
+        f"UPDATE {FILE_TABLE} SET row_offset = %s, rows_loaded = rows_loaded + %s WHERE id = %s",
+        [row_end, rows_loaded, entry['id']],
+    )
+    entry.update(row_offset=row_end, chunk_number=entry['chunk_number'] + 1,
+                 rows_loaded=entry['rows_loaded'] + rows_loaded)
+
+
+def finish_file(cur, entry):
+    """
+    Mark the entry done on the caller's cursor, alongside its last chunk, and
+    bump the data version so cached API responses are rebuilt.
+    """
+    cur.execute(
+        f"UPDATE {FILE_TABLE} SET status = 'done', error = '', finished_at = now() WHERE id = %s",
+        [entry['id']],
+    )
+    bump_data_version(cur)
+
+
+def bump_data_version(cur):
+    """Invalidate every cached API response (see patents.response_cache)."""
+    cur.execute(
+        f"INSERT INTO {DATA_VERSION_TABLE} (id, version, changed_at) VALUES (1, 1, now()) "
+        f"ON CONFLICT (id) DO UPDATE SET version = {DATA_VERSION_TABLE}.version + 1, changed_at = now()"
+    )
+
+
+def fail_file(conn, entry, error):
+    """Record a failure after the caller rolled back; committed chunks stay."""
+    with conn.cursor() as cur:
+        cur.execute(
+            f"UPDATE {FILE_TABLE} SET status = 'failed', error = %s WHERE id = %s",
+            [str(error), entry['id']],
+        )
+    conn.commit()
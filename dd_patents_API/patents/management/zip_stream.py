@@ -0,0 +1,129 @@
+"""
+Streaming reader for the ZIP extracts.
+
+Members are decompressed incrementally as the consumer reads them -- into
+csv.reader, pandas or a COPY pipe -- instead of being extracted to a temp
+directory first, so a multi-GB extract never costs its size in disk space
+or a second pass over the data.
+
+Progress is reported against the member's compressed size: it is the only
+size known up front that matches what is actually read off the disk.
+"""
+import io
+import logging
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+
+PROGRESS_STEP = 10  # Log every this many percent of a member's compressed bytes
+
+
+def log_progress(label, done, total):
+    """Default progress callback: one INFO line per PROGRESS_STEP percent."""
+    logging.info(f"{label}: {done * 100 // total}% ({done / 2**20:.1f} of {total / 2**20:.1f} MB compressed)")
+
+
+class _CountingFile:
+    """
+    Raw file handed to ZipFile, counting the bytes read through it so the
+    progress of a member can be measured in compressed bytes.
+    """
+    def __init__(self, raw):
+        self._raw = raw
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self._raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._raw.seek(offset, whence)
+
+    def tell(self):
+        return self._raw.tell()
+
+    def seekable(self):
+        return True
+
+    def close(self):
+        self._raw.close()
+
+
+class _ProgressReader(io.RawIOBase):
+    """Binary member stream that reports compressed progress as it is read."""
+    def __init__(self, member, counter, label, total, progress):
+        self._member = member
+        self._counter = counter
+        self._start = counter.bytes_read
+        self._label = label
+        self._total = total
+        self._progress = progress
+        self._next = PROGRESS_STEP
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._member.read(len(buffer))
+        buffer[:len(data)] = data
+        if self._progress and self._total:
+            done = min(self._counter.bytes_read - self._start, self._total)
+            if done * 100 >= self._next * self._total:
+                self._progress(self._label, done, self._total)
+                self._next = (done * 100 // self._total // PROGRESS_STEP + 1) * PROGRESS_STEP
+        return len(data)
+
+
+def csv_members(path, suffix='.csv'):
+    """Names of the members of the ZIP at `path` ending in `suffix`, in archive order."""
+    with zipfile.ZipFile(path) as archive:
+        return [name for name in archive.namelist() if name.lower().endswith(suffix)]
+
+
+@contextmanager
+def open_member(path, member, encoding='utf-8', progress=log_progress):
+    """
+    Open one member of the ZIP at `path` as a text stream decompressed on
+    the fly. Every call has its own file handle, so members of the same
+    archive can be read side by side. newline='' leaves quoted line breaks
+    to the CSV parser. Pass progress=None to silence progress logging.
+    """
+    counter = _CountingFile(open(path, 'rb'))
+    try:
+        with zipfile.ZipFile(counter) as archive, archive.open(member) as raw:
+            label = f"{os.path.basename(path)}:{member}"
+            total = archive.getinfo(member).compress_size
+            reader = _ProgressReader(raw, counter, label, total, progress)
+            with io.TextIOWrapper(io.BufferedReader(reader, 1024 * 1024), encoding=encoding, newline='') as stream:
+                yield stream
+    finally:
+        counter.close()
+
+
+def iter_members(path, suffix='.csv', encoding='utf-8', progress=log_progress):
+    """Yield (member, text stream) for each matching member, one at a time."""
+    for member in csv_members(path, suffix):
+        with open_member(path, member, encoding, progress) as stream:
+            yield member, stream
+
+
+def _apply(func, path, member, encoding):
+    with open_member(path, member, encoding) as stream:
+        return func(stream, member)
+
+
+def map_members(func, path, workers=None, suffix='.csv', encoding='utf-8'):
+    """
+    Call func(text stream, member) for every matching member of the ZIP at
+    `path`, up to `workers` members at a time, each in its own process.
+    `func` must be a module-level function. Returns {member: result}; the
+    first exception raised by `func` propagates.
+    """
+    members = csv_members(path, suffix)
+    if len(members) <= 1 or workers == 1:
+        return {member: _apply(func, path, member, encoding) for member in members}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_apply, func, path, member, encoding): member for member in members}
+        return {futures[future]: future.result() for future in as_completed(futures)}
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:25
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built CONCURRENTLY so loads into pt_interested_party are not blocked during the build.
+    atomic = False
+
+    dependencies = [
+        ('patents', '0017_alter_pt_ipc_classification_patent_number_and_more'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='pt_interested_party',
+            index=models.Index(fields=['patent_number', 'id'], name='pt_ip_patent_id_idx'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:28
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Table -> text column. search_vector is that text parsed with the filing
+# language's configuration (patents.models.filing_language_config).
+TABLES = {
+    'pt_abstract': 'abstract_text',
+    'pt_claim': 'claims_text',
+    'pt_disclosure': 'disclosure_text',
+}
+BATCH_SIZE = 20_000  # Rows per backfill transaction
+
+
+def vector_sql(row, text_column):
+    return (
+        f"to_tsvector(CASE WHEN {row}.language_of_filing_code IN ('fr', 'FR') "
+        f"THEN 'french'::regconfig ELSE 'english'::regconfig END, COALESCE({row}.{text_column}, ''))"
+    )
+
+
+def create_triggers(apps, schema_editor):
+    for model_name, text_column in TABLES.items():
+        table = apps.get_model('patents', model_name)._meta.db_table
+        schema_editor.execute(f"""
+            CREATE OR REPLACE FUNCTION {table}_search_vector() RETURNS trigger AS $$
+            BEGIN
+                NEW.search_vector := {vector_sql('NEW', text_column)};
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql;
+            CREATE TRIGGER {table}_search_vector
+                BEFORE INSERT OR UPDATE OF {text_column}, language_of_filing_code, search_vector ON {table}
+                FOR EACH ROW EXECUTE FUNCTION {table}_search_vector();
+        """)
+
+
+def drop_triggers(apps, schema_editor):
+    for model_name in TABLES:
+        table = apps.get_model('patents', model_name)._meta.db_table
+        schema_editor.execute(f"""
+            DROP TRIGGER IF EXISTS {table}_search_vector ON {table};
+            DROP FUNCTION IF EXISTS {table}_search_vector();
+        """)
+
+
+def backfill(apps, schema_editor):
+    # Non-atomic migration: every batch commits on its own, so each holds
+    # its row locks only briefly and readers are never blocked.
+    for model_name, text_column in TABLES.items():
+        table = apps.get_model('patents', model_name)._meta.db_table
+        with schema_editor.connection.cursor() as cursor:
+            cursor.execute(f'SELECT min(id), max(id) FROM {table}')
+            low, high = cursor.fetchone()
+            if low is None:
+                continue
+            for start in range(low, high + 1, BATCH_SIZE):
+                cursor.execute(
+                    f'UPDATE {table} t SET search_vector = {vector_sql("t", text_column)} '
+                    f'WHERE t.id >= %s AND t.id < %s AND t.search_vector IS NULL',
+                    [start, start + BATCH_SIZE],
+                )
+
+
+class Migration(migrations.Migration):
+    # A stored generated column would rewrite these (the largest) tables under
+    # ACCESS EXCLUSIVE. Instead: add a nullable column (catalog-only), keep it
+    # current with a trigger, then backfill existing rows in small committed
+    # batches. 0020 builds the GIN indexes CONCURRENTLY afterwards.
+    atomic = False
+
+    dependencies = [
+        ('patents', '0018_pt_interested_party_keyset_index'),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name=model_name,
+                name='search_vector',
+                field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+            )
+            for model_name in TABLES
+        ],
+        migrations.RunPython(create_triggers, drop_triggers),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
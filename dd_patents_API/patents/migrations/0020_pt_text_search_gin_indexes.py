@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:28
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # GIN builds over the claim/disclosure tables take a while; build them
+    # CONCURRENTLY so the API keeps reading while they run.
+    atomic = False
+
+    dependencies = [
+        ('patents', '0019_pt_text_search_vectors'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='pt_abstract',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='pt_abstract_search_gin'),
+        ),
+        AddIndexConcurrently(
+            model_name='pt_claim',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='pt_claim_search_gin'),
+        ),
+        AddIndexConcurrently(
+            model_name='pt_disclosure',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='pt_disclosure_search_gin'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:31
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently, TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Built CONCURRENTLY so party lookups keep working during the build.
+    atomic = False
+
+    dependencies = [
+        ('patents', '0020_pt_text_search_gin_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        AddIndexConcurrently(
+            model_name='pt_interested_party',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['party_name'], name='pt_ip_party_name_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
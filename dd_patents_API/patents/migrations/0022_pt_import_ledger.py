@@ -0,0 +1,53 @@
+# Generated by Django 5.1.1 on 2026-10-18 08:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patents', '0021_pt_interested_party_name_trgm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PT_Import_File',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('loader', models.CharField(max_length=50)),
+                ('file_name', models.CharField(max_length=255)),
+                ('member_name', models.CharField(blank=True, default='', max_length=255)),
+                ('file_size', models.BigIntegerField()),
+                ('modified_time', models.FloatField()),
+                ('checksum', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('in_progress', 'In progress'), ('done', 'Done'), ('failed', 'Failed')], default='in_progress', max_length=20)),
+                ('row_offset', models.BigIntegerField(default=0)),
+                ('byte_offset', models.BigIntegerField(default=0)),
+                ('rows_loaded', models.BigIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'unique_together': {('loader', 'file_name', 'member_name')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PT_Import_Chunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chunk_number', models.IntegerField()),
+                ('row_start', models.BigIntegerField()),
+                ('row_end', models.BigIntegerField()),
+                ('byte_end', models.BigIntegerField(default=0)),
+                ('rows_loaded', models.BigIntegerField()),
+                ('duration_seconds', models.FloatField()),
+                ('committed_at', models.DateTimeField(auto_now_add=True)),
+                ('import_file', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chunks', to='patents.pt_import_file')),
+            ],
+            options={
+                'unique_together': {('import_file', 'chunk_number')},
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patents', '0022_pt_import_ledger'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PT_Data_Version',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
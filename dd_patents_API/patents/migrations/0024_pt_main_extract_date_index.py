@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:11
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Built CONCURRENTLY so patent lookups keep working during the build.
+    atomic = False
+
+    dependencies = [
+        ('patents', '0023_pt_data_version'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='pt_main',
+            index=models.Index(fields=['bibliographic_file_extract_date'], name='pt_main_extract_date_idx'),
+        ),
+    ]
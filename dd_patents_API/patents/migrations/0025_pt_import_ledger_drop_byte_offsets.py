@@ -0,0 +1,21 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:51
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('patents', '0024_pt_main_extract_date_index'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='pt_import_chunk',
+            name='byte_end',
+        ),
+        migrations.RemoveField(
+            model_name='pt_import_file',
+            name='byte_offset',
+        ),
+    ]
@@ -1,5 +1,27 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchConfig, SearchVectorField
 from django.db import models
 
+# Text search configuration per language_of_filing_code
+FTS_CONFIGS = {'en': 'english', 'fr': 'french'}
+
+
+def filing_language_config():
+    """French filings are parsed with the French config, everything else English."""
+    return models.Case(
+        models.When(language_of_filing_code__in=['fr', 'FR'], then=SearchConfig(FTS_CONFIGS['fr'])),
+        default=SearchConfig(FTS_CONFIGS['en']),
+    )
+
+
+def filing_language_vector():
+    """
+    tsvector of the row's text in its filing language. Kept up to date by a
+    trigger (migration 0019), not a generated column: adding a stored
+    generated column would rewrite the whole table under an exclusive lock.
+    """
+    return SearchVectorField(null=True, editable=False)
+
 
 class PT_Interested_Party(models.Model):
     patent_number = models.ForeignKey('PT_Main', on_delete=models.CASCADE, related_name='interested_parties')
@@ -25,6 +47,12 @@ class PT_Interested_Party(models.Model):
     class Meta:
         db_table = 'pt_interested_party'
         unique_together = ('patent_number', 'party_name', 'owner_enable_date')
+        indexes = [
+            # Keyset pagination walks (patent_number, id) in order.
+            models.Index(fields=['patent_number', 'id'], name='pt_ip_patent_id_idx'),
+            # Serves `?party_fuzzy=` trigram lookups.
+            GinIndex(fields=['party_name'], name='pt_ip_party_name_trgm', opclasses=['gin_trgm_ops']),
+        ]
 
     def __str__(self):
         return f"{self.patent_number.patent_number} - {self.party_name}"
@@ -37,9 +65,13 @@ class PT_Abstract(models.Model):
     abstract_language_code = models.CharField(max_length=2)
     abstract_text = models.TextField()
     abstract_text_sequence_number = models.IntegerField()
+    search_vector = filing_language_vector()
 
     class Meta:
         unique_together = ('patent_number', 'abstract_text_sequence_number')
+        indexes = [
+            GinIndex(fields=['search_vector'], name='pt_abstract_search_gin'),
+        ]
 
     def __str__(self):
         return f"{self.patent_number.patent_number} - {self.abstract_text_sequence_number}"
@@ -49,9 +81,13 @@ class PT_Disclosure(models.Model):
     language_of_filing_code = models.CharField(max_length=2)
     disclosure_text = models.TextField()
     disclosure_text_sequence_number = models.IntegerField()
+    search_vector = filing_language_vector()
 
     class Meta:
         unique_together = ('patent_number', 'disclosure_text_sequence_number')
+        indexes = [
+            GinIndex(fields=['search_vector'], name='pt_disclosure_search_gin'),
+        ]
 
     def __str__(self):
         return f"{self.patent_number.patent_number} - {self.disclosure_text_sequence_number}"
@@ -61,9 +97,13 @@ class PT_Claim(models.Model):
     language_of_filing_code = models.CharField(max_length=2)
     claims_text = models.TextField()
     claim_text_sequence_number = models.IntegerField()
+    search_vector = filing_language_vector()
 
     class Meta:
         unique_together = ('patent_number', 'claim_text_sequence_number')
+        indexes = [
+            GinIndex(fields=['search_vector'], name='pt_claim_search_gin'),
+        ]
 
     def __str__(self):
         return f"{self.patent_number.patent_number} - {self.claim_text_sequence_number}"
@@ -118,8 +158,13 @@ class PT_Main(models.Model):
     pct_publication_country_code = models.CharField(max_length=10, null=True, blank=True)
     publication_kind_type = models.CharField(max_length=10, null=True, blank=True)
     printed_as_amended_country_code = models.CharField(max_length=10, null=True, blank=True)
-    
-    
+
+    class Meta:
+        indexes = [
+            # Serves `?modified_since=` incremental pulls.
+            models.Index(fields=['bibliographic_file_extract_date'], name='pt_main_extract_date_idx'),
+        ]
+
 
 class PT_Priority_Claim(models.Model):
     patent_number = models.ForeignKey(PT_Main, on_delete=models.CASCADE, related_name='priority_claims')
@@ -135,3 +180,54 @@ class PT_Priority_Claim(models.Model):
     def __str__(self):
         return f"{self.patent_number} - {self.foreign_application_patent_number}"
 
+
+
+class PT_Import_File(models.Model):
+    """One source file (or ZIP member) as seen by one loader; the import ledger."""
+    STATUS_CHOICES = [
+        ('in_progress', 'In progress'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    loader = models.CharField(max_length=50)
+    file_name = models.CharField(max_length=255)
+    member_name = models.CharField(max_length=255, blank=True, default='')
+    file_size = models.BigIntegerField()
+    modified_time = models.FloatField()
+    checksum = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='in_progress')
+    row_offset = models.BigIntegerField(default=0)
+    rows_loaded = models.BigIntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ('loader', 'file_name', 'member_name')
+
+    def __str__(self):
+        return f"{self.loader}: {self.file_name} {self.member_name} ({self.status})"
+
+
+class PT_Import_Chunk(models.Model):
+    """A committed chunk of a ledger file, written in the same transaction as its rows."""
+    import_file = models.ForeignKey(PT_Import_File, on_delete=models.CASCADE, related_name='chunks')
+    chunk_number = models.IntegerField()
+    row_start = models.BigIntegerField()
+    row_end = models.BigIntegerField()
+    rows_loaded = models.BigIntegerField()
+    duration_seconds = models.FloatField()
+    committed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('import_file', 'chunk_number')
+
+
+class PT_Data_Version(models.Model):
+    """
+    Single row bumped by the loaders whenever an import finishes. Cached API
+    responses are keyed by it, so a bump invalidates all of them at once.
+    """
+    version = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(null=True, blank=True)
@@ -1,17 +1,51 @@
+import base64
+import json
+
+from django.db.models import F, Field, Func, Value
+from django.db.models.lookups import GreaterThan
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class RowValue(Func):
+    """A row constructor, `(a, b, ...)`; PostgreSQL compares two of them element by element."""
+    template = '(%(expressions)s)'
+    output_field = Field()
 
 
 class FlexiblePageNumberPagination(PageNumberPagination):
     """
     Flexible pagination that allows users to control page size.
     Supports large page sizes for bulk data export while maintaining reasonable defaults.
+
+    Passing `?cursor=` switches to keyset pagination: rows are ordered on the
+    view's `keyset_fields` and each page starts strictly after the last key of
+    the previous one, so there is no COUNT(*) and no OFFSET scan.
+        ?cursor=&page_size=1000            # first page
+        ?cursor=<next_cursor>              # every following page
     """
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 10000  # Allow up to 10K records per page for bulk operations
-    
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_mode = self.cursor_query_param in request.query_params
+        if not self.keyset_mode:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_keyset(queryset, request, view)
+
     def get_paginated_response(self, data):
+        if self.keyset_mode:
+            return Response({
+                'next': self.get_next_cursor_link(),
+                'next_cursor': self.next_cursor,
+                'page_size': self.keyset_page_size,
+                'results': data
+            })
         return Response({
             'count': self.page.paginator.count,
             'next': self.get_next_link(),
@@ -19,4 +53,72 @@ class FlexiblePageNumberPagination(PageNumberPagination):
             'page_size': self.page.paginator.per_page,
             'total_pages': self.page.paginator.num_pages,
             'results': data
-        })
\ No newline at end of file
+        })
+
+    # ------------------------------------------------------------------
+    # keyset (cursor) mode
+    # ------------------------------------------------------------------
+    def get_keyset_fields(self, queryset, view):
+        fields = getattr(view, 'keyset_fields', None)
+        return list(fields) if fields else [queryset.model._meta.pk.name]
+
+    def paginate_keyset(self, queryset, request, view):
+        self.request = request
+        self.keyset_page_size = self.get_page_size(request)
+        fields = self.get_keyset_fields(queryset, view)
+        last_key = self.decode_cursor(request.query_params[self.cursor_query_param], len(fields))
+
+        queryset = queryset.order_by(*fields)
+        if last_key is not None:
+            queryset = self.filter_after(queryset, fields, last_key)
+
+        # Fetch one extra row to know whether a next page exists.
+        rows = list(queryset[:self.keyset_page_size + 1])
+        has_next = len(rows) > self.keyset_page_size
+        rows = rows[:self.keyset_page_size]
+
+        self.next_cursor = None
+        if has_next:
+            last = rows[-1]
+            self.next_cursor = self.encode_cursor(
+                [getattr(last, self.get_attname(queryset, f)) for f in fields]
+            )
+        return rows
+
+    def filter_after(self, queryset, fields, last_key):
+        """
+        Row-value comparison `(a, b) > (x, y)` lets PostgreSQL walk the
+        composite index straight from the last key instead of re-scanning
+        every earlier row.
+        """
+        return queryset.filter(GreaterThan(
+            RowValue(*[F(f) for f in fields]),
+            RowValue(*[Value(value) for value in last_key]),
+        ))
+
+    @staticmethod
+    def get_attname(queryset, field_name):
+        # Foreign keys are compared on the raw column value (patent_number_id).
+        return queryset.model._meta.get_field(field_name).attname
+
+    def encode_cursor(self, key):
+        raw = json.dumps(key, default=str).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    def decode_cursor(self, encoded, key_length):
+        if not encoded:
+            return None
+        try:
+            key = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+        except (TypeError, ValueError, UnicodeError):
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        if not isinstance(key, list) or len(key) != key_length:
+            raise ValidationError({self.cursor_query_param: [self.invalid_cursor_message]})
+        return key
+
+    def get_next_cursor_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
@@ -9,6 +9,13 @@ class IncludeParam(serializers.Serializer):
             "priority_claims, ipc_classifications, or 'all')."
         ),
     )
+    claims_limit = serializers.IntegerField(
+        required=False,
+        help_text=(
+            "Maximum rows per patent for a relation (default 1000). "
+            "Every relation takes `<relation>_limit`, e.g. disclosures_limit."
+        ),
+    )
     fields = serializers.CharField(
         required=False,
         help_text="Comma‑separated list of fields to return (supports dotted paths).",
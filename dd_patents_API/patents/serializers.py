@@ -32,8 +32,26 @@ class PTInterestedPartySerializer(DynamicFieldsMixin, serializers.ModelSerialize
         model  = PT_Interested_Party
         fields = "__all__"
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Set when the row came from a `?party_fuzzy=` lookup.
+        if hasattr(instance, "similarity"):
+            data["similarity"] = instance.similarity
+        return data
 
-class PTAbstractSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+
+class SearchHitMixin:
+    """Adds `rank` / `headline` when the row came from a `?q=` search."""
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if hasattr(instance, "rank"):
+            data["rank"] = instance.rank
+            data["headline"] = instance.headline
+        return data
+
+
+class PTAbstractSerializer(SearchHitMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     patent_number = serializers.CharField(source='patent_number.patent_number', read_only=True)
 
     class Meta:
@@ -47,7 +65,7 @@ class PTAbstractSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
         ]
 
 
-class PTDisclosureSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+class PTDisclosureSerializer(SearchHitMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     patent_number = serializers.CharField(source='patent_number.patent_number', read_only=True)
 
     class Meta:
@@ -60,7 +78,7 @@ class PTDisclosureSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
         ]
 
 
-class PTClaimSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+class PTClaimSerializer(SearchHitMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     patent_number = serializers.CharField(source='patent_number.patent_number', read_only=True)
 
     class Meta:
@@ -115,6 +133,17 @@ class PTMainDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     priority_claims     = PTPriorityClaimNested(many=True, read_only=True)
     ipc_classifications = PTIPCClassificationSerializer(many=True, read_only=True)
 
+    NESTED_RELATIONS = (
+        "abstracts",
+        "claims",
+        "disclosures",
+        "interested_parties",
+        "priority_claims",
+        "ipc_classifications",
+    )
+    # Attribute a capped relation is prefetched into (see PTMainDetailViewSet)
+    LIMITED_ATTR = "{}_limited"
+
     class Meta:
         model  = PT_Main
         fields = [
@@ -128,4 +157,32 @@ class PTMainDetailSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
             "interested_parties",
             "priority_claims",
             "ipc_classifications",
-        ]
\ No newline at end of file
+        ]
+
+    def get_fields(self):
+        # Only embed the relations selected with `include=`; anything else
+        # would be fetched row-by-row because it was never prefetched.
+        fields = super().get_fields()
+        include = self.context.get("include")
+        if include is not None:
+            for name in self.NESTED_RELATIONS:
+                if name not in include:
+                    fields.pop(name, None)
+        for name in self.context.get("relation_limits") or {}:
+            if name in fields:
+                fields[name].source = self.LIMITED_ATTR.format(name)
+        return fields
+
+    def to_representation(self, instance):
+        # Capped relations are prefetched with one row past their limit;
+        # trim it off and report which relations were cut short.
+        data = super().to_representation(instance)
+        limits = self.context.get("relation_limits")
+        if limits:
+            truncated = {}
+            for name, limit in limits.items():
+                if name in data:
+                    truncated[name] = len(data[name]) > limit
+                    data[name] = data[name][:limit]
+            data["truncated"] = truncated
+        return data
\ No newline at end of file
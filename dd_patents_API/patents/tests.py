@@ -1,3 +1,654 @@
-from django.test import TestCase
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+import zipfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from . import applicants
+from .models import (
+    PT_Main, PT_Claim, PT_Abstract, PT_Interested_Party, PT_IPC_Classification, PT_Import_File, PT_Import_Chunk,
+    PT_Data_Version,
+)
+
+
+class KeysetPaginationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(1, 8):
+            main = PT_Main.objects.create(patent_number=f'10000{n}')
+            for seq in range(1, 4):
+                PT_Claim.objects.create(
+                    patent_number=main,
+                    language_of_filing_code='en',
+                    claims_text=f'claim {seq}',
+                    claim_text_sequence_number=seq,
+                )
+
+    def crawl(self, url, **params):
+        """Follow `next_cursor` until exhausted and return every row seen."""
+        rows, cursor = [], ''
+        while cursor is not None:
+            resp = self.client.get(url, {**params, 'cursor': cursor})
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', resp.data)
+            rows.extend(resp.data['results'])
+            cursor = resp.data['next_cursor']
+        return rows
+
+    def test_main_cursor_walks_every_patent_once(self):
+        rows = self.crawl(reverse('main-list'), page_size=3)
+        numbers = [r['patent_number'] for r in rows]
+        self.assertEqual(numbers, sorted(f'10000{n}' for n in range(1, 8)))
+
+    def test_child_cursor_orders_on_sequence_number(self):
+        rows = self.crawl(reverse('claim-list'), page_size=4)
+        keys = [(r['patent_number'], r['claim_text_sequence_number']) for r in rows]
+        self.assertEqual(len(keys), 21)
+        self.assertEqual(keys, sorted(keys))
+
+    def test_next_link_carries_cursor(self):
+        resp = self.client.get(reverse('main-list'), {'cursor': '', 'page_size': 2})
+        self.assertIn('cursor=', resp.data['next'])
+
+    def test_invalid_cursor(self):
+        resp = self.client.get(reverse('main-list'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.data, {'cursor': ['Invalid cursor.']})
+
+    def test_page_mode_unchanged(self):
+        resp = self.client.get(reverse('main-list'), {'page_size': 2})
+        self.assertEqual(resp.data['count'], 7)
+        self.assertEqual(resp.data['total_pages'], 4)
+
+
+class NdjsonExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(1, 6):
+            main = PT_Main.objects.create(patent_number=f'20000{n}')
+            PT_Claim.objects.create(
+                patent_number=main,
+                language_of_filing_code='en',
+                claims_text='a claim',
+                claim_text_sequence_number=1,
+            )
+
+    def export(self, **params):
+        resp = self.client.get(reverse('main_detail-export'), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp['Content-Type'], 'application/x-ndjson')
+        body = b''.join(resp.streaming_content).decode('utf-8')
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_streams_one_object_per_line(self):
+        rows = self.export(include='claims')
+        self.assertEqual([r['patent_number'] for r in rows], [f'20000{n}' for n in range(1, 6)])
+        self.assertEqual(rows[0]['claims'], [{'language_of_filing_code': 'en', 'claims_text': 'a claim'}])
+        self.assertNotIn('abstracts', rows[0])
+
+    def test_honours_filters(self):
+        rows = self.export(patent_number_after=200003)
+        self.assertEqual(len(rows), 3)
+
+    def test_refused_without_server_side_cursors(self):
+        # DB_POOL_MODE=pgbouncer without DB_EXPORT_HOST: iterator() would buffer everything.
+        with mock.patch.dict(connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True):
+            for url in (reverse('main_detail-export'), reverse('parquet-detail', args=['pt_main'])):
+                resp = self.client.get(url)
+                self.assertEqual(resp.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+                self.assertEqual(resp.data['detail'].code, 'export_unavailable')
+            with tempfile.TemporaryDirectory() as directory:
+                with self.assertRaisesMessage(CommandError, 'DB_EXPORT_HOST'):
+                    call_command('export_parquet', directory, 'pt_main', stdout=io.StringIO())
+
+
+class ParquetExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for n in range(1, 6):
+            main = PT_Main.objects.create(
+                patent_number=f'80000{n}',
+                filing_country_code='CA',
+                bibliographic_file_extract_date=datetime.date(2024, 1, n),
+            )
+            PT_Claim.objects.create(
+                patent_number=main,
+                language_of_filing_code='en',
+                claims_text='a claim',
+                claim_text_sequence_number=1,
+            )
+
+    def test_command_writes_partitioned_files(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            call_command('export_parquet', directory, 'pt_main', 'pt_claim', rows_per_file=2, batch_size=2,
+                         stdout=io.StringIO())
+            parts = sorted(os.listdir(os.path.join(directory, 'pt_main')))
+            table = pq.read_table(os.path.join(directory, 'pt_main'))
+            claims = pq.read_table(os.path.join(directory, 'pt_claim'))
+
+        self.assertEqual(parts, ['part-00000.parquet', 'part-00001.parquet', 'part-00002.parquet'])
+        self.assertEqual(table.column('patent_number').to_pylist(), [f'80000{n}' for n in range(1, 6)])
+        self.assertEqual(table.schema.field('filing_country_code').type, pa.dictionary(pa.int32(), pa.string()))
+        self.assertEqual(table.schema.metadata[b'extract_date'], b'2024-01-05')
+        self.assertEqual(claims.column('patent_number_id').to_pylist()[0], '800001')
+
+    def test_endpoint_streams_one_file(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        resp = self.client.get(reverse('parquet-detail', args=['pt_main']))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        table = pq.read_table(pa.BufferReader(b''.join(resp.streaming_content)))
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(self.client.get('/patents/parquet/pt_nope/').status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BoundedPrefetchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        main = PT_Main.objects.create(patent_number='300001')
+        for seq in range(1, 11):
+            PT_Claim.objects.create(
+                patent_number=main,
+                language_of_filing_code='en',
+                claims_text=f'claim {seq}',
+                claim_text_sequence_number=seq,
+            )
+
+    def test_relation_limit_truncates_and_flags(self):
+        resp = self.client.get(reverse('main_detail-list'), {'include': 'claims', 'claims_limit': 3})
+        row = resp.data['results'][0]
+        self.assertEqual([c['claims_text'] for c in row['claims']], ['claim 1', 'claim 2', 'claim 3'])
+        self.assertEqual(row['truncated'], {'claims': True})
+
+    def test_relation_under_limit_is_not_flagged(self):
+        resp = self.client.get(reverse('main_detail-list'), {'include': 'claims'})
+        row = resp.data['results'][0]
+        self.assertEqual(len(row['claims']), 10)
+        self.assertEqual(row['truncated'], {'claims': False})
+
+
+class FullTextSearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        main = PT_Main.objects.create(patent_number='400001')
+        texts = [
+            ('en', 'A rechargeable lithium battery with a ceramic separator.'),
+            ('en', 'A bicycle frame made of carbon fibre.'),
+            ('fr', 'Une batterie au lithium rechargeable.'),
+        ]
+        for seq, (lang, text) in enumerate(texts, start=1):
+            PT_Abstract.objects.create(
+                patent_number=main,
+                language_of_filing_code=lang,
+                abstract_language_code=lang,
+                abstract_text=text,
+                abstract_text_sequence_number=seq,
+            )
+
+    def search(self, **params):
+        resp = self.client.get(reverse('abstract-list'), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data['results']
+
+    def test_stemmed_match_in_both_languages(self):
+        rows = self.search(q='batteries')
+        self.assertEqual(sorted(r['abstract_text_sequence_number'] for r in rows), [1, 3])
+        self.assertIn('<b>', rows[0]['headline'])
+        self.assertGreater(rows[0]['rank'], 0)
+
+    def test_language_restricted_query(self):
+        rows = self.search(q='batteries', q_lang='fr')
+        self.assertEqual([r['abstract_text_sequence_number'] for r in rows], [3])
+
+    def test_plain_listing_has_no_search_fields(self):
+        rows = self.search()
+        self.assertNotIn('rank', rows[0])
+
+
+class PartyFuzzySearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        main = PT_Main.objects.create(patent_number='500001')
+        for name in ['ACME Corporation', 'Acme Corp.', 'Globex Inc.']:
+            PT_Interested_Party.objects.create(
+                patent_number=main,
+                agent_type_code='', applicant_type_code='',
+                interested_party_type_code='', interested_party_type='',
+                party_name=name, party_address_line_1='',
+                party_city='', party_country_code='CA', party_country='',
+            )
+
+    def search(self, **params):
+        resp = self.client.get(reverse('interested_party-list'), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data['results']
+
+    def test_ranked_by_similarity(self):
+        rows = self.search(party_fuzzy='acme corp')
+        self.assertEqual([r['party_name'] for r in rows], ['Acme Corp.', 'ACME Corporation'])
+        self.assertGreater(rows[0]['similarity'], rows[1]['similarity'])
+
+    def test_min_similarity_narrows(self):
+        rows = self.search(party_fuzzy='acme corp', min_similarity=0.9)
+        self.assertEqual([r['party_name'] for r in rows], ['Acme Corp.'])
+
+
+class ParallelCopyLoaderTest(TransactionTestCase):
+    claim_header = (
+        'Patent Number - Numéro du brevet|'
+        'Claim text sequence number - Texte des revendications numéro de séquence|'
+        'Language of Filing Code - Langue du type de dépôt|'
+        'Claims Text - Texte des revendications\n'
+    )
+
+    def write_zip(self, directory, name, members):
+        with zipfile.ZipFile(os.path.join(directory, name), 'w') as archive:
+            for member, body in members.items():
+                archive.writestr(member, body)
+
+    def test_streams_zip_members_and_upserts(self):
+        PT_Main.objects.create(patent_number='600001')
+        PT_Main.objects.create(patent_number='600002')
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_zip(directory, 'PT_claim_1.zip', {
+                'a.csv': self.claim_header + '600001|1|en|first\n600001|2|ENG|second\n',
+            })
+            self.write_zip(directory, 'PT_claim_2.zip', {
+                'b.csv': self.claim_header + '600002|1|fr|"pipe | inside"\n',
+            })
+            call_command('import_parallel', 'claims', directory, workers=2, stdout=io.StringIO())
+            # Re-running a file updates in place rather than duplicating.
+            self.write_zip(directory, 'PT_claim_1.zip', {
+                'a.csv': self.claim_header + '600001|1|en|first, revised\n',
+            })
+            call_command('import_parallel', 'claims', directory, workers=2, stdout=io.StringIO())
+
+        rows = list(PT_Claim.objects.order_by('patent_number', 'claim_text_sequence_number')
+                    .values_list('patent_number', 'claim_text_sequence_number', 'language_of_filing_code', 'claims_text'))
+        self.assertEqual(rows, [
+            ('600001', 1, 'en', 'first, revised'),
+            ('600001', 2, 'EN', 'second'),
+            ('600002', 1, 'fr', 'pipe | inside'),
+        ])
+
+    def test_main_cleans_dates_and_flags(self):
+        columns = [f.column for f in PT_Main._meta.concrete_fields]
+        row = dict.fromkeys(columns, '')
+        row.update(patent_number='600003', filing_date='2020-01-31', grant_date='-1',
+                   examination_request_date='NULL', application_patent_title_english='x' * 600)
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'PT_main.csv'), 'w', encoding='utf-8') as f:
+                f.write('|'.join(columns) + '\n' + '|'.join(row[c] for c in columns) + '\n')
+            call_command('import_parallel', 'main', directory, workers=1, stdout=io.StringIO())
+
+        main = PT_Main.objects.get(patent_number='600003')
+        self.assertEqual(str(main.filing_date), '2020-01-31')
+        self.assertIsNone(main.grant_date)
+        self.assertIsNone(main.examination_request_date)
+        self.assertFalse(main.license_for_sale_indicator)
+        self.assertEqual(len(main.application_patent_title_english), 500)
+
+    def test_defer_constraints_rebuilds_and_reports(self):
+        from django.db import connection
+
+        def claim_indexes():
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT indexname FROM pg_indexes WHERE tablename = %s", [PT_Claim._meta.db_table])
+                return sorted(row[0] for row in cursor.fetchall())
+
+        before = claim_indexes()
+        PT_Main.objects.create(patent_number='600004')
+        with tempfile.TemporaryDirectory() as directory:
+            self.write_zip(directory, 'PT_claim.zip', {
+                'a.csv': self.claim_header + '600004|1|en|kept\n600099|1|en|orphan\n',
+            })
+            stderr = io.StringIO()
+            with self.assertRaises(CommandError):
+                call_command('import_parallel', 'claims', directory, workers=2, defer_constraints=True,
+                             stdout=io.StringIO(), stderr=stderr)
+
+        self.assertIn('1 violating row(s)', stderr.getvalue())
+        self.assertEqual(claim_indexes(), before)
+        self.assertEqual(PT_Claim.objects.count(), 2)
+        # Left NOT VALID, but still enforced for new rows.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT conname, convalidated FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'",
+                [PT_Claim._meta.db_table],
+            )
+            (name, validated), = cursor.fetchall()
+            self.assertFalse(validated)
+            PT_Claim.objects.filter(patent_number='600099').delete()
+            cursor.execute(f"ALTER TABLE {PT_Claim._meta.db_table} VALIDATE CONSTRAINT {name}")
+
+
+class ImportLedgerTest(TransactionTestCase):
+    def test_resume_skip_and_reset(self):
+        from django.db import connection
+        from .management import import_ledger
+
+        conn = connection.cursor().connection
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'PT_abstract_1.zip')
+            with open(path, 'wb') as f:
+                f.write(b'first')
+
+            entry = import_ledger.begin_file(conn, 'test', path, 'a.csv')
+            with conn.cursor() as cur:
+                import_ledger.record_chunk(cur, entry, 10, 10)
+            conn.commit()
+            # Interrupted here: the next run resumes after the committed chunk.
+            entry = import_ledger.begin_file(conn, 'test', path, 'a.csv')
+            self.assertEqual((entry['skip'], entry['row_offset']), (False, 10))
+            with conn.cursor() as cur:
+                import_ledger.record_chunk(cur, entry, 5, 15)
+                import_ledger.finish_file(cur, entry)
+            conn.commit()
+
+            self.assertTrue(import_ledger.file_is_loaded(conn, 'test', path))
+            self.assertTrue(import_ledger.begin_file(conn, 'test', path, 'a.csv')['skip'])
+            ledger = PT_Import_File.objects.get(loader='test')
+            self.assertEqual((ledger.status, ledger.row_offset, ledger.rows_loaded), ('done', 15, 15))
+            self.assertEqual(list(ledger.chunks.order_by('chunk_number').values_list('row_start', 'row_end')),
+                             [(0, 10), (10, 15)])
+
+            with open(path, 'wb') as f:
+                f.write(b'second')
+            self.assertFalse(import_ledger.file_is_loaded(conn, 'test', path))
+            entry = import_ledger.begin_file(conn, 'test', path, 'a.csv')
+            self.assertEqual((entry['skip'], entry['row_offset']), (False, 0))
+            self.assertFalse(PT_Import_Chunk.objects.exists())
+
+    def test_import_parallel_skips_unchanged_files(self):
+        PT_Main.objects.create(patent_number='610001')
+        header = ParallelCopyLoaderTest.claim_header
+        with tempfile.TemporaryDirectory() as directory:
+            with zipfile.ZipFile(os.path.join(directory, 'PT_claim_1.zip'), 'w') as archive:
+                archive.writestr('a.csv', header + '610001|1|en|first\n')
+            call_command('import_parallel', 'claims', directory, workers=1, stdout=io.StringIO())
+            out = io.StringIO()
+            call_command('import_parallel', 'claims', directory, workers=1, stdout=out)
+
+        self.assertIn('Loaded 0 rows', out.getvalue())
+        ledger = PT_Import_File.objects.get(loader='import_parallel:claims')
+        self.assertEqual((ledger.member_name, ledger.status, ledger.rows_loaded), ('a.csv', 'done', 1))
+
+
+    def test_zip_is_hashed_once_for_all_its_members(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from .management import copy_loader, import_ledger
+
+        PT_Main.objects.create(patent_number='620001')
+        header = ParallelCopyLoaderTest.claim_header
+        with tempfile.TemporaryDirectory() as directory:
+            with zipfile.ZipFile(os.path.join(directory, 'PT_claim_1.zip'), 'w') as archive:
+                archive.writestr('a.csv', header + '620001|1|en|first\n')
+                archive.writestr('b.csv', header + '620001|2|en|second\n')
+            hashed = mock.Mock(wraps=import_ledger.file_checksum)
+            # Threads instead of processes, so the workers' calls are counted too.
+            with mock.patch.object(copy_loader, 'ProcessPoolExecutor', ThreadPoolExecutor), \
+                    mock.patch.object(import_ledger, 'file_checksum', hashed):
+                results = copy_loader.load_parallel('claims', directory, workers=2)
+                self.assertEqual(sorted(results.values()), [1, 1])
+                self.assertEqual(hashed.call_count, 1)
+                # Unchanged since: nobody hashes it.
+                copy_loader.load_parallel('claims', directory, workers=2)
+                self.assertEqual(hashed.call_count, 1)
+        ledger = PT_Import_File.objects.filter(loader='import_parallel:claims')
+        self.assertEqual(sorted(ledger.values_list('member_name', flat=True)), ['a.csv', 'b.csv'])
+        self.assertEqual(len(set(ledger.values_list('checksum', flat=True))), 1)
+
+
+class ZipStreamTest(SimpleTestCase):
+    def test_members_stream_with_compressed_progress(self):
+        from .management import zip_stream
+
+        body = 'a|b\n' + ''.join(f'{i}|"multi\nline {i}"\n' for i in range(5000))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'PT_test.zip')
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                archive.writestr('one.csv', body)
+                archive.writestr('two.CSV', body)
+                archive.writestr('notes.txt', 'skip me')
+
+            progress = []
+            with zip_stream.open_member(path, 'one.csv', progress=lambda *args: progress.append(args)) as stream:
+                self.assertEqual(stream.read(), body)
+            total = zipfile.ZipFile(path).getinfo('one.csv').compress_size
+            self.assertEqual(progress[-1], ('PT_test.zip:one.csv', total, total))
+
+            counts = zip_stream.map_members(_count_lines, path, workers=2)
+        self.assertEqual(counts, {'one.csv': 5001, 'two.CSV': 5001})
+
+
+def _count_lines(stream, member):
+    return sum(1 for _ in csv.reader(stream, delimiter='|'))
+
+
+class CleaningTest(SimpleTestCase):
+    def test_vectorised_cleaner_matches_clean_cell(self):
+        import pandas as pd
+        from .management.cleaning import clean_cell, clean_frame
+        from .management.copy_loader import build_spec
+
+        rules = build_spec('main')['columns']
+        values = {
+            'filing_date': ['2020-01-31', '2019-02-30', '2020-1-5', '-1', 'NULL', '', ' 2020-02-29\x07', 'soon', None],
+            'license_for_sale_indicator': ['TRUE', '', 'NULL', 'FALSE', ' NULL ', 'Y', '\x00', 'TRUE', None],
+            'application_patent_title_english': ['x' * 501, 'é' * 500, 'NULL', '', ' a\tb ', 'y' * 1000,
+                                                 'ok\u2028', 'x' * 499 + '\x07z', None],
+        }
+        # One frame per column rule: what pandas reads, with NaN for a field missing from a short row.
+        df = pd.DataFrame(values, dtype=str)
+        cleaned = clean_frame(df, {column: rules[column] for column in values})
+        for column, raw in values.items():
+            with self.subTest(column=column):
+                self.assertEqual(cleaned[column].tolist(), [clean_cell(v, rules[column]) for v in raw])
+
+    def test_main3_resumes_after_skipped_rows(self):
+        from .management.commands2 import main3
+
+        columns = [f.column for f in PT_Main._meta.concrete_fields]
+        rows = ['|'.join([f'60000{n}', f'2020-01-0{n}'] + [''] * (len(columns) - 2)) for n in range(1, 4)]
+        body = '|'.join(columns) + '\n' + '\n'.join(rows) + '\n'
+        chunks = list(main3.cleaned_csv_chunks(io.StringIO(body), skip_rows=1))
+        self.assertEqual([count for count, _ in chunks], [2])
+        lines = chunks[0][1].splitlines()
+        self.assertEqual([line.split('|')[:3] for line in lines],
+                         [['600002', '2020-01-02', r'\N'], ['600003', '2020-01-03', r'\N']])
+
+
+class IPCStagedMergeTest(TransactionTestCase):
+    def test_copy_clean_and_merge(self):
+        import psycopg2
+        from .management.commands2 import IPC
+        from .management.copy_loader import db_params_from_settings
+
+        PT_Main.objects.create(patent_number='700001')
+        header = '|'.join(IPC.CSV_TO_DB_FIELD_MAPPING)
+        base = ['2019-01-01', 'A', 'B', 'C', 'D', 'Section', 'H01', 'Class', 'H01M', 'Sub', '10', 'Group', '0525', 'Subgroup']
+        rows = [
+            ['700001', '1'] + base,
+            ['700001', '1'] + base,                            # duplicate key
+            ['700001', '2', '2019-02-30x'] + base[1:],         # not a date
+            ['700001', '4', '2019-02-30'] + base[1:],          # no such day
+            ['700001', '99999999999'] + base,                  # sequence number out of range
+            ['799999', '1'] + base,                            # no parent patent
+            ['700001', '3', '2019-01-01', ' Level\x07'] + base[2:],
+            ['700001', '5', '2020-02-29'] + base[1:],          # leap day
+        ]
+        body = header + '\n' + '\n'.join('|'.join(r) for r in rows) + '\n'
+
+        # The loader scripts run on their own psycopg2 connection, as in production.
+        conn = psycopg2.connect(**db_params_from_settings())
+        IPC.create_staging_table(conn)
+        try:
+            staged, inserted = IPC.load_csv(io.StringIO(body), conn, 'test.csv')
+        finally:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP TABLE IF EXISTS {IPC.staging_table}")
+            conn.commit()
+            conn.close()
+
+        self.assertEqual((staged, inserted), (8, 3))
+        levels = dict(PT_IPC_Classification.objects.values_list('ipc_classification_sequence_number', 'classification_level'))
+        self.assertEqual(levels, {1: 'A', 3: 'L', 5: 'A'})
+        # Bumped in the merge's transaction, so cached API responses are rebuilt.
+        self.assertEqual(PT_Data_Version.objects.get().version, 1)
+
+
+@override_settings(DATA_VERSION_TTL=0)
+class ResponseCacheTest(TransactionTestCase):
+    # Not a TestCase: responses built inside its transaction are never cached.
+    def setUp(self):
+        cache.clear()
+
+    def test_hit_conditional_get_and_invalidation(self):
+        PT_Main.objects.create(patent_number='800001')
+        url = reverse('main-list')
+        first = self.client.get(url, {'patent_number': '800001', 'page_size': 5})
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        # Same parameters in another order: same entry.
+        second = self.client.get(f'{url}?page_size=5&patent_number=800001')
+        self.assertEqual((second['X-Cache'], second.content), ('HIT', first.content))
+
+        conditional = self.client.get(f'{url}?page_size=5&patent_number=800001', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(conditional.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        call_command('bump_data_version', stdout=io.StringIO())
+        third = self.client.get(url, {'patent_number': '800001', 'page_size': 5})
+        self.assertEqual(third['X-Cache'], 'MISS')
+        # The patent itself did not change, so neither did its validators.
+        self.assertEqual(third['ETag'], first['ETag'])
+        cached = self.client.get(url, {'patent_number': '800001', 'page_size': 5}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        old = PT_Main.objects.create(patent_number='810001', bibliographic_file_extract_date=datetime.date(2024, 1, 2))
+        new = PT_Main.objects.create(patent_number='810002', bibliographic_file_extract_date=datetime.date(2024, 3, 5))
+        for patent in (old, new):
+            PT_Claim.objects.create(patent_number=patent, language_of_filing_code='en',
+                                    claims_text='claim', claim_text_sequence_number=1)
+
+    def test_modified_since(self):
+        for name in ('main-list', 'claim-list', 'main_detail-list'):
+            response = self.client.get(reverse(name), {'modified_since': '2024-02-01'})
+            numbers = [row['patent_number'] for row in response.data['results']]
+            self.assertEqual(numbers, ['810002'], name)
+
+    def test_detail_and_list_validators(self):
+        detail = self.client.get(reverse('main-detail', args=['810001']))
+        self.assertEqual(detail['Last-Modified'], 'Tue, 02 Jan 2024 00:00:00 GMT')
+        self.assertEqual(self.client.get(reverse('main-detail', args=['810001']),
+                                         HTTP_IF_MODIFIED_SINCE=detail['Last-Modified']).status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+        claims = self.client.get(reverse('claim-list'))
+        self.assertEqual(claims['Last-Modified'], 'Tue, 05 Mar 2024 00:00:00 GMT')
+        again = self.client.get(reverse('claim-list'), HTTP_IF_NONE_MATCH=claims['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        PT_Main.objects.filter(pk='810001').update(bibliographic_file_extract_date=datetime.date(2024, 4, 1))
+        changed = self.client.get(reverse('claim-list'), HTTP_IF_NONE_MATCH=claims['ETag'])
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+
+
+@override_settings(APPLICANT_SEARCH_DATABASES={'trademarks': 'default', 'designs': 'default'})
+class ApplicantSearchTest(TransactionTestCase):
+    # Not a TestCase: the sources are read on worker threads, over their own connections.
+    unmanaged_tables = """
+        CREATE TABLE tm_main (application_number text PRIMARY KEY, mark_verbal_element_text text);
+        CREATE TABLE tm_interested_party (application_number text, party_name text, party_type_code smallint,
+                                          party_country_code text);
+        CREATE SCHEMA id_csv_2024_03_07;
+        CREATE TABLE id_csv_2024_03_07.application_main (application_number text, extension_number text,
+                                                         design_title text);
+        CREATE TABLE id_csv_2024_03_07.application_interested_party (
+            application_number text, extension_number text, organization_name text, role text, country_code text);
+    """
+
+    def setUp(self):
+        # Workers would otherwise keep their connections, and the test database could not be dropped.
+        patcher = mock.patch.dict(connection.settings_dict, CONN_MAX_AGE=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+        with connection.cursor() as cursor:
+            cursor.execute(self.unmanaged_tables)
+            cursor.execute("""
+                INSERT INTO tm_main VALUES ('1900001', 'WIDGETRON');
+                INSERT INTO tm_interested_party VALUES ('1900001', 'Acme Widgets Ltd', 1, 'CA'),
+                                                       ('1900002', 'Acme Widgets Canada', 1, 'CA');
+                INSERT INTO id_csv_2024_03_07.application_main VALUES ('200001', '0', 'Widget casing');
+                INSERT INTO id_csv_2024_03_07.application_interested_party
+                    VALUES ('200001', '0', 'Acmé Widgets S.A.', 'Applicant', 'FR');
+            """)
+        main = PT_Main.objects.create(patent_number='3000001', application_patent_title_english='Widget')
+        for name, party_type in [('ACME WIDGETS, INC.', 'Applicant'), ('Acme Widgets Inc', 'Owner'),
+                                 ('Acme Widgets Canada', 'Inventor')]:
+            PT_Interested_Party.objects.create(
+                patent_number=main,
+                agent_type_code='', applicant_type_code='',
+                interested_party_type_code='', interested_party_type=party_type,
+                party_name=name, party_address_line_1='',
+                party_city='', party_country_code='US', party_country='',
+            )
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TABLE tm_interested_party, tm_main; DROP SCHEMA id_csv_2024_03_07 CASCADE;')
+
+    def test_merged_across_sources(self):
+        response = self.client.get(reverse('applicant_search'), {'name': 'Acme Widgets Incorporated'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['key'], 'acme widgets')
+        self.assertEqual({s: v['status'] for s, v in response.data['sources'].items()},
+                         {'patents': 'ok', 'trademarks': 'ok', 'designs': 'ok'})
+        results = response.data['results']
+        self.assertEqual([(r['source'], r['number']) for r in results],
+                         [('patents', '3000001'), ('trademarks', '1900001'), ('designs', '200001')])
+        self.assertEqual(results[0]['roles'], ['Applicant', 'Owner'])
+        self.assertEqual(results[2]['title'], 'Widget casing')
+
+    def test_unconfigured_source_is_reported(self):
+        with self.settings(APPLICANT_SEARCH_DATABASES={}):
+            response = self.client.get(reverse('applicant_search'), {'name': 'acme widgets'})
+        self.assertEqual(response.data['sources']['designs'], {'status': 'not_configured'})
+        self.assertEqual(response.data['count'], 1)
+
+    def test_candidates_are_capped_closest_first(self):
+        with self.settings(APPLICANT_SEARCH_MAX_CANDIDATES=2):
+            response = self.client.get(reverse('applicant_search'), {'name': 'acme widgets'})
+        sources = response.data['sources']
+        # Patents had three candidate names; 'Acme Widgets Canada' is the one left out.
+        self.assertTrue(sources['patents']['truncated'])
+        self.assertEqual(response.data['results'][0]['roles'], ['Applicant', 'Owner'])
+        self.assertFalse(sources['trademarks']['truncated'])
+        self.assertEqual(response.data['count'], 3)
+
+    def test_pages_are_served_from_one_search(self):
+        with mock.patch.object(applicants, '_query', wraps=applicants._query) as query:
+            first = self.client.get(reverse('applicant_search'), {'name': 'acme widgets', 'page_size': 2})
+            self.assertEqual(query.call_count, 3)
+            second = self.client.get(first.data['next'])
+            self.assertEqual(query.call_count, 3)
+        self.assertEqual([r['number'] for r in first.data['results'] + second.data['results']],
+                         ['3000001', '1900001', '200001'])
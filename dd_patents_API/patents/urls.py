@@ -5,6 +5,7 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from .views_detail import PTMainDetailViewSet
+from .views_export import ParquetExportViewSet
 # Router for API endpoints
 router = DefaultRouter()
 router.register(r'pt_main', PTMainViewSet, basename='main')
@@ -15,6 +16,7 @@ router.register(r'pt_disclosure', PTDisclosureViewSet, basename='disclosure')
 router.register(r'pt_claim', PTClaimViewSet, basename='claim')
 router.register(r'pt_ipc_classification', PTIPCClassificationViewSet, basename='ipc_classification')
 router.register(r'pt_main_detail', PTMainDetailViewSet, basename='main_detail')
+router.register(r'parquet', ParquetExportViewSet, basename='parquet')
 
 
 # Swagger schema view
@@ -3,7 +3,8 @@ from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
 import django_filters
 
-from .filters import OmitFilter
+from .conditional import ExtractDateConditionalMixin
+from .filters import FullTextSearchFilter, OmitFilter, TrigramSimilarityFilter
 from .models import (
     PT_Main,
     PT_Priority_Claim,
@@ -41,6 +42,8 @@ class PTMainFilter(django_filters.FilterSet):
     filing_date_exact = django_filters.DateFilter(field_name='filing_date', lookup_expr='exact')
     # Filter to exclude null filing dates
     has_filing_date = django_filters.BooleanFilter(field_name='filing_date', lookup_expr='isnull', exclude=True)
+    # Changed by an extract after a date: ?modified_since=2024-03-01
+    modified_since = django_filters.DateFilter(field_name='bibliographic_file_extract_date', lookup_expr='gt')
 
     class Meta:
         model = PT_Main
@@ -54,12 +57,13 @@ class PTMainFilter(django_filters.FilterSet):
             'filing_date_before', 
             'filing_date_exact',
             'has_filing_date',
+            'modified_since',
             'application_patent_title_english',
             'application_patent_title_french',
             'country_of_publication_code'
         ]
 
-class PTMainViewSet(viewsets.ReadOnlyModelViewSet):
+class PTMainViewSet(ExtractDateConditionalMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PT_Main.objects.all()
     serializer_class = PTMainSerializer
     filter_backends = [SearchFilter, DjangoFilterBackend]
@@ -70,6 +74,7 @@ class PTMainViewSet(viewsets.ReadOnlyModelViewSet):
         'country_of_publication_code'
     ]
     filterset_class = PTMainFilter
+    keyset_fields = ('patent_number',)
 
 
 #
@@ -79,6 +84,7 @@ class PTPriorityClaimFilter(django_filters.FilterSet):
     patent_number = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='exact')
     patent_number_after = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='gte')
     patent_number_before = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='lte')
+    modified_since = django_filters.DateFilter(field_name='patent_number__bibliographic_file_extract_date', lookup_expr='gt')
     
     class Meta:
         model = PT_Priority_Claim
@@ -86,15 +92,17 @@ class PTPriorityClaimFilter(django_filters.FilterSet):
             'patent_number',
             'patent_number_after',
             'patent_number_before',
+            'modified_since',
             'priority_claim_country_code'
         ]
 
-class PTPriorityClaimViewSet(viewsets.ReadOnlyModelViewSet):
+class PTPriorityClaimViewSet(ExtractDateConditionalMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PT_Priority_Claim.objects.all()
     serializer_class = PTPriorityClaimSerializer
     filter_backends = [SearchFilter, DjangoFilterBackend]
     search_fields = ['patent_number__patent_number', 'priority_claim_country_code']
     filterset_class = PTPriorityClaimFilter
+    keyset_fields = ('patent_number', 'foreign_application_patent_number')
 
 
 #
@@ -104,6 +112,9 @@ class PTInterestedPartyFilter(django_filters.FilterSet):
     patent_number = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='exact')
     patent_number_after = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='gte')
     patent_number_before = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='lte')
+    modified_since = django_filters.DateFilter(field_name='patent_number__bibliographic_file_extract_date', lookup_expr='gt')
+    # Fuzzy match: ?party_fuzzy=acme corp&min_similarity=0.4
+    party_fuzzy = TrigramSimilarityFilter(field_name='party_name')
     
     class Meta:
         model = PT_Interested_Party
@@ -111,16 +122,19 @@ class PTInterestedPartyFilter(django_filters.FilterSet):
             'patent_number',
             'patent_number_after',
             'patent_number_before',
+            'modified_since',
             'party_name',
+            'party_fuzzy',
             'party_country_code'
         ]
 
-class PTInterestedPartyViewSet(viewsets.ReadOnlyModelViewSet):
+class PTInterestedPartyViewSet(ExtractDateConditionalMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PT_Interested_Party.objects.all()
     serializer_class = PTInterestedPartySerializer
     filter_backends = [SearchFilter, DjangoFilterBackend]
     search_fields = ['patent_number__patent_number', 'party_name', 'party_country_code']
     filterset_class = PTInterestedPartyFilter
+    keyset_fields = ('patent_number', 'id')
 
 
 #
@@ -130,6 +144,7 @@ class PTAbstractFilter(django_filters.FilterSet):
     patent_number = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='exact')
     patent_number_after = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='gte')
     patent_number_before = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='lte')
+    modified_since = django_filters.DateFilter(field_name='patent_number__bibliographic_file_extract_date', lookup_expr='gt')
     
     class Meta:
         model = PT_Abstract
@@ -137,15 +152,18 @@ class PTAbstractFilter(django_filters.FilterSet):
             'patent_number',
             'patent_number_after',
             'patent_number_before',
+            'modified_since',
             'language_of_filing_code'
         ]
 
-class PTAbstractViewSet(viewsets.ReadOnlyModelViewSet):
+class PTAbstractViewSet(ExtractDateConditionalMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PT_Abstract.objects.all()
     serializer_class = PTAbstractSerializer
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    filter_backends = [SearchFilter, DjangoFilterBackend, FullTextSearchFilter]
     search_fields = ['patent_number__patent_number', 'language_of_filing_code']
     filterset_class = PTAbstractFilter
+    search_text_field = 'abstract_text'
+    keyset_fields = ('patent_number', 'abstract_text_sequence_number')
 
 
 #
@@ -155,6 +173,7 @@ class PTDisclosureFilter(django_filters.FilterSet):
     patent_number = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='exact')
     patent_number_after = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='gte')
     patent_number_before = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='lte')
+    modified_since = django_filters.DateFilter(field_name='patent_number__bibliographic_file_extract_date', lookup_expr='gt')
     
     class Meta:
         model = PT_Disclosure
@@ -162,15 +181,18 @@ class PTDisclosureFilter(django_filters.FilterSet):
             'patent_number',
             'patent_number_after',
             'patent_number_before',
+            'modified_since',
             'language_of_filing_code'
         ]
 
-class PTDisclosureViewSet(viewsets.ReadOnlyModelViewSet):
+class PTDisclosureViewSet(ExtractDateConditionalMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PT_Disclosure.objects.all()
     serializer_class = PTDisclosureSerializer
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    filter_backends = [SearchFilter, DjangoFilterBackend, FullTextSearchFilter]
     search_fields = ['patent_number__patent_number', 'language_of_filing_code']
     filterset_class = PTDisclosureFilter
+    search_text_field = 'disclosure_text'
+    keyset_fields = ('patent_number', 'disclosure_text_sequence_number')
 
 
 #
@@ -180,6 +202,7 @@ class PTClaimFilter(django_filters.FilterSet):
     patent_number = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='exact')
     patent_number_after = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='gte')
     patent_number_before = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='lte')
+    modified_since = django_filters.DateFilter(field_name='patent_number__bibliographic_file_extract_date', lookup_expr='gt')
     
     class Meta:
         model = PT_Claim
@@ -187,15 +210,18 @@ class PTClaimFilter(django_filters.FilterSet):
             'patent_number',
             'patent_number_after',
             'patent_number_before',
+            'modified_since',
             'language_of_filing_code'
         ]
 
-class PTClaimViewSet(viewsets.ReadOnlyModelViewSet):
+class PTClaimViewSet(ExtractDateConditionalMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PT_Claim.objects.all()
     serializer_class = PTClaimSerializer
-    filter_backends = [SearchFilter, DjangoFilterBackend]
+    filter_backends = [SearchFilter, DjangoFilterBackend, FullTextSearchFilter]
     search_fields = ['patent_number__patent_number', 'language_of_filing_code']
     filterset_class = PTClaimFilter
+    search_text_field = 'claims_text'
+    keyset_fields = ('patent_number', 'claim_text_sequence_number')
 
 
 #
@@ -205,6 +231,7 @@ class PTIPCClassificationFilter(django_filters.FilterSet):
     patent_number = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='exact')
     patent_number_after = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='gte')
     patent_number_before = django_filters.NumberFilter(field_name='patent_number__patent_number', lookup_expr='lte')
+    modified_since = django_filters.DateFilter(field_name='patent_number__bibliographic_file_extract_date', lookup_expr='gt')
     ipc_class = django_filters.CharFilter(field_name='ipc_class', lookup_expr='icontains')
 
     class Meta:
@@ -213,12 +240,14 @@ class PTIPCClassificationFilter(django_filters.FilterSet):
             'patent_number',
             'patent_number_after',
             'patent_number_before',
+            'modified_since',
             'ipc_class'
         ]
 
-class PTIPCClassificationViewSet(viewsets.ReadOnlyModelViewSet):
+class PTIPCClassificationViewSet(ExtractDateConditionalMixin, viewsets.ReadOnlyModelViewSet):
     queryset = PT_IPC_Classification.objects.all()
     serializer_class = PTIPCClassificationSerializer
     filter_backends = [SearchFilter, DjangoFilterBackend]
     search_fields = ['patent_number__patent_number', 'ipc_class']
     filterset_class = PTIPCClassificationFilter
+    keyset_fields = ('patent_number', 'ipc_classification_sequence_number')
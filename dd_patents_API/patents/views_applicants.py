@@ -0,0 +1,59 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.views import APIView
+
+from .applicants import cached_find_party, party_key
+from .pagination import FlexiblePageNumberPagination
+
+
+class ApplicantPagination(FlexiblePageNumberPagination):
+    """Page numbers only: the merged holdings are a list, with no keyset to walk."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset_mode = False
+        return PageNumberPagination.paginate_queryset(self, queryset, request, view)
+
+
+class ApplicantSearchView(APIView):
+    """
+    Everything one party holds: patents, trademarks and industrial designs,
+    searched concurrently in their own databases (see patents.applicants).
+    """
+    pagination_class = ApplicantPagination
+
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter('name', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+                              description="Party name; matched on its normalised key."),
+            openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        operation_summary="Patents, trademarks and industrial designs held by one party",
+        operation_description="""
+`key` is the normalised name every source was matched on. `sources` gives
+each source's status (ok, timeout, error or not_configured); a source that
+is not ok is left out of `results` rather than failing the search. An ok
+source with `truncated` set had more candidate names than
+APPLICANT_SEARCH_MAX_CANDIDATES, so some of its holdings may be missing.
+
+**Example**
+
+* `/applicants/?name=Acme Widgets, Inc.&page_size=500`
+""",
+    )
+    def get(self, request):
+        key = party_key(request.query_params.get('name', ''))
+        if len(key) < 2:
+            raise ValidationError({'name': 'Give a party name with at least two letters or digits.'})
+        found, sources = cached_find_party(key)
+
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(found, request, view=self)
+        response = paginator.get_paginated_response(page)
+        response.data = {'key': key, 'sources': sources, **response.data}
+        if not any(source['status'] == 'ok' for source in sources.values()):
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return response
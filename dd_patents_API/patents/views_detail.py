@@ -1,35 +1,49 @@
+import json
+
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
+from rest_framework.utils.encoders import JSONEncoder
 from drf_yasg.utils import swagger_auto_schema          
 from patents.schema import IncludeParam                 
 from django_filters.rest_framework import DjangoFilterBackend
 import django_filters
+from .conditional import ExtractDateConditionalMixin
 from .models import PT_Main
 from .serializers import PTMainDetailSerializer
+from .streaming import export_database
 
 class PTMainDetailFilter(django_filters.FilterSet):
     patent_number       = django_filters.NumberFilter(field_name='patent_number', lookup_expr='exact')
     patent_number_after = django_filters.NumberFilter(field_name='patent_number', lookup_expr='gte')
     patent_number_before= django_filters.NumberFilter(field_name='patent_number', lookup_expr='lte')
     filing_date         = django_filters.DateFromToRangeFilter(field_name='filing_date')
+    modified_since      = django_filters.DateFilter(field_name='bibliographic_file_extract_date', lookup_expr='gt')
 
     class Meta:
         model  = PT_Main
         fields = ['patent_number', 'patent_number_after', 'patent_number_before',
-                  'filing_date']
+                  'filing_date', 'modified_since']
 
-class PTMainDetailViewSet(viewsets.ReadOnlyModelViewSet):
+class PTMainDetailViewSet(ExtractDateConditionalMixin, viewsets.ReadOnlyModelViewSet):
     """
     Return a single PT_Main with optional nested tables.
     Control nested sets via `include=` query‑param.
         ?include=abstracts,claims          # only those 2
         ?include=all                       # every relation
         (default)                          # abstracts + claims
+    Each embedded relation is capped per patent (default 1000 rows) and
+    can be tuned with `<relation>_limit=`; capped relations are flagged
+    under `truncated`.
+        ?include=claims&claims_limit=20    # first 20 claims per patent
     """
     serializer_class = PTMainDetailSerializer
     filter_backends  = [SearchFilter, DjangoFilterBackend]
     filterset_class  = PTMainDetailFilter
     search_fields    = ['patent_number', 'application_patent_title_english']
+    keyset_fields    = ('patent_number',)
 
     # Map query‑param tokens → related names
     _REL_MAP = {
@@ -42,26 +56,77 @@ class PTMainDetailViewSet(viewsets.ReadOnlyModelViewSet):
     }
     _DEFAULT_RELATIONS = ['abstracts', 'claims']
 
-    def get_queryset(self):
-        qs = PT_Main.objects.all()
+    # Row order inside each relation, so a capped relation keeps its head
+    _REL_ORDERING = {
+        'abstracts':          'abstract_text_sequence_number',
+        'claims':             'claim_text_sequence_number',
+        'disclosures':        'disclosure_text_sequence_number',
+        'interested_parties': 'id',
+        'priority_claims':    'id',
+        'ipc_classifications':'ipc_classification_sequence_number',
+    }
+    default_relation_limit = 1000
+    max_relation_limit = 10000
+
+    # Rows pulled per server-side cursor fetch (and prefetch batch) on export
+    export_chunk_size = 2000
+
+    def get_relations(self):
+        """Decide which relations to prefetch / embed from `include=`."""
         include_raw = self.request.query_params.get('include', None)
+        if not include_raw:
+            return self._DEFAULT_RELATIONS
 
-        # Decide which relations to prefetch
-        if include_raw:
-            include = [x.strip().lower() for x in include_raw.split(',')]
-            if 'all' in include:
-                rels = list(self._REL_MAP.values())
-            else:
-                rels = [self._REL_MAP[t] for t in include if t in self._REL_MAP]
-        else:
-            rels = self._DEFAULT_RELATIONS
+        include = [x.strip().lower() for x in include_raw.split(',')]
+        if 'all' in include:
+            return list(self._REL_MAP.values())
+        return [self._REL_MAP[t] for t in include if t in self._REL_MAP]
 
-        # Apply prefetches
-        if rels:
-            qs = qs.prefetch_related(*rels)
+    def get_relation_limits(self):
+        """
+        Per-relation row caps from `<relation>_limit=`. The export streams
+        whole relations unless a limit is asked for explicitly.
+        """
+        default = None if self.action == 'export' else self.default_relation_limit
+        limits = {}
+        for rel in self.get_relations():
+            try:
+                limit = int(self.request.query_params[f'{rel}_limit'])
+            except (KeyError, ValueError):
+                limit = default
+            if limit is not None:
+                limits[rel] = min(max(limit, 1), self.max_relation_limit)
+        return limits
+
+    def get_queryset(self):
+        qs = PT_Main.objects.all()
+        limits = self.get_relation_limits()
+
+        # Apply prefetches. A sliced Prefetch queryset is windowed per patent
+        # (ROW_NUMBER() OVER (PARTITION BY patent_number_id)), so each patent
+        # costs at most limit + 1 rows; the extra row marks truncation.
+        prefetches = []
+        for rel in self.get_relations():
+            if rel not in limits:
+                prefetches.append(rel)
+                continue
+            related = PT_Main._meta.get_field(rel).related_model
+            rel_qs = related.objects.order_by(self._REL_ORDERING[rel])[:limits[rel] + 1]
+            prefetches.append(Prefetch(
+                rel,
+                queryset=rel_qs,
+                to_attr=PTMainDetailSerializer.LIMITED_ATTR.format(rel),
+            ))
+        if prefetches:
+            qs = qs.prefetch_related(*prefetches)
 
         return qs
-    
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['include'] = self.get_relations()
+        context['relation_limits'] = self.get_relation_limits()
+        return context
 
     @swagger_auto_schema(
         query_serializer=IncludeParam,
@@ -75,6 +140,9 @@ class PTMainDetailViewSet(viewsets.ReadOnlyModelViewSet):
 * Custom include — add priority_claims  
   `/api/pt_main_detail/?patent_number=2738890&include=priority_claims`
 
+* Cap a relation — first 20 claims per patent, `truncated.claims` says if more exist  
+  `/api/pt_main_detail/?include=claims&claims_limit=20`
+
 * Trim fields — only top‑level patent_number + filing_date + abstract text  
   `/api/pt_main_detail/?patent_number=2738890`
   `&include=abstracts`
@@ -83,3 +151,48 @@ class PTMainDetailViewSet(viewsets.ReadOnlyModelViewSet):
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        query_serializer=IncludeParam,
+        operation_summary="Stream every matching patent as newline-delimited JSON",
+        operation_description="""
+Same filters and `include=` selection as the list endpoint, but unpaginated:
+one JSON object per line, read from a server-side cursor in chunks so
+memory stays flat however many patents match.
+
+**Examples**
+
+* Full corpus with abstracts, claims and IPC rows  
+  `/api/pt_main_detail/export/?include=abstracts,claims,ipc_classifications`
+
+* A patent-number range  
+  `/api/pt_main_detail/export/?patent_number_after=2700000&patent_number_before=2800000`
+""",
+    )
+    @action(detail=False, url_path='export')
+    def export(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).order_by('patent_number')
+        queryset = queryset.using(export_database(queryset.model))
+        response = StreamingHttpResponse(
+            self._ndjson_lines(queryset),
+            content_type='application/x-ndjson',
+        )
+        response['Content-Disposition'] = 'attachment; filename="pt_main_detail.ndjson"'
+        return response
+
+    def _ndjson_lines(self, queryset):
+        # iterator(chunk_size=...) uses a server-side cursor and runs the
+        # prefetches once per chunk, so only one chunk is ever in memory.
+        batch = []
+        for patent in queryset.iterator(chunk_size=self.export_chunk_size):
+            batch.append(patent)
+            if len(batch) >= self.export_chunk_size:
+                yield self._serialize_batch(batch)
+                batch = []
+        if batch:
+            yield self._serialize_batch(batch)
+
+    def _serialize_batch(self, batch):
+        data = self.get_serializer(batch, many=True).data
+        lines = (json.dumps(row, cls=JSONEncoder, ensure_ascii=False) for row in data)
+        return ''.join(line + '\n' for line in lines).encode('utf-8')
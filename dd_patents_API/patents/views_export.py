@@ -0,0 +1,39 @@
+from django.http import Http404, StreamingHttpResponse
+from rest_framework import viewsets
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+
+from .parquet_export import EXPORT_MODELS, default_extract_date, stream_table
+from .streaming import export_database
+
+
+class ParquetExportViewSet(viewsets.ViewSet):
+    """
+    Whole-table Parquet snapshots for analytics, instead of paging through
+    the JSON endpoints.
+
+    * `/patents/parquet/` lists the tables and the extract date of the data.
+    * `/patents/parquet/<table>/` streams that table as one Parquet file,
+      read from a server-side cursor a row group at a time. Code columns are
+      dictionary-encoded; the extract date is in the file metadata.
+
+    For partitioned files on disk use `manage.py export_parquet`.
+    """
+    lookup_value_regex = '[a-z_]+'
+
+    def list(self, request):
+        return Response({
+            'extract_date': default_extract_date(),
+            'tables': {
+                name: reverse('parquet-detail', args=[name], request=request)
+                for name in EXPORT_MODELS
+            },
+        })
+
+    def retrieve(self, request, pk=None):
+        if pk not in EXPORT_MODELS:
+            raise Http404(f"No Parquet export for '{pk}'.")
+        response = StreamingHttpResponse(stream_table(pk, using=export_database(EXPORT_MODELS[pk])),
+                                         content_type='application/vnd.apache.parquet')
+        response['Content-Disposition'] = f'attachment; filename="{pk}.parquet"'
+        return response
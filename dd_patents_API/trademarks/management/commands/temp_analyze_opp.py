@@ -1,56 +1,40 @@
 import os
 import csv
 import sys
-import zipfile
 import logging
 from django.core.management.base import BaseCommand
 
+from patents.management.zip_stream import csv_members, open_member
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
 class Command(BaseCommand):
     help = "Analyze TM_Opposition_Case_Action CSV by printing first 30 rows without inserting."
 
     ZIP_FILE_PATH = "C:/Users/Intern_1/Documents/TM_Data/TM_opposition_case_action_2024-11-20.zip"
-    TEMP_EXTRACT_DIR = "C:/Users/Intern_1/Documents/TM_Data/temp_extracted/"
 
     def handle(self, *args, **options):
         logging.info(f"ZIP File Path: {self.ZIP_FILE_PATH}")
-        logging.info(f"Temporary Extract Directory: {self.TEMP_EXTRACT_DIR}")
-
-        # 1) Create temp dir if needed
-        os.makedirs(self.TEMP_EXTRACT_DIR, exist_ok=True)
 
         zip_filename = os.path.basename(self.ZIP_FILE_PATH)
-        logging.info(f"Extracting ZIP file: {zip_filename}")
 
-        # 2) Extract ZIP
+        # 1) Locate CSV inside the ZIP
         try:
-            with zipfile.ZipFile(self.ZIP_FILE_PATH, "r") as zip_ref:
-                zip_ref.extractall(self.TEMP_EXTRACT_DIR)
-            logging.info(f"Extracted '{zip_filename}' into '{self.TEMP_EXTRACT_DIR}'.")
+            csv_files = csv_members(self.ZIP_FILE_PATH)
         except Exception as e:
-            logging.error(f"Failed extracting '{zip_filename}': {e}")
+            logging.error(f"Failed reading '{zip_filename}': {e}")
             return
-
-        # 3) Locate CSV
-        csv_files = [f for f in os.listdir(self.TEMP_EXTRACT_DIR) if f.lower().endswith(".csv")]
         if not csv_files:
-            logging.error("No CSV files found after extraction.")
+            logging.error(f"No CSV files found in '{zip_filename}'.")
             return
-
-        csv_path = os.path.join(self.TEMP_EXTRACT_DIR, csv_files[0])
         logging.info(f"Found CSV: {csv_files[0]}")
 
-        # 4) Print the first 30 rows
-        self.analyze_csv(csv_path)
-
-        # 5) Clean up extracted CSV (if you want to keep it, remove this line)
-        os.remove(csv_path)
-        logging.info(f"Deleted CSV file: {csv_path}")
+        # 2) Print the first 30 rows, decompressing only as far as needed
+        self.analyze_csv(csv_files[0])
 
-    def analyze_csv(self, file_path):
-        logging.info(f"Analyzing first 30 rows in '{file_path}'...")
-        with open(file_path, "r", encoding="utf-8") as csvfile:
+    def analyze_csv(self, member):
+        logging.info(f"Analyzing first 30 rows in '{member}'...")
+        with open_member(self.ZIP_FILE_PATH, member, progress=None) as csvfile:
             reader = csv.DictReader(csvfile, delimiter="|")
             
             for i, row in enumerate(reader, start=1):
@@ -1,4 +1,8 @@
+import time
+
+from django.conf import settings
 from django.contrib import admin
+from django.db import DatabaseError, connections
 from django.urls import path, include
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
@@ -30,8 +34,32 @@ from django.http import JsonResponse
 def health(request):
     return JsonResponse({"status": "ok"})
 
+
+def db_health(request):
+    """Round trip to every configured database, with the connection pool's statistics."""
+    databases, healthy = {}, True
+    for connection in connections.all():
+        started = time.monotonic()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            entry = {'status': 'ok', 'latency_ms': round((time.monotonic() - started) * 1000, 2)}
+        except DatabaseError as e:
+            healthy = False
+            entry = {'status': 'error', 'error': str(e)}
+        pool = getattr(connection, 'pool', None)
+        if pool is not None:
+            entry['pool'] = pool.get_stats()
+        databases[connection.alias] = entry
+    return JsonResponse(
+        {'status': 'ok' if healthy else 'error', 'pool_mode': settings.DB_POOL_MODE, 'databases': databases},
+        status=200 if healthy else 503,
+    )
+
+
 urlpatterns = [
     path('health/', health, name='health_check'),
+    path('health/db/', db_health, name='db_health_check'),
     path('admin/', admin.site.urls),
     path("api/", APIRoot.as_view(), name="api-root"),
     path("trademarks/", include("trademarks.urls")),
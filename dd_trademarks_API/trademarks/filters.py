@@ -1,5 +1,43 @@
+from datetime import date
+
 import django_filters
-from .models import TmMain
+from django.contrib.postgres.search import TrigramSimilarity
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from .models import TmMain, TmInterestedParty
+from .parquet_export import default_extract_date
+
+
+class TrigramSimilarityFilter(django_filters.CharFilter):
+    """
+    Fuzzy name match ranked by pg_trgm similarity, best match first.
+    Example: ?party_fuzzy=acme corp&min_similarity=0.4
+    At or above pg_trgm's default threshold (0.3) the `%` operator is used
+    so the trigram GIN index can serve the lookup; lower thresholds fall
+    back to scoring every row.
+    """
+    threshold_param = 'min_similarity'
+    default_threshold = 0.3
+    index_threshold = 0.3
+
+    def get_threshold(self):
+        try:
+            threshold = float(self.parent.data.get(self.threshold_param, self.default_threshold))
+        except (TypeError, ValueError):
+            threshold = self.default_threshold
+        return min(max(threshold, 0.0), 1.0)
+
+    def filter(self, qs, value):
+        value = (value or '').strip()
+        if not value:
+            return qs
+        threshold = self.get_threshold()
+        if threshold >= self.index_threshold:
+            qs = qs.filter(**{f'{self.field_name}__trigram_similar': value})
+        return qs.annotate(
+            similarity=TrigramSimilarity(self.field_name, value),
+        ).filter(similarity__gte=threshold).order_by('-similarity')
+
 
 class TmMainFilter(django_filters.FilterSet):
     # For text fields, 'icontains' allows for a case-insensitive "contains" search.
@@ -18,4 +56,42 @@ class TmMainFilter(django_filters.FilterSet):
     class Meta:
         model = TmMain
         # Include fields that should still use the default exact-match filtering.
-        fields = ['application_number', 'registration_number']
\ No newline at end of file
+        fields = ['application_number', 'registration_number']
+
+
+class TmInterestedPartyFilter(django_filters.FilterSet):
+    # Fuzzy match backed by the trigram index: ?party_fuzzy=acme corp&min_similarity=0.4
+    party_fuzzy = TrigramSimilarityFilter(field_name='party_name')
+
+    class Meta:
+        model = TmInterestedParty
+        fields = [
+            'application_number',
+            'party_name',
+            'party_type_code',
+            'agent_number'
+        ]
+
+
+class ModifiedSinceFilterBackend(BaseFilterBackend):
+    """
+    ?modified_since=YYYY-MM-DD for sync clients, on every list endpoint.
+    Trademark rows carry no change date of their own, only the extract they
+    were loaded from (TmDataVersion.extract_date), so this is all or nothing:
+    every row when that extract is later than the date, none otherwise. With
+    no extract date recorded, every row is returned.
+    """
+    param = 'modified_since'
+
+    def filter_queryset(self, request, queryset, view):
+        raw = request.query_params.get(self.param, '').strip()
+        if not raw:
+            return queryset
+        try:
+            since = date.fromisoformat(raw)
+        except ValueError:
+            raise ValidationError({self.param: ['Enter a date as YYYY-MM-DD.']})
+        extract_date = default_extract_date()
+        if not extract_date or date.fromisoformat(extract_date) > since:
+            return queryset
+        return queryset.none()
@@ -0,0 +1,77 @@
+import io
+import logging
+
+from sqlalchemy.types import BigInteger, Date, DateTime, Integer, SmallInteger
+
+# Marker COPY reads as NULL; an unquoted empty field stays an empty string,
+# the same as it would through to_sql.
+COPY_NULL = r'\N'
+
+INTEGER_TYPES = (Integer, SmallInteger, BigInteger)
+DATE_TYPES = (Date, DateTime)
+
+
+def _sql_type(sqltype):
+    """dtype_mapping values may be SQLAlchemy type classes or instances."""
+    return sqltype if isinstance(sqltype, type) else type(sqltype)
+
+
+def apply_dtype_mapping(df, dtype_mapping):
+    """
+    Prepares columns the way to_sql(dtype=...) would have bound them, so the
+    text COPY sends is something PostgreSQL can cast to the column type:
+    integers without a trailing '.0', dates as YYYY-MM-DD.
+    """
+    if not dtype_mapping:
+        return df
+
+    df = df.copy()
+    for col, sqltype in dtype_mapping.items():
+        if col not in df.columns:
+            continue
+        sqltype = _sql_type(sqltype)
+        if issubclass(sqltype, INTEGER_TYPES) and df[col].dtype.kind == 'f':
+            df[col] = df[col].astype('Int64')
+        elif issubclass(sqltype, Date) and df[col].dtype.kind == 'M':
+            df[col] = df[col].dt.strftime('%Y-%m-%d')
+    return df
+
+
+def copy_dataframe(df, table_name, engine, dtype_mapping=None, schema='public'):
+    """
+    Appends a DataFrame to an existing table with COPY FROM STDIN.
+    Drop-in replacement for
+        df.to_sql(table_name, engine, if_exists='append', index=False,
+                  method='multi', dtype=dtype_mapping)
+    The chunk is serialised once into an in-memory CSV buffer and streamed in
+    a single COPY instead of being bound as one giant multi-row INSERT.
+    """
+    if df.empty:
+        return 0
+
+    frame = apply_dtype_mapping(df, dtype_mapping)
+    buffer = io.StringIO()
+    frame.to_csv(buffer, sep='|', index=False, header=False, na_rep=COPY_NULL)
+    buffer.seek(0)
+
+    columns = ', '.join(f'"{col}"' for col in frame.columns)
+    copy_sql = (
+        f'COPY {schema}."{table_name}" ({columns}) FROM STDIN '
+        f"WITH (FORMAT csv, DELIMITER '|', NULL '{COPY_NULL}')"
+    )
+
+    connection = engine.raw_connection()
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.copy_expert(copy_sql, buffer)
+        finally:
+            cursor.close()
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logging.error(f"COPY into {schema}.{table_name} failed for a chunk of {len(frame)} rows.")
+        raise
+    finally:
+        connection.close()
+    return len(frame)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from trademarks.models import TmDataVersion
+
+
+class Command(BaseCommand):
+    help = (
+        'Invalidates every cached API response. The import engine does this after '
+        'each load; run it after changing the data any other way.'
+    )
+
+    def handle(self, *args, **options):
+        table = TmDataVersion._meta.db_table
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (id, version, changed_at) VALUES (1, 1, now()) "
+                f"ON CONFLICT (id) DO UPDATE SET version = {table}.version + 1, changed_at = now() "
+                f"RETURNING version"
+            )
+            version = cursor.fetchone()[0]
+        self.stdout.write(self.style.SUCCESS(f'Data version is now {version}.'))
@@ -0,0 +1,605 @@
+import os
+import zipfile
+import logging
+from datetime import date
+
+import pandas as pd
+import sqlalchemy
+from sqlalchemy.types import Boolean, Date, Integer
+from dotenv import load_dotenv
+
+from bulk_writer import copy_dataframe
+from tm_specs import TABLE_SPECS
+
+# --- Configuration ---
+load_dotenv()
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+CHUNK_SIZE = 100000
+DB_USER = os.getenv("DB_USER", "postgres")
+DB_PASSWORD = os.getenv("DB_PASSWORD", "Mostafa75")
+DB_HOST = os.getenv("DB_HOST", "localhost")
+DB_PORT = os.getenv("DB_PORT", "5432")
+DB_NAME = os.getenv("DB_NAME", "TM_data")
+
+# Extracts are named <file_stem>_<date>.zip / .csv
+DATA_DIR = os.getenv("TM_DATA_DIR", ".")
+EXTRACT_DATE = os.getenv("TM_EXTRACT_DATE", "2025-01-28")
+
+# How child rows without a parent are dropped:
+#   'database' - COPY into an UNLOGGED staging table, then one INSERT ... SELECT
+#                with an EXISTS semi-join on the parent. Constant memory.
+#   'python'   - read every parent key into memory and filter each chunk.
+FK_VALIDATION_MODES = ('database', 'python')
+FK_VALIDATION = os.getenv("TM_FK_VALIDATION", "database")
+
+# How a table is refreshed:
+#   'full'        - DROP ... CASCADE, recreate and reload everything.
+#   'swap'        - like 'full', but built out of sight in SHADOW_SCHEMA and
+#                   swapped in atomically once every table has loaded.
+#   'incremental' - keep the table and apply only the difference to the new
+#                   extract. tm_main is diffed by application_number using a
+#                   per-row content hash; a child table replaces the rows of
+#                   applications whose tm_main row was inserted or changed,
+#                   or whose own rows differ from the extract's.
+LOAD_MODES = ('full', 'incremental', 'swap')
+LOAD_MODE = os.getenv("TM_LOAD_MODE", "full")
+
+# Full reloads in 'swap' mode are built in SHADOW_SCHEMA, indexed and
+# analyzed there, then moved into PUBLIC_SCHEMA in one transaction. The
+# tables they replace are parked in RETIRED_SCHEMA and dropped afterwards.
+PUBLIC_SCHEMA = 'public'
+SHADOW_SCHEMA = 'tm_shadow'
+RETIRED_SCHEMA = 'tm_retired'
+
+# Bulk-load mode for full/swap rebuilds: the DDL's primary keys, unique
+# constraints and foreign keys are dropped right after CREATE TABLE and
+# rebuilt, then validated, once the rows are in.
+DEFER_CONSTRAINTS = os.getenv("TM_DEFER_CONSTRAINTS", "false").lower() in ('1', 'true', 'yes')
+MAINTENANCE_WORK_MEM = os.getenv("TM_MAINTENANCE_WORK_MEM", "1GB")
+
+ROOT_TABLE = 'tm_main'
+ROOT_KEY = 'application_number'
+# Application numbers inserted or updated by the last incremental tm_main
+# load. Kept between runs so child tables can be refreshed separately.
+CHANGED_KEYS_TABLE = f'{ROOT_TABLE}_changed_keys'
+
+# Bumped whenever a load changes what the API serves; cached API responses
+# are keyed by it (see trademarks.response_cache). It also records the
+# extract date of that load, which the API reports and filters on.
+DATA_VERSION_TABLE = 'tm_data_version'
+
+BOOL_VALUES = {'1': True, 't': True, 'true': True, 'y': True, 'yes': True,
+               '0': False, 'f': False, 'false': False, 'n': False, 'no': False}
+
+
+def create_engine():
+    return sqlalchemy.create_engine(
+        f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+    )
+
+
+def extract_paths(spec, data_dir=DATA_DIR, extract_date=EXTRACT_DATE):
+    name = f"{spec['file_stem']}_{extract_date}"
+    return os.path.join(data_dir, f"{name}.zip"), f"{name}.csv"
+
+
+def dtype_mapping(spec):
+    """SQLAlchemy types for the converted columns, as each script used to list by hand."""
+    conversions = spec.get('type_conversions', {})
+    mapping = {col: Boolean for col in conversions.get('bool_cols', [])}
+    mapping.update({col: Date for col in conversions.get('date_cols', [])})
+    mapping.update({col: Integer for col in conversions.get('int_cols', [])})
+    return mapping
+
+
+def in_schema(sql, schema):
+    """Points the public.-qualified DDL in TABLE_SPECS at another schema."""
+    return sql if schema == PUBLIC_SCHEMA else sql.replace(f'{PUBLIC_SCHEMA}.', f'{schema}.')
+
+
+def setup_database(engine, table_name, drop_existing=True, schema=PUBLIC_SCHEMA):
+    """
+    Drops and recreates a table to ensure a clean slate, or with
+    drop_existing=False only creates it if it is missing.
+    """
+    logging.info(f"Setting up the database schema for {table_name}...")
+    try:
+        with engine.connect() as connection:
+            with connection.begin():
+                if drop_existing:
+                    logging.info(f"Dropping existing {table_name} table if it exists...")
+                    connection.execute(sqlalchemy.text(f"DROP TABLE IF EXISTS {schema}.{table_name} CASCADE;"))
+                    if table_name == ROOT_TABLE:
+                        connection.execute(sqlalchemy.text(f"DROP TABLE IF EXISTS {schema}.{CHANGED_KEYS_TABLE};"))
+
+                logging.info(f"Creating new {table_name} table...")
+                connection.execute(sqlalchemy.text(in_schema(TABLE_SPECS[table_name]['ddl'], schema)))
+        logging.info(f"Database setup for {table_name} complete.")
+    except Exception as e:
+        logging.error(f"An error occurred during database setup for {table_name}: {e}")
+        raise
+
+
+def convert_data_types(df, spec):
+    """
+    Converts DataFrame columns to the types listed in the spec's type_conversions.
+    """
+    conversions = spec.get('type_conversions')
+    if not conversions:
+        return df
+
+    df_copy = df.copy()
+
+    for col in conversions.get('bool_cols', []):
+        if col in df_copy.columns:
+            df_copy[col] = df_copy[col].astype(str).str.strip().str.lower().map(BOOL_VALUES).astype('boolean')
+
+    for col in conversions.get('date_cols', []):
+        if col in df_copy.columns:
+            df_copy[col] = pd.to_datetime(df_copy[col], format=spec.get('date_format'), errors='coerce')
+
+    for col in conversions.get('int_cols', []):
+        if col in df_copy.columns:
+            df_copy[col] = pd.to_numeric(df_copy[col], errors='coerce').astype('Int64')
+
+    return df_copy
+
+
+def fetch_parent_keys(engine, parent, schema=PUBLIC_SCHEMA):
+    """
+    Keys a child row must match: a set for a single key column, otherwise a
+    DataFrame to inner-join against.
+    """
+    key_cols = parent['key_cols']
+    logging.info(f"Fetching existing keys from parent table '{parent['table']}'...")
+    with engine.connect() as connection:
+        keys = pd.read_sql(f"SELECT {', '.join(key_cols)} FROM {schema}.{parent['table']}", connection)
+    logging.info(f"Found {len(keys)} valid parent keys to link against.")
+    if len(key_cols) == 1:
+        return set(keys[key_cols[0]])
+    for col in key_cols:
+        if pd.api.types.is_numeric_dtype(keys[col]):
+            keys[col] = keys[col].astype('Int64')
+    return keys
+
+
+def filter_orphans(chunk_df, parent, parent_keys):
+    key_cols = parent['key_cols']
+    if len(key_cols) == 1:
+        return chunk_df[chunk_df[key_cols[0]].isin(parent_keys)]
+    return chunk_df.merge(parent_keys, on=key_cols, how='inner')
+
+
+def staging_table_name(table_name):
+    return f"{table_name}_stage"
+
+
+def create_staging_table(engine, table_name, columns, schema=PUBLIC_SCHEMA):
+    """
+    (Re)creates an UNLOGGED, constraint-free copy of the loaded columns of
+    `table_name`, so orphans can be COPY'd in and left behind by the merge.
+    """
+    staging = staging_table_name(table_name)
+    with engine.connect() as connection:
+        with connection.begin():
+            connection.execute(sqlalchemy.text(f"DROP TABLE IF EXISTS {schema}.{staging};"))
+            connection.execute(sqlalchemy.text(
+                f"CREATE UNLOGGED TABLE {schema}.{staging} AS "
+                f"SELECT {', '.join(columns)} FROM {schema}.{table_name} WITH NO DATA;"
+            ))
+    return staging
+
+
+def merge_staged_rows(engine, table_name, columns, parent, schema=PUBLIC_SCHEMA):
+    """
+    Moves staged rows that have a parent into `table_name` with one set-based
+    INSERT ... SELECT. Returns (staged, inserted).
+    """
+    staging = staging_table_name(table_name)
+    cols = ', '.join(columns)
+    match = ' AND '.join(f"p.{col} = s.{col}" for col in parent['key_cols'])
+    with engine.connect() as connection:
+        with connection.begin():
+            staged = connection.execute(sqlalchemy.text(f"SELECT COUNT(*) FROM {schema}.{staging};")).scalar()
+            inserted = connection.execute(sqlalchemy.text(
+                f"INSERT INTO {schema}.{table_name} ({cols}) "
+                f"SELECT {cols} FROM {schema}.{staging} s "
+                f"WHERE EXISTS (SELECT 1 FROM {schema}.{parent['table']} p WHERE {match});"
+            )).rowcount
+    return staged, inserted
+
+
+def row_hash(alias, columns):
+    """Content hash of a row over `columns`; staged and live rows share column types."""
+    return f"md5(ROW({', '.join(f'{alias}.{col}' for col in columns)})::text)"
+
+
+def apply_root_delta(engine, table_name, columns):
+    """
+    Diffs the staged extract against `table_name` on ROOT_KEY: deletes rows
+    that are gone (children follow via ON DELETE CASCADE), updates rows whose
+    content hash changed and inserts new ones. Inserted and updated keys are
+    recorded in CHANGED_KEYS_TABLE. Returns (inserted, updated, deleted).
+    """
+    staging = staging_table_name(table_name)
+    cols = ', '.join(columns)
+    assignments = ', '.join(f"{col} = s.{col}" for col in columns if col != ROOT_KEY)
+    with engine.connect() as connection:
+        with connection.begin():
+            deleted = connection.execute(sqlalchemy.text(
+                f"DELETE FROM public.{table_name} t "
+                f"WHERE NOT EXISTS (SELECT 1 FROM public.{staging} s WHERE s.{ROOT_KEY} = t.{ROOT_KEY});"
+            )).rowcount
+
+            connection.execute(sqlalchemy.text(f"DROP TABLE IF EXISTS public.{CHANGED_KEYS_TABLE};"))
+            connection.execute(sqlalchemy.text(
+                f"CREATE TABLE public.{CHANGED_KEYS_TABLE} AS "
+                f"SELECT {ROOT_KEY} FROM public.{table_name} WITH NO DATA;"
+            ))
+
+            updated = connection.execute(sqlalchemy.text(
+                f"WITH changed AS ("
+                f"UPDATE public.{table_name} t SET {assignments} FROM public.{staging} s "
+                f"WHERE t.{ROOT_KEY} = s.{ROOT_KEY} AND {row_hash('t', columns)} <> {row_hash('s', columns)} "
+                f"RETURNING t.{ROOT_KEY}) "
+                f"INSERT INTO public.{CHANGED_KEYS_TABLE} SELECT {ROOT_KEY} FROM changed;"
+            )).rowcount
+
+            inserted = connection.execute(sqlalchemy.text(
+                f"WITH added AS ("
+                f"INSERT INTO public.{table_name} ({cols}) SELECT {cols} FROM public.{staging} s "
+                f"WHERE NOT EXISTS (SELECT 1 FROM public.{table_name} t WHERE t.{ROOT_KEY} = s.{ROOT_KEY}) "
+                f"RETURNING {ROOT_KEY}) "
+                f"INSERT INTO public.{CHANGED_KEYS_TABLE} SELECT {ROOT_KEY} FROM added;"
+            )).rowcount
+
+            connection.execute(sqlalchemy.text(
+                f"ALTER TABLE public.{CHANGED_KEYS_TABLE} ADD PRIMARY KEY ({ROOT_KEY});"
+            ))
+    return inserted, updated, deleted
+
+
+def rows_digest(table, alias, columns, where=''):
+    """ROOT_KEY -> one hash over all of that application's rows, duplicates included."""
+    return (
+        f"SELECT {alias}.{ROOT_KEY}, md5(string_agg({row_hash(alias, columns)}, '' "
+        f"ORDER BY {row_hash(alias, columns)})) AS digest "
+        f"FROM {table} {alias} {where} GROUP BY {alias}.{ROOT_KEY}"
+    )
+
+
+def apply_child_delta(engine, table_name, columns, parent):
+    """
+    Replaces the rows of some applications with their staged rows (those
+    that have a parent); every other row is left alone. An application is
+    replaced when it is listed in CHANGED_KEYS_TABLE or when the hash of its
+    staged rows differs from the hash of its live rows, so a change that
+    only touches this table is applied too. Returns (inserted, deleted).
+    """
+    staging = staging_table_name(table_name)
+    cols = ', '.join(columns)
+    delta_keys = f"{table_name}_delta_keys"
+    match = ' AND '.join(f"p.{col} = s.{col}" for col in parent['key_cols'])
+    has_parent = f"WHERE EXISTS (SELECT 1 FROM public.{parent['table']} p WHERE {match})"
+    with engine.connect() as connection:
+        with connection.begin():
+            connection.execute(sqlalchemy.text(
+                f"CREATE TEMPORARY TABLE {delta_keys} ON COMMIT DROP AS "
+                f"SELECT {ROOT_KEY} FROM public.{CHANGED_KEYS_TABLE} "
+                f"UNION "
+                f"SELECT {ROOT_KEY} FROM ({rows_digest(f'public.{staging}', 's', columns, has_parent)}) s "
+                f"FULL JOIN ({rows_digest(f'public.{table_name}', 't', columns)}) t USING ({ROOT_KEY}) "
+                f"WHERE s.digest IS DISTINCT FROM t.digest;"
+            ))
+            changed = f"SELECT {ROOT_KEY} FROM {delta_keys}"
+            deleted = connection.execute(sqlalchemy.text(
+                f"DELETE FROM public.{table_name} WHERE {ROOT_KEY} IN ({changed});"
+            )).rowcount
+            inserted = connection.execute(sqlalchemy.text(
+                f"INSERT INTO public.{table_name} ({cols}) "
+                f"SELECT {cols} FROM public.{staging} s {has_parent} "
+                f"AND s.{ROOT_KEY} IN ({changed});"
+            )).rowcount
+    return inserted, deleted
+
+
+CONSTRAINTS_SQL = """
+    SELECT c.conname, c.contype, pg_get_constraintdef(c.oid),
+           ARRAY(SELECT a.attname FROM unnest(c.conkey) WITH ORDINALITY k(attnum, n)
+                 JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum ORDER BY k.n),
+           c.confrelid::regclass::text,
+           ARRAY(SELECT a.attname FROM unnest(c.confkey) WITH ORDINALITY k(attnum, n)
+                 JOIN pg_attribute a ON a.attrelid = c.confrelid AND a.attnum = k.attnum ORDER BY k.n)
+    FROM pg_constraint c
+    WHERE c.conrelid = CAST(:table AS regclass) AND c.contype IN ('p', 'u', 'f')
+    ORDER BY c.contype = 'f'
+"""
+
+
+def defer_constraints(engine, table_name, schema=PUBLIC_SCHEMA):
+    """
+    Drops the primary key, unique constraints and foreign keys of a freshly
+    created table so COPY has nothing to check or maintain. Returns what was
+    dropped, keys before foreign keys, for finalize_table().
+    """
+    qualified = f"{schema}.{table_name}"
+    deferred = []
+    with engine.connect() as connection:
+        with connection.begin():
+            for name, kind, definition, columns, ref_table, ref_columns in connection.execute(
+                sqlalchemy.text(CONSTRAINTS_SQL), {'table': qualified}
+            ):
+                deferred.append({
+                    'name': name,
+                    'kind': 'foreign key' if kind == 'f' else 'key',
+                    'sql': f"ALTER TABLE {qualified} ADD CONSTRAINT {name} {definition}",
+                    'columns': list(columns),
+                    'ref_table': ref_table,
+                    'ref_columns': list(ref_columns or []),
+                })
+            for obj in deferred:
+                connection.execute(sqlalchemy.text(f"ALTER TABLE {qualified} DROP CONSTRAINT {obj['name']};"))
+    logging.info(f"Deferred {len(deferred)} constraint(s) on {qualified} until after the load.")
+    return deferred
+
+
+def count_violations(connection, qualified, obj):
+    """Rows that keep a deferred constraint from being rebuilt."""
+    columns = obj['columns']
+    if obj['kind'] == 'foreign key':
+        present = ' AND '.join(f"t.{c} IS NOT NULL" for c in columns)
+        match = ' AND '.join(f"r.{rc} = t.{c}" for c, rc in zip(columns, obj['ref_columns']))
+        sql = (f"SELECT COUNT(*) FROM {qualified} t WHERE {present} "
+               f"AND NOT EXISTS (SELECT 1 FROM {obj['ref_table']} r WHERE {match});")
+    else:
+        cols = ', '.join(columns)
+        sql = (f"SELECT COALESCE(SUM(n - 1), 0)::bigint FROM (SELECT COUNT(*) AS n FROM {qualified} "
+               f"GROUP BY {cols} HAVING COUNT(*) > 1) duplicates;")
+    return connection.execute(sqlalchemy.text(sql)).scalar()
+
+
+def restore_constraint(connection, qualified, obj):
+    """
+    Rebuilds one deferred constraint. Foreign keys go in NOT VALID and are
+    validated only when no orphans exist, so they are enforced either way.
+    Returns the number of violating rows; a key that fails to rebuild with
+    no duplicate to show for it re-raises the error.
+    """
+    if obj['kind'] == 'foreign key':
+        with connection.begin():
+            connection.execute(sqlalchemy.text(f"{obj['sql']} NOT VALID;"))
+        with connection.begin():
+            violations = count_violations(connection, qualified, obj)
+            if not violations:
+                connection.execute(sqlalchemy.text(f"ALTER TABLE {qualified} VALIDATE CONSTRAINT {obj['name']};"))
+        return violations
+    try:
+        with connection.begin():
+            connection.execute(sqlalchemy.text(f"{obj['sql']};"))
+        return 0
+    except sqlalchemy.exc.IntegrityError:
+        with connection.begin():
+            violations = count_violations(connection, qualified, obj)
+        if not violations:
+            raise
+        return violations
+
+
+def finalize_table(engine, table_name, schema=PUBLIC_SCHEMA, deferred=()):
+    """
+    Rebuilds deferred keys, then the spec's secondary indexes (cheaper than
+    maintaining them during COPY), then deferred foreign keys, and refreshes
+    planner statistics. Returns {constraint: violating rows} for anything
+    that could not be rebuilt cleanly.
+    """
+    qualified = f"{schema}.{table_name}"
+    indexes = TABLE_SPECS[table_name].get('indexes', [])
+    keys = [obj for obj in deferred if obj['kind'] != 'foreign key']
+    foreign_keys = [obj for obj in deferred if obj['kind'] == 'foreign key']
+    violations = {}
+    with engine.connect() as connection:
+        connection.execute(sqlalchemy.text(f"SET maintenance_work_mem TO '{MAINTENANCE_WORK_MEM}';"))
+        connection.commit()
+        for obj in keys:
+            violations[obj['name']] = restore_constraint(connection, qualified, obj)
+        with connection.begin():
+            for index_sql in indexes:
+                connection.execute(sqlalchemy.text(in_schema(index_sql, schema)))
+        for obj in foreign_keys:
+            violations[obj['name']] = restore_constraint(connection, qualified, obj)
+        connection.execution_options(isolation_level='AUTOCOMMIT').execute(
+            sqlalchemy.text(f"ANALYZE {qualified};")
+        )
+    violations = {name: count for name, count in violations.items() if count}
+    for name, count in violations.items():
+        logging.error(f"Constraint {name} on {qualified} has {count} violating row(s).")
+    logging.info(f"Built {len(indexes)} index(es), restored {len(deferred)} constraint(s) and analyzed {qualified}.")
+    return violations
+
+
+def prepare_shadow_schema(engine):
+    """Starts a swap load from an empty SHADOW_SCHEMA."""
+    with engine.connect() as connection:
+        with connection.begin():
+            connection.execute(sqlalchemy.text(f"DROP SCHEMA IF EXISTS {SHADOW_SCHEMA} CASCADE;"))
+            connection.execute(sqlalchemy.text(f"CREATE SCHEMA {SHADOW_SCHEMA};"))
+
+
+def swap_schemas(engine, tables, extract_date=EXTRACT_DATE):
+    """
+    Moves every freshly built table from SHADOW_SCHEMA into PUBLIC_SCHEMA in a
+    single transaction, so readers see either the old corpus or the new one.
+    ALTER TABLE ... SET SCHEMA only touches the catalog; indexes, sequences
+    and the FKs between the moved tables go with them.
+    """
+    with engine.connect() as connection:
+        with connection.begin():
+            connection.execute(sqlalchemy.text(f"DROP SCHEMA IF EXISTS {RETIRED_SCHEMA} CASCADE;"))
+            connection.execute(sqlalchemy.text(f"CREATE SCHEMA {RETIRED_SCHEMA};"))
+            connection.execute(sqlalchemy.text(f"DROP TABLE IF EXISTS {PUBLIC_SCHEMA}.{CHANGED_KEYS_TABLE};"))
+            for table_name in tables:
+                connection.execute(sqlalchemy.text(
+                    f"ALTER TABLE IF EXISTS {PUBLIC_SCHEMA}.{table_name} SET SCHEMA {RETIRED_SCHEMA};"
+                ))
+                connection.execute(sqlalchemy.text(
+                    f"ALTER TABLE {SHADOW_SCHEMA}.{table_name} SET SCHEMA {PUBLIC_SCHEMA};"
+                ))
+            bump_data_version(connection, extract_date)
+        logging.info(f"Swapped {len(tables)} tables from {SHADOW_SCHEMA} into {PUBLIC_SCHEMA}.")
+
+        with connection.begin():
+            connection.execute(sqlalchemy.text(f"DROP SCHEMA {RETIRED_SCHEMA} CASCADE;"))
+            connection.execute(sqlalchemy.text(f"DROP SCHEMA {SHADOW_SCHEMA};"))
+
+
+def bump_data_version(connection, extract_date=None):
+    """
+    Invalidates every cached API response and records the extract date the
+    data now comes from, in the caller's transaction. An extract date that
+    is not YYYY-MM-DD leaves the recorded one as it was.
+    """
+    try:
+        extract_day = date.fromisoformat(extract_date) if extract_date else None
+    except ValueError:
+        logging.warning(f"Extract date '{extract_date}' is not YYYY-MM-DD; not recording it.")
+        extract_day = None
+    connection.execute(sqlalchemy.text(
+        f"INSERT INTO {DATA_VERSION_TABLE} (id, version, changed_at, extract_date) "
+        f"VALUES (1, 1, now(), :extract_date) "
+        f"ON CONFLICT (id) DO UPDATE SET version = {DATA_VERSION_TABLE}.version + 1, changed_at = now(), "
+        f"extract_date = COALESCE(EXCLUDED.extract_date, {DATA_VERSION_TABLE}.extract_date);"
+    ), {'extract_date': extract_day})
+
+
+def publish_data_version(engine, extract_date=None):
+    """bump_data_version() in a transaction of its own."""
+    with engine.connect() as connection:
+        with connection.begin():
+            bump_data_version(connection, extract_date)
+
+
+def drop_staging_table(engine, table_name, schema=PUBLIC_SCHEMA):
+    with engine.connect() as connection:
+        with connection.begin():
+            connection.execute(sqlalchemy.text(f"DROP TABLE IF EXISTS {schema}.{staging_table_name(table_name)};"))
+
+
+def load_data(table_name, engine, data_dir=DATA_DIR, extract_date=EXTRACT_DATE, fk_validation=FK_VALIDATION,
+              mode=LOAD_MODE, schema=PUBLIC_SCHEMA):
+    """
+    Streams a table's CSV out of its ZIP in chunks, cleans each chunk as the
+    spec describes and COPYs it in. Orphans are dropped as `fk_validation`
+    says; in 'incremental' mode rows are staged and only the delta applied.
+    Returns the number of rows written.
+    """
+    if fk_validation not in FK_VALIDATION_MODES:
+        raise ValueError(f"Unknown FK validation mode '{fk_validation}', expected one of {FK_VALIDATION_MODES}")
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode '{mode}', expected one of {LOAD_MODES}")
+
+    spec = TABLE_SPECS[table_name]
+    column_mapping = spec['column_mapping']
+    parent = spec['parent']
+    required_cols = ['application_number'] + spec.get('drop_nulls', [])
+    types = dtype_mapping(spec)
+    incremental = mode == 'incremental'
+    in_database = incremental or (parent is not None and fk_validation == 'database')
+
+    logging.info("-" * 50)
+    logging.info(f"Starting data load for table: '{table_name}'")
+
+    target_table = table_name
+    loaded_columns = list(dict.fromkeys(column_mapping.values()))
+    if in_database:
+        target_table = create_staging_table(engine, table_name, loaded_columns, schema)
+        logging.info(f"Staging rows in '{target_table}'.")
+
+    parent_keys = None
+    if parent and not in_database:
+        try:
+            parent_keys = fetch_parent_keys(engine, parent, schema)
+        except Exception as e:
+            logging.error(f"Could not fetch keys from {parent['table']}. It must be loaded first. Error: {e}")
+            raise
+
+    zip_file_path, csv_file_name = extract_paths(spec, data_dir, extract_date)
+    loaded = 0
+    try:
+        with zipfile.ZipFile(zip_file_path, 'r') as z:
+            with z.open(csv_file_name) as f:
+                df_iterator = pd.read_csv(
+                    f, delimiter='|', header=0 if spec.get('has_header', True) else None,
+                    chunksize=CHUNK_SIZE, low_memory=False, dtype=str, on_bad_lines='skip', quoting=3
+                )
+
+                logging.info("Processing and loading data in chunks...")
+                for i, chunk_df in enumerate(df_iterator):
+                    logging.info(f"  -> Processing chunk {i + 1}...")
+
+                    chunk_df = chunk_df.rename(columns=column_mapping)
+                    db_columns = [col for col in chunk_df.columns if col in column_mapping.values()]
+                    chunk_df = convert_data_types(chunk_df[db_columns], spec)
+                    chunk_df = chunk_df.dropna(subset=required_cols)
+
+                    if parent and not in_database:
+                        original_rows = len(chunk_df)
+                        chunk_df = filter_orphans(chunk_df, parent, parent_keys)
+                        if original_rows > len(chunk_df):
+                            logging.info(f"     Removed {original_rows - len(chunk_df)} rows with no matching key in '{parent['table']}'.")
+
+                    if spec.get('drop_duplicates', True):
+                        chunk_df = chunk_df.drop_duplicates()
+
+                    if chunk_df.empty:
+                        logging.info(f"     Chunk {i + 1} is empty after filtering. Skipping.")
+                        continue
+
+                    loaded += copy_dataframe(chunk_df, target_table, engine, types, schema)
+
+        if incremental and parent is None:
+            inserted, updated, deleted = apply_root_delta(engine, table_name, loaded_columns)
+            loaded = inserted + updated
+            logging.info(f"     Delta applied: {inserted} inserted, {updated} updated, {deleted} deleted.")
+        elif incremental:
+            loaded, deleted = apply_child_delta(engine, table_name, loaded_columns, parent)
+            logging.info(f"     Delta applied for changed applications: {deleted} rows replaced by {loaded}.")
+        elif in_database:
+            staged, loaded = merge_staged_rows(engine, table_name, loaded_columns, parent, schema)
+            logging.info(f"     Removed {staged - loaded} of {staged} staged rows with no matching key in '{parent['table']}'.")
+        logging.info(f"Data loading for '{table_name}' complete: {loaded} rows.")
+    except Exception as e:
+        logging.error(f"An unexpected error occurred while loading '{table_name}': {e}")
+        raise
+    finally:
+        if in_database:
+            drop_staging_table(engine, table_name, schema)
+    return loaded
+
+
+def run_table(table_name, data_dir=DATA_DIR, extract_date=EXTRACT_DATE, fk_validation=FK_VALIDATION,
+              mode=LOAD_MODE, defer=DEFER_CONSTRAINTS, bump=True):
+    """
+    Recreates and loads one table on its own engine, so tables can be loaded
+    from separate worker processes. In 'swap' mode the table is built in
+    SHADOW_SCHEMA; swapping it in is left to the caller. With `defer`, a
+    rebuilt table is loaded without its constraints and fails if they cannot
+    be restored afterwards. `bump=False` leaves bumping the data version to
+    the caller, which run_imports does once for the whole run.
+    """
+    schema = SHADOW_SCHEMA if mode == 'swap' else PUBLIC_SCHEMA
+    rebuild = mode != 'incremental'
+    engine = create_engine()
+    try:
+        setup_database(engine, table_name, drop_existing=rebuild, schema=schema)
+        deferred = defer_constraints(engine, table_name, schema) if defer and rebuild else []
+        loaded = load_data(table_name, engine, data_dir, extract_date, fk_validation, mode, schema)
+        violations = finalize_table(engine, table_name, schema, deferred)
+        if violations:
+            raise RuntimeError(f"Constraint violations in {table_name}: {violations}")
+        if bump and mode != 'swap':
+            # Loaded straight into PUBLIC_SCHEMA; swap_schemas bumps it otherwise.
+            publish_data_version(engine, extract_date)
+        return loaded
+    finally:
+        engine.dispose()
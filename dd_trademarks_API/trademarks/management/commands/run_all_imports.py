@@ -1,80 +1,126 @@
 import os
-import subprocess
 import sys
+import argparse
 import logging
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from import_engine import (
+    DATA_DIR, DEFER_CONSTRAINTS, EXTRACT_DATE, FK_VALIDATION, FK_VALIDATION_MODES, LOAD_MODE, LOAD_MODES,
+    create_engine, prepare_shadow_schema, publish_data_version, run_table, swap_schemas,
+)
+from tm_specs import TABLE_SPECS
 
 # --- Configuration ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def run_script(script_name):
+DEFAULT_WORKERS = int(os.getenv("TM_IMPORT_WORKERS", "4"))
+
+
+def parent_of(table_name):
+    parent = TABLE_SPECS[table_name]['parent']
+    return parent['table'] if parent else None
+
+
+def run_imports(tables=None, workers=DEFAULT_WORKERS, data_dir=DATA_DIR, extract_date=EXTRACT_DATE,
+                fk_validation=FK_VALIDATION, mode=LOAD_MODE, defer=DEFER_CONSTRAINTS):
     """
-    Executes a given Python script using the same interpreter and waits for it to complete.
+    Loads tables in dependency order. A table is started as soon as its parent
+    has finished, so siblings (e.g. every LEVEL 1 table once tm_main is in)
+    load side by side, each in its own process. A parent outside `tables` is
+    assumed to be loaded already. Returns (loaded, failed) where loaded maps
+    table -> rows and failed lists tables that errored or whose parent did.
+
+    In 'swap' mode every table is built in the shadow schema and the whole set
+    is swapped into public only if all of them loaded. Either way the data
+    version is bumped once per run, not once per table.
     """
-    script_path = os.path.join(os.path.dirname(__file__), script_name)
-    if not os.path.exists(script_path):
-        logging.warning(f"Script not found, skipping: {script_path}")
-        return
-
-    logging.info("="*20 + f" RUNNING SCRIPT: {script_name} " + "="*20)
-    try:
-        # Use sys.executable to ensure the same Python interpreter is used
-        result = subprocess.run(
-            [sys.executable, script_path], 
-            check=True, 
-            capture_output=True, 
-            text=True,
-            encoding='utf-8' # Explicitly set encoding
-        )
-        logging.info(f"Successfully executed {script_name}.")
-        # Print the stdout from the script to see its logging messages
-        if result.stdout:
-            print(result.stdout)
-        # Print any errors that might not have caused a crash
-        if result.stderr:
-            logging.warning(f"Stderr from {script_name}:\n{result.stderr}")
-
-    except subprocess.CalledProcessError as e:
-        logging.error(f"Error executing {script_name}:")
-        logging.error(f"Return Code: {e.returncode}")
-        logging.error(f"STDOUT:\n{e.stdout}")
-        logging.error(f"STDERR:\n{e.stderr}")
-        # Stop the entire process if one script fails
-        sys.exit(1)
-    except Exception as e:
-        logging.error(f"An unexpected error occurred while trying to run {script_name}: {e}")
-        sys.exit(1)
+    pending = list(tables or TABLE_SPECS)
+    selected = set(pending)
+    loaded, failed = {}, []
+
+    if mode == 'swap':
+        if selected != set(TABLE_SPECS):
+            raise ValueError("swap mode rebuilds the whole corpus; it cannot be limited to some tables")
+        engine = create_engine()
+        try:
+            prepare_shadow_schema(engine)
+        finally:
+            engine.dispose()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running = {}
+        while pending or running:
+            for table_name in list(pending):
+                parent = parent_of(table_name)
+                if parent in failed:
+                    logging.error(f"Skipping {table_name}: parent table {parent} failed to load.")
+                    failed.append(table_name)
+                    pending.remove(table_name)
+                elif parent is None or parent not in selected or parent in loaded:
+                    logging.info("=" * 20 + f" STARTING: {table_name} " + "=" * 20)
+                    future = pool.submit(run_table, table_name, data_dir, extract_date, fk_validation, mode, defer,
+                                         bump=False)
+                    running[future] = table_name
+                    pending.remove(table_name)
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                table_name = running.pop(future)
+                try:
+                    loaded[table_name] = future.result()
+                    logging.info(f"Finished {table_name}: {loaded[table_name]} rows.")
+                except Exception as e:
+                    logging.error(f"Error loading {table_name}: {e}")
+                    failed.append(table_name)
+
+    if mode == 'swap':
+        if failed:
+            logging.error("Not swapping: the shadow schema is incomplete and has been left for inspection.")
+        else:
+            engine = create_engine()
+            try:
+                swap_schemas(engine, list(TABLE_SPECS), extract_date)
+            finally:
+                engine.dispose()
+    elif loaded:
+        # Tables that did load are already live, even if others failed.
+        engine = create_engine()
+        try:
+            publish_data_version(engine, extract_date)
+        finally:
+            engine.dispose()
+
+    return loaded, failed
+
 
 if __name__ == "__main__":
-    # Define the scripts in the correct order of execution to respect database dependencies.
-    # Parent tables must be loaded before their children.
-    scripts_to_run = [
-        # --- LEVEL 0 (No Dependencies) ---
-        'import_tm_main.py',
-        
-        # --- LEVEL 1 (Depend on tm_main) ---
-        'import_tm_mark_description.py',
-        'import_tm_cipo_classifications.py',
-        'import_tm_applicant_classifications.py',
-        'import_tm_representation.py',
-        'import_tm_claim.py',
-        'import_tm_priority_claim.py',
-        'import_tm_event.py',
-        'import_tm_footnote.py',
-        'import_tm_footnote_formatted.py',
-        'import_tm_interested_party.py',
-        'import_tm_cancellation_case.py',
-        'import_tm_opposition_case.py',
-        'import_tm_transliteration.py',
-        'import_tm_application_text.py',
-        'import_tm_application_disclaimer.py',
-        'import_tm_heading.py',
-        
-        # --- LEVEL 2 (Depend on other child tables) ---
-        'import_tm_cancellation_case_action.py',
-        'import_tm_opposition_case_action.py'
-    ]
-
-    for script in scripts_to_run:
-        run_script(script)
-
-    logging.info("="*20 + " ALL SCRIPTS EXECUTED SUCCESSFULLY " + "="*20)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Load the trademark extracts, parents before children.")
+    parser.add_argument('tables', nargs='*', metavar='table',
+                        help="Tables to load (default: all).")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Tables loaded at the same time (default: %(default)s).")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="Directory holding the extract ZIPs.")
+    parser.add_argument('--extract-date', default=EXTRACT_DATE, help="Date suffix of the extract files.")
+    parser.add_argument('--fk-validation', choices=FK_VALIDATION_MODES, default=FK_VALIDATION,
+                        help="Drop orphan child rows in PostgreSQL or in Python (default: %(default)s).")
+    parser.add_argument('--mode', choices=LOAD_MODES, default=LOAD_MODE,
+                        help="Rebuild tables in place, apply only the delta, or rebuild in a shadow schema "
+                             "and swap it in (default: %(default)s).")
+    parser.add_argument('--defer-constraints', action='store_true', default=DEFER_CONSTRAINTS,
+                        help="Load rebuilt tables without keys and foreign keys, then restore and validate them.")
+    args = parser.parse_args()
+    unknown = [t for t in args.tables if t not in TABLE_SPECS]
+    if unknown:
+        parser.error(f"unknown table(s): {', '.join(unknown)}")
+    if args.mode == 'swap' and args.tables:
+        parser.error("--mode swap always rebuilds every table")
+
+    loaded, failed = run_imports(args.tables, args.workers, args.data_dir, args.extract_date, args.fk_validation,
+                                 args.mode, args.defer_constraints)
+    if failed:
+        logging.error("=" * 20 + f" IMPORT FAILED: {', '.join(failed)} " + "=" * 20)
+        sys.exit(1)
+
+    logging.info("=" * 20 + " ALL TABLES LOADED SUCCESSFULLY " + "=" * 20)
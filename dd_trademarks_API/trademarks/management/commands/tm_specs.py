@@ -0,0 +1,1097 @@
+"""
+Declarative description of every trademark table the import engine loads.
+
+Each entry replaces the per-table constants that used to live in its own
+import_tm_*.py script:
+    file_stem         ZIP/CSV name without the extract date
+    parent            table + key columns rows must match (None for tm_main)
+    has_header        False when the CSV has no header row (mapping is positional)
+    drop_nulls        extra columns, besides application_number, that must be present
+    drop_duplicates   de-duplicate each chunk before loading (default True)
+    date_format       strict format for date parsing (default: inferred)
+    type_conversions  bool_cols / date_cols / int_cols, as in TYPE_CONVERSIONS
+    column_mapping    CSV header (or position) -> db column
+    ddl               CREATE TABLE statement
+    indexes           CREATE INDEX statements run after the table is loaded
+"""
+
+TABLE_SPECS = {
+    'tm_main': {
+        'file_stem': 'TM_application_main',
+        'parent': None,
+        'drop_duplicates': False,
+        'type_conversions': {
+            'bool_cols': [
+                'expungement_indicator',
+                'distinctiveness_indicator',
+                'evidence_of_use_indicator',
+                'foreign_application_indicator',
+                'foreign_registration_indicator',
+                'used_in_canada_indicator',
+                'proposed_use_in_canada_indicator',
+            ],
+            'date_cols': [
+                'publication_date',
+                'expiry_date',
+                'current_status_date',
+                'divisional_application_date',
+                'allowed_date',
+                'renewal_date',
+                'filing_date',
+                'registration_date',
+                'receiving_office_date',
+                'termination_date',
+                'opposition_start_date',
+                'opposition_end_date',
+                'authorization_of_use_date',
+                'application_abandoned_date',
+            ],
+            'int_cols': [
+                'legislation_code',
+                'wipo_status_code',
+                'mark_type_code',
+                'total_nice_classifications_number',
+                'authorization_code',
+                'cipo_status_code',
+                'trademark_class_code',
+                'geographical_indication_kind_category_code',
+                'geographical_indication_translation_sequence_number',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Filing Date - Date de dépôt': 'filing_date',
+            'Publication Date - Date de publication': 'publication_date',
+            'Registration Date - Date d’enregistrement': 'registration_date',
+            'Registration Office Country Code - Code du pays de l’office de l’enregistrement': 'registration_office_country_code',
+            'Receiving Office Country Code - Code du pays de l’office récepteur': 'receiving_office_country_code',
+            'Receiving Office Date - Date de réception par l’office': 'receiving_office_date',
+            "Assigning Office Country Code - Code du pays de l'office de cession": 'assigning_office_country_code',
+            'Registration Number - Numéro d’enregistrement': 'registration_number',
+            'Legislation Description Code - Code de description de la législation (Code de Loi applicable)': 'legislation_code',
+            'Filing Place - Pays de Dépôt': 'filing_place',
+            'Application Reference Number - Numéro de référence de la demande': 'application_reference_number',
+            'Application Language Code - Code de langue de la demande': 'application_language_code',
+            "Expiry Date - Date d'expiration": 'expiry_date',
+            'Termination Date - Date d’inactivation': 'termination_date',
+            'WIPO Status Code - Code du statut de l’OMPI': 'wipo_status_code',
+            'Current Status Date - Date de statut actuel ': 'current_status_date',
+            'Association Category ID - Indicateur de cession partielle': 'association_category_id',
+            'Associated Application Number - Numéro de la demande associée': 'associated_application_number',
+            'Mark Category - Catégorie de la marque ': 'mark_category',
+            'Divisional Application Country Code - Code du pays de la demande divisionnaire': 'divisional_application_country_code',
+            'Divisional Application Number - numéro de la demande divisionnaire (Numéro ST.13 de la demande originale)': 'divisional_application_number',
+            'Divisional Application Date - Date de la demande divisionnaire': 'divisional_application_date',
+            'Internationall Registration Number - Numéro d’enregistrement international': 'international_registration_number',
+            'MarkType Code - Code du type de marque ': 'mark_type_code',
+            'Mark Verbal Element Description - Description de l’élément Verbal de la marque (Texte de l’élément Verbal de la marque)': 'mark_verbal_element_text',
+            'Mark Significant Description - Description  détaillée de la marque (Texte de l’élément verbal signifiant de la marque)': 'mark_significant_verbal_element_text',
+            'Mark Translation Description - Description de la traduction de la marque (Traduction de la marque)': 'mark_translation_text',
+            'Expungement Indicator - Indicateur de radiation': 'expungement_indicator',
+            'Distinctiveness Indicator - Indicateur de caractère distinctif acquis': 'distinctiveness_indicator',
+            'Distinctiveness Description - Descriotion du caractère distinctif acquis': 'distinctiveness_description',
+            'Evidence Of Use Indicator - Indicateur de preuve d’utilisation': 'evidence_of_use_indicator',
+            'Evidence Of Use Description - Description de preuve d’utilisation': 'evidence_of_use_description',
+            'Restriction Of Use Description - Description de la restriction d’utilisation': 'restriction_of_use_description',
+            'CIPO Standard Message Description - Description de la mise en garde sur les données de marque de commerce': 'cipo_standard_message_description',
+            'Opposition Start Date - Date de début d’opposition ': 'opposition_start_date',
+            'Opposition End Date - Date de fin d’opposition ': 'opposition_end_date',
+            'Total Nice Classifications Number - Nombre total de classification de Nice ': 'total_nice_classifications_number',
+            'Foreign Application Indicator - Indicateur de demande étrangère': 'foreign_application_indicator',
+            "Foreign Registration Indicator - Indicateur d'enregistrement étranger": 'foreign_registration_indicator',
+            'Used In Canada Indicator - Indicateur d’utilisation au Canada': 'used_in_canada_indicator',
+            "Proposed Use In Canada Indicator - Indicateur d'utilisation projetée au Canada": 'proposed_use_in_canada_indicator',
+            "Classification Term Office Country Code - Code du pays de l'office du terme de classification": 'classification_term_office_country_code',
+            'Classification Term Source Name - Catégorie de la source du terme de classification': 'classification_term_source_category',
+            'Classification Term English Description - Description en anglais du terme de classification': 'classification_term_english_description',
+            'Publication ID - Numéro et volume de la publication ': 'publication_id',
+            'Publication Status - Statut de publication': 'publication_status',
+            "Authorization Of Use Date - Date d’autorisation d'utilisation": 'authorization_of_use_date',
+            "Authorization Code - Code d'autorisation": 'authorization_code',
+            "Authorization Description - Description d'autorisation": 'authorization_description',
+            'Register Code - Catégorie du registre': 'register_code',
+            'Application Abandoned Date - Date d’abandon de la demande': 'application_abandoned_date',
+            'CIPO Status Code - Code de statut de la marque': 'cipo_status_code',
+            'Allowed Date - Date admise': 'allowed_date',
+            'Renewal Date - Date de renouvellement': 'renewal_date',
+            'Trademark Class Code - Code de la classe de marque ': 'trademark_class_code',
+            'Geographical Indication Kind Category Code - Code du type d’indication géographique': 'geographical_indication_kind_category_code',
+            'Geographical Indication Translation Sequence Number - Numéro d’ordre de traduction de l’indication géographique': 'geographical_indication_translation_sequence_number',
+            'Geographical IndicationTranslationText - Texte de la traduction de l’indication géographique': 'geographical_indication_translation_text',
+            'Doubtful Case Application Number - Numéro de demande du cas douteux': 'doubtful_case_application_number',
+            'Doubtful Case Registration Number - Numéro d’enregistrement du cas douteux': 'doubtful_case_registration_number',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_main
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                filing_date date,
+                publication_date date,
+                registration_date date,
+                registration_office_country_code text COLLATE pg_catalog."default",
+                receiving_office_country_code text COLLATE pg_catalog."default",
+                receiving_office_date date,
+                assigning_office_country_code text COLLATE pg_catalog."default",
+                registration_number character varying(255) COLLATE pg_catalog."default",
+                legislation_code integer,
+                filing_place text COLLATE pg_catalog."default",
+                application_reference_number text COLLATE pg_catalog."default",
+                application_language_code text COLLATE pg_catalog."default",
+                expiry_date date,
+                termination_date date,
+                wipo_status_code integer,
+                current_status_date date,
+                association_category_id text COLLATE pg_catalog."default",
+                associated_application_number bigint,
+                mark_category text COLLATE pg_catalog."default",
+                divisional_application_country_code text COLLATE pg_catalog."default",
+                divisional_application_number bigint,
+                divisional_application_date date,
+                international_registration_number character varying(255) COLLATE pg_catalog."default",
+                mark_type_code integer,
+                mark_verbal_element_text text COLLATE pg_catalog."default",
+                mark_significant_verbal_element_text text COLLATE pg_catalog."default",
+                mark_translation_text text COLLATE pg_catalog."default",
+                expungement_indicator boolean,
+                distinctiveness_indicator boolean,
+                distinctiveness_description text COLLATE pg_catalog."default",
+                evidence_of_use_indicator boolean,
+                evidence_of_use_description text COLLATE pg_catalog."default",
+                restriction_of_use_description text COLLATE pg_catalog."default",
+                cipo_standard_message_description text COLLATE pg_catalog."default",
+                opposition_start_date date,
+                opposition_end_date date,
+                total_nice_classifications_number integer,
+                foreign_application_indicator boolean,
+                foreign_registration_indicator boolean,
+                used_in_canada_indicator boolean,
+                proposed_use_in_canada_indicator boolean,
+                classification_term_office_country_code text COLLATE pg_catalog."default",
+                classification_term_source_category text COLLATE pg_catalog."default",
+                classification_term_english_description text COLLATE pg_catalog."default",
+                publication_id text COLLATE pg_catalog."default",
+                publication_status text COLLATE pg_catalog."default",
+                authorization_of_use_date date,
+                authorization_code integer,
+                authorization_description text COLLATE pg_catalog."default",
+                register_code text COLLATE pg_catalog."default",
+                application_abandoned_date date,
+                allowed_date date,
+                renewal_date date,
+                trademark_class_code integer,
+                geographical_indication_kind_category_code integer,
+                geographical_indication_translation_sequence_number integer,
+                geographical_indication_translation_text text COLLATE pg_catalog."default",
+                doubtful_case_application_number character varying(255) COLLATE pg_catalog."default",
+                doubtful_case_registration_number character varying(255) COLLATE pg_catalog."default",
+                cipo_status_code integer,
+                CONSTRAINT tm_main_pkey PRIMARY KEY (application_number)
+            )
+        """,
+    },
+    'tm_mark_description': {
+        'file_stem': 'TM_mark_description',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_duplicates': False,
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Language Code - Code de la langue': 'language_code',
+            'Mark Description - Description de la marque': 'mark_description',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_mark_description
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                language_code text COLLATE pg_catalog."default",
+                mark_description text COLLATE pg_catalog."default",
+                CONSTRAINT tm_mark_description_pkey PRIMARY KEY (application_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_cipo_classifications': {
+        'file_stem': 'TM_cipo_classification',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_nulls': ['nice_classification_code'],
+        'drop_duplicates': False,
+        'type_conversions': {
+            'int_cols': ['nice_classification_code'],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Classification Kind Code - Code du type de classification': 'classification_kind_code',
+            'Nice Classification Code - Code de Classification de Nice': 'nice_classification_code',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_cipo_classifications
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                classification_kind_code text COLLATE pg_catalog."default",
+                nice_classification_code smallint NOT NULL,
+                CONSTRAINT tm_cipo_classifications_pkey PRIMARY KEY (application_number, nice_classification_code),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_applicant_classifications': {
+        'file_stem': 'TM_applicant_classification',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_nulls': ['classification_sequence_number', 'classification_indicator_line_sequence_number'],
+        'type_conversions': {
+            'int_cols': [
+                'classification_indicator_line_sequence_number',
+                'nice_edition_number',
+                'nice_classification_code',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Classification Sequence Number - Numéro de séquence de la classification': 'classification_sequence_number',
+            'Classification Indicator Line Sequence Number - Ligne indicatrice du numéro de séquence de la classification ': 'classification_indicator_line_sequence_number',
+            'Nice Edition Number - Numéro d’édition de classification de Nice ': 'nice_edition_number',
+            'Nice Classification Code - Code de de classification de Nice ': 'nice_classification_code',
+            'Nice Classification - Classification de Nice': 'nice_classification',
+            "Classification indicator description - Description de l'indicateur de la classification": 'classification_indicator_description',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_applicant_classifications
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                classification_sequence_number text COLLATE pg_catalog."default" NOT NULL,
+                classification_indicator_line_sequence_number integer NOT NULL,
+                classification_indicator_description text COLLATE pg_catalog."default",
+                nice_edition_number smallint,
+                nice_classification_code smallint,
+                nice_classification text COLLATE pg_catalog."default",
+                CONSTRAINT tm_applicant_classifications_pkey PRIMARY KEY (application_number, classification_sequence_number, classification_indicator_line_sequence_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_representation': {
+        'file_stem': 'TM_representation',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'type_conversions': {
+            'int_cols': [
+                'representation_type_code',
+                'vienna_code',
+                'vienna_division_number',
+                'vienna_section_number',
+                'image_colour_claimed_sequence_number',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Representation Type Code - Code de type de représentation': 'representation_type_code',
+            'Vienna Code - Code de Vienne': 'vienna_code',
+            'Vienna Division Number - Numéro de division de Vienne': 'vienna_division_number',
+            'Vienna Section Number - Numéro de section de Vienne': 'vienna_section_number',
+            'Vienna Description - Description de Vienne en Anglais': 'vienna_description',
+            'Vienna Description Fr - Description de Vienne en Français': 'vienna_description_fr',
+            'Filename Short - Nom du fichier ': 'file_name',
+            'File Format Short - Format du fichier ': 'file_format',
+            "Image Colour Claimed Sequence Number - Numéro d'ordre de revendication de couleur": 'image_colour_claimed_sequence_number',
+            'Image Colour Claimed - Revendication de couleur': 'image_colour_claimed',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_representation
+            (
+                id SERIAL PRIMARY KEY,
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                representation_type_code smallint,
+                vienna_code integer,
+                vienna_division_number integer,
+                vienna_section_number integer,
+                image_colour_claimed_sequence_number integer,
+                vienna_description text COLLATE pg_catalog."default",
+                vienna_description_fr text COLLATE pg_catalog."default",
+                file_name text COLLATE pg_catalog."default",
+                file_format text COLLATE pg_catalog."default",
+                image_colour_claimed text COLLATE pg_catalog."default",
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_claim': {
+        'file_stem': 'TM_claim',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_nulls': ['claim_type', 'claim_number'],
+        'type_conversions': {
+            'date_cols': ['structure_claim_date'],
+            'int_cols': [
+                'claim_type',
+                'claim_number',
+                'claim_code',
+                'claim_year_number',
+                'claim_month_number',
+                'claim_day_number',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Claim Text - Texte de revendication': 'claim_text',
+            'Claim Type - Type de revendication': 'claim_type',
+            'Claim Number - Numéro de revendication': 'claim_number',
+            'Claim Code - Code de revendication': 'claim_code',
+            'Structure Claim Date - Date de revendication structurée': 'structure_claim_date',
+            'Claim Year Number - Année de la revendication': 'claim_year_number',
+            'Claim Month Number - Mois de la revendication': 'claim_month_number',
+            'Claim Day Number - Jour de la revendication': 'claim_day_number',
+            'Claim Country Code - Code du pays de la revendication': 'claim_country_code',
+            'Foreign Registration Number - Numéro d’enregistrement de la revendication étrangère': 'foreign_registration_number',
+            'Goods Services Reference Identifier - Nom de référence des produits et services': 'goods_services_reference_identifier',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_claim
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                claim_type smallint NOT NULL,
+                claim_number integer NOT NULL,
+                claim_text text COLLATE pg_catalog."default",
+                claim_code smallint,
+                structure_claim_date date,
+                claim_year_number smallint,
+                claim_month_number smallint,
+                claim_day_number smallint,
+                claim_country_code text COLLATE pg_catalog."default",
+                foreign_registration_number text COLLATE pg_catalog."default",
+                goods_services_reference_identifier text COLLATE pg_catalog."default",
+                CONSTRAINT tm_claim_pkey PRIMARY KEY (application_number, claim_type, claim_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_priority_claim': {
+        'file_stem': 'TM_priority_claim',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'type_conversions': {
+            'date_cols': ['priority_filing_date'],
+            'int_cols': [
+                'nice_edition_number',
+                'nice_classification_code',
+                'secondary_sequence_number',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Priority Claim Text - Information additionelle de la revendication de priorité': 'priority_claim_text',
+            'Priority Country Code - Code du pays de priorité': 'priority_country_code',
+            'Priority Application Number - Numéro de la demande de priorité': 'priority_application_number',
+            'Priority Filing Date - Date de la priorité': 'priority_filing_date',
+            'Nice Edition Number - Numéro d’édition de classification de Nice ': 'nice_edition_number',
+            'Nice Classification Code - Code de classification de Nice': 'nice_classification_code',
+            'Classification Sequence Number - Numéro de séquence de la classification': 'classification_sequence_number',
+            'Secondary Sequence Number - Numéro de séquence secondaire': 'secondary_sequence_number',
+            'Classification Description Line Sequence Comment - Description de la classification': 'classification_description',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_priority_claim
+            (
+                id SERIAL PRIMARY KEY,
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                priority_application_number text COLLATE pg_catalog."default",
+                classification_sequence_number text COLLATE pg_catalog."default",
+                secondary_sequence_number integer,
+                priority_claim_text text COLLATE pg_catalog."default",
+                priority_country_code text COLLATE pg_catalog."default",
+                priority_filing_date date,
+                classification_description text COLLATE pg_catalog."default",
+                nice_edition_number smallint,
+                nice_classification_code smallint,
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_event': {
+        'file_stem': 'TM_event',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'type_conversions': {
+            'date_cols': ['action_date', 'response_date'],
+            'int_cols': ['cipo_action_code'],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Action Date - Date de l’action': 'action_date',
+            'Response Date - Date de la réponse': 'response_date',
+            'Additional Information Comment - Informations supplémentaires': 'additional_information_comment',
+            "WIPO Action Type - Catégorie de l’activité de marque de l'OMPI": 'wipo_action_type',
+            'CIPO Action Code - Code de l’action': 'cipo_action_code',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_event
+            (
+                event_id SERIAL PRIMARY KEY,
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                action_date date,
+                response_date date,
+                additional_information_comment text COLLATE pg_catalog."default",
+                wipo_action_type text COLLATE pg_catalog."default",
+                cipo_action_code smallint,
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_footnote': {
+        'file_stem': 'TM_footnote',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_nulls': ['footnote_number', 'footnote_text_line_sequence_number'],
+        'date_format': '%Y-%m-%d',
+        'type_conversions': {
+            'date_cols': ['footnote_change_date', 'footnote_registration_date'],
+            'int_cols': [
+                'footnote_category_code',
+                'footnote_number',
+                'footnote_text_line_sequence_number',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Footnote Category Code - Code de la note de bas de page': 'footnote_category_code',
+            'Footnote Change Date - Date du changement de la note de bas de page': 'footnote_change_date',
+            'Footnote Registration Date - Date d’enregistrement des notes de bas de page': 'footnote_registration_date',
+            'Footnote Number - Numéro des notes en bas de pages': 'footnote_number',
+            'Footnote Text Line Sequence Number - Numéro de séquence des détails des notes de bas de page': 'footnote_text_line_sequence_number',
+            'Footnote Text Line Description - Détails des notes de bas de page': 'footnote_text_line_description',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_footnote
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                footnote_number integer NOT NULL,
+                footnote_text_line_sequence_number integer NOT NULL,
+                footnote_text_line_description text COLLATE pg_catalog."default",
+                footnote_category_code smallint,
+                footnote_change_date date,
+                footnote_registration_date date,
+                CONSTRAINT tm_footnote_pkey PRIMARY KEY (application_number, footnote_number, footnote_text_line_sequence_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_footnote_formatted': {
+        'file_stem': 'TM_footnote_formatted',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_nulls': ['footnote_number', 'footnote_formatted_text_sequence_number'],
+        'type_conversions': {
+            'int_cols': ['footnote_number', 'footnote_formatted_text_sequence_number'],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Footnote Number - Numéro des notes en bas de pages': 'footnote_number',
+            'Footnote Formatted Text Sequence Number - Numéro de séquence du texte formaté des notes de bas de page': 'footnote_formatted_text_sequence_number',
+            'Footnote Formatted Text - Texte formaté des notes de bas de page': 'footnote_formatted_text',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_footnote_formatted
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                footnote_number integer NOT NULL,
+                footnote_formatted_text_sequence_number integer NOT NULL,
+                footnote_formatted_text text COLLATE pg_catalog."default",
+                CONSTRAINT tm_footnote_formatted_pkey PRIMARY KEY (application_number, footnote_number, footnote_formatted_text_sequence_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_interested_party': {
+        'file_stem': 'TM_interested_party',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        # Same index as trademarks migration 0005, so rebuilt tables keep it.
+        'indexes': [
+            'CREATE INDEX IF NOT EXISTS tm_ip_party_name_trgm '
+            'ON public.tm_interested_party USING gin (party_name gin_trgm_ops);',
+        ],
+        'type_conversions': {
+            'int_cols': ['party_type_code', 'agent_number'],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Party Type Code - Code de type de la partie intéressée': 'party_type_code',
+            'Party Language Code - Code de langue de la partie intéressée': 'party_language_code',
+            'Party Name - Nom de la partie intéressée': 'party_name',
+            "Party Address Line 1 - Ligne 1 de l'adresse de la partie intéressée": 'party_address_line_1',
+            "Party Address Line 2 - Ligne 2 de l'adresse de la partie intéressée": 'party_address_line_2',
+            "Party Address Line 3 - Ligne 3 de l'adresse de la partie intéressée": 'party_address_line_3',
+            "Party Address Line 4 - Ligne 4 de l'adresse de la partie intéressée": 'party_address_line_4',
+            "Party Address Line 5 - Ligne 5 de l'adresse de la partie intéressée": 'party_address_line_5',
+            'Party Province Name - Nom de la province de la partie intéressée': 'party_province_name',
+            'Party Country Code - Code du pays de la partie intéressée': 'party_country_code',
+            'Party Postal Code - Code postal de la partie intéressée': 'party_postal_code',
+            "Contact Language Code - Code langue de correspondance de l'agent ": 'contact_language_code',
+            'Contact Name - Information sur le nom du représentant': 'contact_name',
+            "Contact Address Line 1 - Ligne 1 de l'adresse du représentant": 'contact_address_line_1',
+            "Contact Address Line 2 - Ligne 2 de l'adresse du représentant": 'contact_address_line_2',
+            "Contact Address Line 3 - Ligne 3 de l'adresse du représentant": 'contact_address_line_3',
+            'Contact Province Name - Province du représentant': 'contact_province_name',
+            'Contact Country Code - Pays de représentant': 'contact_country_code',
+            'Contact Postal Code - Code postal  du représentant': 'contact_postal_code',
+            'Current Owner Legal Name - Nom légal du requérant courant': 'current_owner_legal_name',
+            "Agent Number - Numéro de l'agent": 'agent_number',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_interested_party
+            (
+                interested_party_id SERIAL PRIMARY KEY,
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                party_type_code smallint,
+                party_language_code text COLLATE pg_catalog."default",
+                party_name text COLLATE pg_catalog."default",
+                party_address_line_1 text COLLATE pg_catalog."default",
+                party_address_line_2 text COLLATE pg_catalog."default",
+                party_address_line_3 text COLLATE pg_catalog."default",
+                party_address_line_4 text COLLATE pg_catalog."default",
+                party_address_line_5 text COLLATE pg_catalog."default",
+                party_province_name text COLLATE pg_catalog."default",
+                party_country_code text COLLATE pg_catalog."default",
+                party_postal_code text COLLATE pg_catalog."default",
+                contact_language_code text COLLATE pg_catalog."default",
+                contact_name text COLLATE pg_catalog."default",
+                contact_address_line_1 text COLLATE pg_catalog."default",
+                contact_address_line_2 text COLLATE pg_catalog."default",
+                contact_address_line_3 text COLLATE pg_catalog."default",
+                contact_province_name text COLLATE pg_catalog."default",
+                contact_country_code text COLLATE pg_catalog."default",
+                contact_postal_code text COLLATE pg_catalog."default",
+                current_owner_legal_name text COLLATE pg_catalog."default",
+                agent_number integer,
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_cancellation_case': {
+        'file_stem': 'TM_cancellation_case',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'has_header': False,
+        'drop_nulls': ['section_44_45_case_number'],
+        'type_conversions': {
+            'date_cols': ['section_44_45_filing_date', 'section_44_45_status_date'],
+            'int_cols': [
+                'section_44_45_case_number',
+                'wipo_section_44_45_status_category_code',
+                'section_44_45_status_code',
+                'agent_number_of_plaintiff',
+            ],
+        },
+        'column_mapping': {
+            0: 'application_number',
+            1: 'section_44_45_case_number',
+            2: 'legal_proceeding_type_description_in_english',
+            3: 'legal_proceeding_type_description_in_french',
+            4: 'section_44_45_filing_date',
+            5: 'wipo_section_44_45_status_category_code',
+            6: 'section_44_45_status_code',
+            7: 'section_44_45_status_date',
+            8: 'entity_name_of_the_legal_proceeding_defendant',
+            9: 'defendant_language_code',
+            10: 'defendant_address_line_1',
+            11: 'defendant_address_line_2',
+            12: 'defendant_address_line_3',
+            13: 'defendant_country_code',
+            14: 'contact_name_of_defendant',
+            15: 'contact_language_code_of_defendant',
+            16: 'contact_address_line_1_of_defendant',
+            17: 'contact_address_line_2_of_defendant',
+            18: 'contact_address_line_3_of_defendant',
+            19: 'contact_province_name_of_defendant',
+            20: 'contact_country_code_of_defendant',
+            21: 'contact_postal_code_of_defendant',
+            22: 'agent_name_of_defendant',
+            23: 'agent_language_code_of_defendant',
+            24: 'agent_address_line_1_of_defendant',
+            25: 'agent_address_line_2_of_defendant',
+            26: 'agent_address_line_3_of_defendant',
+            27: 'agent_province_name_of_defendant',
+            28: 'agent_country_code_of_defendant',
+            29: 'agent_postal_code_of_defendant',
+            30: 'plaintiff_name',
+            31: 'plaintiff_legal_name',
+            32: 'plaintiff_language_code',
+            33: 'plaintiff_address_line_1',
+            34: 'plaintiff_address_line_2',
+            35: 'plaintiff_address_line_3',
+            36: 'plaintiff_country_code',
+            37: 'contact_name_of_plaintiff',
+            38: 'contact_language_code_of_plaintiff',
+            39: 'contact_address_line_1_of_plaintiff',
+            40: 'contact_address_line_2_of_plaintiff',
+            41: 'contact_address_line_3_of_plaintiff',
+            42: 'contact_province_name_of_plaintiff',
+            43: 'contact_country_code_of_plaintiff',
+            44: 'contact_postal_code_of_plaintiff',
+            45: 'agent_number_of_plaintiff',
+            46: 'agent_name_of_plaintiff',
+            47: 'agent_language_code_of_plaintiff',
+            48: 'agent_address_line_1_of_plaintiff',
+            49: 'agent_address_line_2_of_plaintiff',
+            50: 'agent_address_line_3_of_plaintiff',
+            51: 'agent_province_name_of_plaintiff',
+            52: 'agent_country_code_of_plaintiff',
+            53: 'agent_postal_code_of_plaintiff',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_cancellation_case
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                section_44_45_case_number integer NOT NULL,
+                legal_proceeding_type_description_in_english text COLLATE pg_catalog."default",
+                legal_proceeding_type_description_in_french text COLLATE pg_catalog."default",
+                section_44_45_filing_date date,
+                wipo_section_44_45_status_category_code smallint,
+                section_44_45_status_code smallint,
+                section_44_45_status_date date,
+                entity_name_of_the_legal_proceeding_defendant text COLLATE pg_catalog."default",
+                defendant_language_code text COLLATE pg_catalog."default",
+                defendant_address_line_1 text COLLATE pg_catalog."default",
+                defendant_address_line_2 text COLLATE pg_catalog."default",
+                defendant_address_line_3 text COLLATE pg_catalog."default",
+                defendant_country_code text COLLATE pg_catalog."default",
+                contact_name_of_defendant text COLLATE pg_catalog."default",
+                contact_language_code_of_defendant text COLLATE pg_catalog."default",
+                contact_address_line_1_of_defendant text COLLATE pg_catalog."default",
+                contact_address_line_2_of_defendant text COLLATE pg_catalog."default",
+                contact_address_line_3_of_defendant text COLLATE pg_catalog."default",
+                contact_province_name_of_defendant text COLLATE pg_catalog."default",
+                contact_country_code_of_defendant text COLLATE pg_catalog."default",
+                contact_postal_code_of_defendant text COLLATE pg_catalog."default",
+                agent_name_of_defendant text COLLATE pg_catalog."default",
+                agent_language_code_of_defendant text COLLATE pg_catalog."default",
+                agent_address_line_1_of_defendant text COLLATE pg_catalog."default",
+                agent_address_line_2_of_defendant text COLLATE pg_catalog."default",
+                agent_address_line_3_of_defendant text COLLATE pg_catalog."default",
+                agent_province_name_of_defendant text COLLATE pg_catalog."default",
+                agent_country_code_of_defendant text COLLATE pg_catalog."default",
+                agent_postal_code_of_defendant text COLLATE pg_catalog."default",
+                plaintiff_name text COLLATE pg_catalog."default",
+                plaintiff_legal_name text COLLATE pg_catalog."default",
+                plaintiff_language_code text COLLATE pg_catalog."default",
+                plaintiff_address_line_1 text COLLATE pg_catalog."default",
+                plaintiff_address_line_2 text COLLATE pg_catalog."default",
+                plaintiff_address_line_3 text COLLATE pg_catalog."default",
+                plaintiff_country_code text COLLATE pg_catalog."default",
+                contact_name_of_plaintiff text COLLATE pg_catalog."default",
+                contact_language_code_of_plaintiff text COLLATE pg_catalog."default",
+                contact_address_line_1_of_plaintiff text COLLATE pg_catalog."default",
+                contact_address_line_2_of_plaintiff text COLLATE pg_catalog."default",
+                contact_address_line_3_of_plaintiff text COLLATE pg_catalog."default",
+                contact_province_name_of_plaintiff text COLLATE pg_catalog."default",
+                contact_country_code_of_plaintiff text COLLATE pg_catalog."default",
+                contact_postal_code_of_plaintiff text COLLATE pg_catalog."default",
+                agent_number_of_plaintiff integer,
+                agent_name_of_plaintiff text COLLATE pg_catalog."default",
+                agent_language_code_of_plaintiff text COLLATE pg_catalog."default",
+                agent_address_line_1_of_plaintiff text COLLATE pg_catalog."default",
+                agent_address_line_2_of_plaintiff text COLLATE pg_catalog."default",
+                agent_address_line_3_of_plaintiff text COLLATE pg_catalog."default",
+                agent_province_name_of_plaintiff text COLLATE pg_catalog."default",
+                agent_country_code_of_plaintiff text COLLATE pg_catalog."default",
+                agent_postal_code_of_plaintiff text COLLATE pg_catalog."default",
+                CONSTRAINT tm_cancellation_case_pkey PRIMARY KEY (application_number, section_44_45_case_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_opposition_case': {
+        'file_stem': 'TM_opposition_case',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'has_header': False,
+        'drop_nulls': ['opposition_case_number'],
+        'type_conversions': {
+            'date_cols': [
+                'opposition_date',
+                'opposition_wipo_status_date',
+                'cipo_opposition_status_date',
+            ],
+            'int_cols': [
+                'opposition_case_number',
+                'wipo_opposition_status_category',
+                'opposition_case_status_code',
+                'agent_number_of_plaintiff',
+            ],
+        },
+        'column_mapping': {
+            0: 'application_number',
+            1: 'opposition_case_number',
+            2: 'opposition_case_type_english_name',
+            3: 'opposition_case_type_french_name',
+            4: 'opposition_date',
+            5: 'wipo_opposition_case_status',
+            6: 'opposition_wipo_status_date',
+            7: 'wipo_opposition_status_category',
+            8: 'opposition_case_status_code',
+            9: 'cipo_opposition_status_date',
+            10: 'entity_name_of_the_opposition_proceeding_defendant',
+            11: 'defendant_language_code',
+            12: 'defendant_address_line_1',
+            13: 'defendant_address_line_2',
+            14: 'defendant_address_line_3',
+            15: 'defendant_country_code',
+            16: 'contact_name_of_defendant',
+            17: 'contact_language_code_of_defendant',
+            18: 'contact_address_line_1_of_defendant',
+            19: 'contact_address_line_2_of_defendant',
+            20: 'contact_address_line_3_of_defendant',
+            21: 'contact_province_name_of_defendant',
+            22: 'contact_country_code_of_defendant',
+            23: 'contact_postal_code_of_defendant',
+            24: 'agent_name_of_defendant',
+            25: 'agent_language_code_of_defendant',
+            26: 'agent_address_line_1_of_defendant',
+            27: 'agent_address_line_2_of_defendant',
+            28: 'agent_address_line_3_of_defendant',
+            29: 'agent_province_name_of_defendant',
+            30: 'agent_country_code_of_defendant',
+            31: 'agent_postal_code_of_defendant',
+            32: 'plaintiff_name',
+            33: 'plaintiff_legal_name',
+            34: 'plaintiff_language_code',
+            35: 'plaintiff_address_line_1',
+            36: 'plaintiff_address_line_2',
+            37: 'plaintiff_address_line_3',
+            38: 'plaintiff_country_code',
+            39: 'contact_name_of_plaintiff',
+            40: 'contact_language_code_of_plaintiff',
+            41: 'contact_address_line_1_of_plaintiff',
+            42: 'contact_address_line_2_of_plaintiff',
+            43: 'contact_address_line_3_of_plaintiff',
+            44: 'contact_province_name_of_plaintiff',
+            45: 'contact_country_code_of_plaintiff',
+            46: 'contact_postal_code_of_plaintiff',
+            47: 'agent_number_of_plaintiff',
+            48: 'agent_name_of_plaintiff',
+            49: 'agent_language_code_of_plaintiff',
+            50: 'agent_address_line_1_of_plaintiff',
+            51: 'agent_address_line_2_of_plaintiff',
+            52: 'agent_address_line_3_of_plaintiff',
+            53: 'agent_province_name_of_plaintiff',
+            54: 'agent_country_code_of_plaintiff',
+            55: 'agent_postal_code_of_plaintiff',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_opposition_case
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                opposition_case_number integer NOT NULL,
+                opposition_case_type_english_name text COLLATE pg_catalog."default",
+                opposition_case_type_french_name text COLLATE pg_catalog."default",
+                opposition_date date,
+                wipo_opposition_case_status text COLLATE pg_catalog."default",
+                opposition_wipo_status_date date,
+                wipo_opposition_status_category smallint,
+                opposition_case_status_code smallint,
+                cipo_opposition_status_date date,
+                entity_name_of_the_opposition_proceeding_defendant text COLLATE pg_catalog."default",
+                defendant_language_code text COLLATE pg_catalog."default",
+                defendant_address_line_1 text COLLATE pg_catalog."default",
+                defendant_address_line_2 text COLLATE pg_catalog."default",
+                defendant_address_line_3 text COLLATE pg_catalog."default",
+                defendant_country_code text COLLATE pg_catalog."default",
+                contact_name_of_defendant text COLLATE pg_catalog."default",
+                contact_language_code_of_defendant text COLLATE pg_catalog."default",
+                contact_address_line_1_of_defendant text COLLATE pg_catalog."default",
+                contact_address_line_2_of_defendant text COLLATE pg_catalog."default",
+                contact_address_line_3_of_defendant text COLLATE pg_catalog."default",
+                contact_province_name_of_defendant text COLLATE pg_catalog."default",
+                contact_country_code_of_defendant text COLLATE pg_catalog."default",
+                contact_postal_code_of_defendant text COLLATE pg_catalog."default",
+                agent_name_of_defendant text COLLATE pg_catalog."default",
+                agent_language_code_of_defendant text COLLATE pg_catalog."default",
+                agent_address_line_1_of_defendant text COLLATE pg_catalog."default",
+                agent_address_line_2_of_defendant text COLLATE pg_catalog."default",
+                agent_address_line_3_of_defendant text COLLATE pg_catalog."default",
+                agent_province_name_of_defendant text COLLATE pg_catalog."default",
+                agent_country_code_of_defendant text COLLATE pg_catalog."default",
+                agent_postal_code_of_defendant text COLLATE pg_catalog."default",
+                plaintiff_name text COLLATE pg_catalog."default",
+                plaintiff_legal_name text COLLATE pg_catalog."default",
+                plaintiff_language_code text COLLATE pg_catalog."default",
+                plaintiff_address_line_1 text COLLATE pg_catalog."default",
+                plaintiff_address_line_2 text COLLATE pg_catalog."default",
+                plaintiff_address_line_3 text COLLATE pg_catalog."default",
+                plaintiff_country_code text COLLATE pg_catalog."default",
+                contact_name_of_plaintiff text COLLATE pg_catalog."default",
+                contact_language_code_of_plaintiff text COLLATE pg_catalog."default",
+                contact_address_line_1_of_plaintiff text COLLATE pg_catalog."default",
+                contact_address_line_2_of_plaintiff text COLLATE pg_catalog."default",
+                contact_address_line_3_of_plaintiff text COLLATE pg_catalog."default",
+                contact_province_name_of_plaintiff text COLLATE pg_catalog."default",
+                contact_country_code_of_plaintiff text COLLATE pg_catalog."default",
+                contact_postal_code_of_plaintiff text COLLATE pg_catalog."default",
+                agent_number_of_plaintiff integer,
+                agent_name_of_plaintiff text COLLATE pg_catalog."default",
+                agent_language_code_of_plaintiff text COLLATE pg_catalog."default",
+                agent_address_line_1_of_plaintiff text COLLATE pg_catalog."default",
+                agent_address_line_2_of_plaintiff text COLLATE pg_catalog."default",
+                agent_address_line_3_of_plaintiff text COLLATE pg_catalog."default",
+                agent_province_name_of_plaintiff text COLLATE pg_catalog."default",
+                agent_country_code_of_plaintiff text COLLATE pg_catalog."default",
+                agent_postal_code_of_plaintiff text COLLATE pg_catalog."default",
+                CONSTRAINT tm_opposition_case_pkey PRIMARY KEY (application_number, opposition_case_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_transliteration': {
+        'file_stem': 'TM_transliteration',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Mark Transliteration Text - Translittération de la marque': 'mark_transliteration_text',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_transliteration
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                mark_transliteration_text text COLLATE pg_catalog."default",
+                CONSTRAINT tm_transliteration_pkey PRIMARY KEY (application_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_application_text': {
+        'file_stem': 'TM_application_text',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_nulls': ['application_text_code', 'sequence_number', 'secondary_sequence_number'],
+        'type_conversions': {
+            'int_cols': [
+                'application_text_code',
+                'sequence_number',
+                'secondary_sequence_number',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Sequence Number - Numéro de séquence': 'sequence_number',
+            'Application Text Code - Code du texte de la demande': 'application_text_code',
+            'Secondary Sequence Number - Numéro de séquence secondaire': 'secondary_sequence_number',
+            'Application Text Details - Détails du texte de la demande': 'application_text_details',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_application_text
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                application_text_code smallint NOT NULL,
+                sequence_number integer NOT NULL,
+                secondary_sequence_number integer NOT NULL,
+                application_text_details text COLLATE pg_catalog."default",
+                CONSTRAINT tm_application_text_pkey PRIMARY KEY (application_number, application_text_code, sequence_number, secondary_sequence_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_application_disclaimer': {
+        'file_stem': 'TM_application_disclaimer',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_nulls': ['language_code', 'disclaimer_text_sequence_number'],
+        'type_conversions': {
+            'int_cols': ['disclaimer_text_sequence_number'],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Language Code - Code de langue': 'language_code',
+            'Disclaimer Text Sequence Number - Numéro de séquence du texte de désistement': 'disclaimer_text_sequence_number',
+            'Disclaimer Text - Texte de désistement': 'disclaimer_text',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_application_disclaimer
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                language_code text COLLATE pg_catalog."default" NOT NULL,
+                disclaimer_text_sequence_number integer NOT NULL,
+                disclaimer_text text COLLATE pg_catalog."default",
+                CONSTRAINT tm_application_disclaimer_pkey PRIMARY KEY (application_number, language_code, disclaimer_text_sequence_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_heading': {
+        'file_stem': 'TM_heading',
+        'parent': {'table': 'tm_main', 'key_cols': ['application_number']},
+        'drop_nulls': ['index_heading_number'],
+        'type_conversions': {
+            'int_cols': ['index_heading_number'],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Index Heading Number - Numéro de la rubrique d’index': 'index_heading_number',
+            'Index Heading Comment - Texte de la rubrique d’index': 'index_heading_comment',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_heading
+            (
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                index_heading_number integer NOT NULL,
+                index_heading_comment text COLLATE pg_catalog."default",
+                CONSTRAINT tm_heading_pkey PRIMARY KEY (application_number, index_heading_number),
+                CONSTRAINT fk_tm_main FOREIGN KEY (application_number)
+                    REFERENCES public.tm_main (application_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_cancellation_case_action': {
+        'file_stem': 'TM_cancellation_case_action',
+        'parent': {'table': 'tm_cancellation_case', 'key_cols': ['application_number', 'section_44_45_case_number']},
+        'drop_nulls': ['section_44_45_case_number'],
+        'type_conversions': {
+            'date_cols': [
+                'proceeding_effective_date',
+                'section_44_45_filing_date',
+                'section_44_45_status_date',
+            ],
+            'int_cols': [
+                'section_44_45_case_number',
+                'wipo_section_44_45_status_category_code',
+                'section_44_45_status_code',
+                'section_44_45_stage_code',
+                'section_44_45_actions_code',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Additional Comment - Information supplémentaire': 'additional_comment',
+            'Proceeding Effective Date - Date d’entrée en vigueur de l’action ': 'proceeding_effective_date',
+            'Section 44/45 Case Number - Numéro du cas de l’article 44/45': 'section_44_45_case_number',
+            'Legal Proceeding Type Description in English - Description du type de procédure juridique en anglais': 'legal_proceeding_type_description_in_english',
+            'Legal Proceeding Type Description in French - Description du type de procédure juridique en français': 'legal_proceeding_type_description_in_french',
+            'Section 44/45 Filing Date - Date de soumission de l’article 44/45': 'section_44_45_filing_date',
+            'WIPO Section 44/45 Status Category Code - Catégorie du statut de l’article 44/45 selon l’OMPI': 'wipo_section_44_45_status_category_code',
+            'Section 44/45 Status Code - Code du statut de l’article 44/45': 'section_44_45_status_code',
+            'Section 44/45 Status Date - Date du statut de l’article 44/45': 'section_44_45_status_date',
+            'Section 44/45 Stage Code - Code de l’étape de l’article 44/45': 'section_44_45_stage_code',
+            'Section 44/45 case status - Statut du cas sous l’article 44/45 ': 'section_44_45_case_status',
+            "Section 44/45 actions code - Code d’action de l'article  44/45": 'section_44_45_actions_code',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_cancellation_case_action
+            (
+                cancellation_case_action_id SERIAL PRIMARY KEY,
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                section_44_45_case_number integer NOT NULL,
+                additional_comment text COLLATE pg_catalog."default",
+                proceeding_effective_date date,
+                legal_proceeding_type_description_in_english text COLLATE pg_catalog."default",
+                legal_proceeding_type_description_in_french text COLLATE pg_catalog."default",
+                section_44_45_filing_date date,
+                wipo_section_44_45_status_category_code smallint,
+                section_44_45_status_code smallint,
+                section_44_45_status_date date,
+                section_44_45_stage_code integer,
+                section_44_45_case_status text COLLATE pg_catalog."default",
+                section_44_45_actions_code integer,
+                CONSTRAINT fk_tm_cancellation_case FOREIGN KEY (application_number, section_44_45_case_number)
+                    REFERENCES public.tm_cancellation_case (application_number, section_44_45_case_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+    'tm_opposition_case_action': {
+        'file_stem': 'TM_opposition_case_action',
+        'parent': {'table': 'tm_opposition_case', 'key_cols': ['application_number', 'opposition_case_number']},
+        'drop_nulls': ['opposition_case_number'],
+        'drop_duplicates': False,
+        'type_conversions': {
+            'date_cols': [
+                'proceeding_effective_date',
+                'opposition_date',
+                'opposition_wipo_status_date',
+                'cipo_opposition_status_date',
+            ],
+            'int_cols': [
+                'opposition_case_number',
+                'wipo_opposition_status_category',
+                'opposition_case_status_code',
+                'opposition_stage_code',
+                'opposition_action_code',
+            ],
+        },
+        'column_mapping': {
+            'Application Number - Numéro de la demande ': 'application_number',
+            'Additional Comment - Information supplémentaire': 'additional_comment',
+            'Proceeding Effective Date - Date d’entrée en vigueur de l’action ': 'proceeding_effective_date',
+            'Opposition Case Number - Numéro du cas d’opposition': 'opposition_case_number',
+            'Opposition Case Type English Name - Type de procédure d’opposition en anglais': 'opposition_case_type_english_name',
+            'Opposition Case Type French Name - Type de procédure d’opposition en français': 'opposition_case_type_french_name',
+            'Opposition Date - Date d’opposition': 'opposition_date',
+            'WIPO Opposition Category Status - Catégorie de statut selon l’OMPI': 'wipo_opposition_status_category',
+            'Opposition WIPO Status Date - Date de statut selon l’OMPI': 'opposition_wipo_status_date',
+            "WIPO Opposition Status - Statut d'oppostion selon l’OMPI": 'wipo_opposition_case_status',
+            'Opposition Case Status Code - Code du statut d’opposition': 'opposition_case_status_code',
+            'CIPO Opposition Status Date - Date du statut d’opposition de l’OPIC': 'cipo_opposition_status_date',
+            'Opposition Stage Code - Code de l’étape d’opposition': 'opposition_stage_code',
+            'Opposition Action Category - Catégorie de l’action d’opposition': 'opposition_action_category',
+            'Opposition Action Code - Code de l’action d’opposition': 'opposition_action_code',
+        },
+        'ddl': """
+            CREATE TABLE IF NOT EXISTS public.tm_opposition_case_action
+            (
+                opposition_case_action_id SERIAL PRIMARY KEY,
+                application_number text COLLATE pg_catalog."default" NOT NULL,
+                opposition_case_number integer NOT NULL,
+                additional_comment text COLLATE pg_catalog."default",
+                proceeding_effective_date date,
+                opposition_case_type_english_name text COLLATE pg_catalog."default",
+                opposition_case_type_french_name text COLLATE pg_catalog."default",
+                opposition_date date,
+                wipo_opposition_case_status text COLLATE pg_catalog."default",
+                opposition_wipo_status_date date,
+                wipo_opposition_status_category smallint,
+                opposition_case_status_code smallint,
+                cipo_opposition_status_date date,
+                opposition_stage_code integer,
+                opposition_action_category text COLLATE pg_catalog."default",
+                opposition_action_code integer,
+                CONSTRAINT fk_tm_opposition_case FOREIGN KEY (application_number, opposition_case_number)
+                    REFERENCES public.tm_opposition_case (application_number, opposition_case_number) MATCH SIMPLE
+                    ON UPDATE NO ACTION
+                    ON DELETE CASCADE
+            )
+        """,
+    },
+}
@@ -0,0 +1,42 @@
+import logging
+
+from django.db import migrations
+
+logger = logging.getLogger(__name__)
+
+
+def create_index(apps, schema_editor):
+    # tm_interested_party is created by the import engine, not by Django, so a
+    # fresh (e.g. test) database may not have it yet.
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass('tm_interested_party')")
+        if cursor.fetchone()[0] is None:
+            logger.warning('tm_interested_party does not exist yet, so tm_ip_party_name_trgm was not built. '
+                           'The import engine builds it when it loads the table.')
+            return
+    schema_editor.execute(
+        'CREATE INDEX CONCURRENTLY IF NOT EXISTS tm_ip_party_name_trgm '
+        'ON tm_interested_party USING gin (party_name gin_trgm_ops);'
+    )
+
+
+def drop_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX CONCURRENTLY IF EXISTS tm_ip_party_name_trgm;')
+
+
+class Migration(migrations.Migration):
+    # tm_interested_party is unmanaged, so the index is created with raw SQL.
+    # Built CONCURRENTLY so party lookups keep working during the build.
+    atomic = False
+
+    dependencies = [
+        ('trademarks', '0004_alter_tm_footnote_footnote_change_date_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE EXTENSION IF NOT EXISTS pg_trgm;',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trademarks', '0005_tm_interested_party_name_trgm'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TmDataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+                ('changed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'tm_data_version',
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 09:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trademarks', '0006_tm_data_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tmdataversion',
+            name='extract_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -451,3 +451,17 @@ class TmTransliteration(models.Model):
     class Meta:
         managed = False
         db_table = 'tm_transliteration'
+
+
+class TmDataVersion(models.Model):
+    """
+    Single row bumped by the import engine whenever a load changes the data.
+    Cached API responses are keyed by it, so a bump invalidates all of them
+    at once. extract_date is the date of the extract files that load read.
+    """
+    version = models.BigIntegerField(default=0)
+    changed_at = models.DateTimeField(blank=True, null=True)
+    extract_date = models.DateField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'tm_data_version'
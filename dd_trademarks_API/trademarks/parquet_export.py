@@ -0,0 +1,217 @@
+"""
+Columnar Parquet snapshots of the trademark tables.
+
+Each table is read once through a server-side cursor, in primary-key
+order, and written batch by batch -- nothing holds more than one batch in
+memory. Code columns (`*_code`, `*_type`, `*_kind`) are dictionary-encoded;
+free text is not, where a dictionary would only be built to be thrown away.
+The extract date the data came from is stored in every file's key/value
+metadata, next to the source table and the export time.
+"""
+import os
+import shutil
+from datetime import datetime, timezone
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from . import models
+from .streaming import export_database
+
+# Export name (the table name) -> model. The name is also the directory the
+# table's files go to.
+EXPORT_MODELS = {
+    model._meta.db_table: model
+    for model in (
+        models.TmMain,
+        models.TmClaim,
+        models.TmMarkDescription,
+        models.TmCipoClassifications,
+        models.TmApplicantClassifications,
+        models.TmRepresentation,
+        models.TmInterestedParty,
+        models.TmPriorityClaim,
+        models.TmEvent,
+        models.TmApplicationDisclaimer,
+        models.TmApplicationText,
+        models.TmTransliteration,
+        models.TmFootnote,
+        models.TmFootnoteFormatted,
+        models.TmHeading,
+        models.TmCancellationCase,
+        models.TmCancellationCaseAction,
+        models.TmOppositionCase,
+        models.TmOppositionCaseAction,
+    )
+}
+
+BATCH_SIZE = 50_000  # Rows per cursor fetch, and per Parquet row group
+ROWS_PER_FILE = 1_000_000  # Rows per part file of an exported table
+COMPRESSION = 'zstd'
+CODE_SUFFIXES = ('_code', '_type', '_kind')
+
+ARROW_TYPES = {
+    'AutoField': pa.int32(),
+    'BigAutoField': pa.int64(),
+    'SmallIntegerField': pa.int16(),
+    'IntegerField': pa.int32(),
+    'BigIntegerField': pa.int64(),
+    'FloatField': pa.float64(),
+    'BooleanField': pa.bool_(),
+    'DateField': pa.date32(),
+    'DateTimeField': pa.timestamp('us', tz='UTC'),
+    'CharField': pa.string(),
+    'TextField': pa.string(),
+}
+CODE_TYPE = pa.dictionary(pa.int32(), pa.string())
+
+
+def default_extract_date():
+    """Extract date of the last load, as the import engine recorded it, as YYYY-MM-DD ('' before any)."""
+    loaded = models.TmDataVersion.objects.values_list('extract_date', flat=True).first()
+    return loaded.isoformat() if loaded else ''
+
+
+def export_columns(model):
+    """
+    (attname, column, arrow type) for every stored column of `model`.
+    Foreign keys export their raw key column.
+    """
+    columns = []
+    for field in model._meta.concrete_fields:
+        target = field.target_field if field.is_relation else field
+        arrow_type = ARROW_TYPES.get(target.get_internal_type())
+        if arrow_type is None:
+            continue
+        if arrow_type == pa.string() and field.column.endswith(CODE_SUFFIXES):
+            arrow_type = CODE_TYPE
+        columns.append((field.attname, field.column, arrow_type))
+    return columns
+
+
+def arrow_schema(model, extract_date):
+    return pa.schema(
+        [pa.field(column, arrow_type) for _, column, arrow_type in export_columns(model)],
+        metadata={
+            'extract_date': extract_date,
+            'source_table': model._meta.db_table,
+            'exported_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        },
+    )
+
+
+def record_batches(model, schema, batch_size=BATCH_SIZE, using=None):
+    """Yield the whole table as RecordBatches, streamed from a server-side cursor on `using`."""
+    attnames = [attname for attname, _, _ in export_columns(model)]
+    rows = model.objects.using(using).order_by('pk').values_list(*attnames).iterator(chunk_size=batch_size)
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield _to_batch(batch, schema)
+            batch = []
+    if batch:
+        yield _to_batch(batch, schema)
+
+
+def _to_batch(rows, schema):
+    arrays = []
+    for field, values in zip(schema, zip(*rows)):
+        if field.type == CODE_TYPE:
+            arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _writer(where, schema, compression):
+    code_columns = [f.name for f in schema if f.name.endswith(CODE_SUFFIXES)]
+    return pq.ParquetWriter(where, schema, compression=compression, use_dictionary=code_columns)
+
+
+def export_table(name, directory, extract_date=None, rows_per_file=ROWS_PER_FILE, batch_size=BATCH_SIZE,
+                 compression=COMPRESSION, using=None):
+    """
+    Write table `name` to `directory`/`name`/part-NNNNN.parquet, starting a
+    new part every `rows_per_file` rows. The parts are written next to the
+    previous snapshot and only replace it once complete. Returns (rows,
+    files written). Reads from `using`, by default export_database().
+    """
+    model = EXPORT_MODELS[name]
+    using = using or export_database(model)
+    schema = arrow_schema(model, default_extract_date() if extract_date is None else extract_date)
+    target = os.path.join(directory, name)
+    building = f"{target}.partial"
+    shutil.rmtree(building, ignore_errors=True)
+    os.makedirs(building)
+
+    rows, files, writer, in_file = 0, 0, None, 0
+    try:
+        for batch in record_batches(model, schema, batch_size, using):
+            if writer is None or in_file >= rows_per_file:
+                if writer is not None:
+                    writer.close()
+                writer = _writer(os.path.join(building, f"part-{files:05d}.parquet"), schema, compression)
+                files, in_file = files + 1, 0
+            writer.write_batch(batch, row_group_size=batch_size)
+            rows += batch.num_rows
+            in_file += batch.num_rows
+        if writer is None:
+            # An empty table still gets a (schema-only) file.
+            writer = _writer(os.path.join(building, 'part-00000.parquet'), schema, compression)
+            files = 1
+        writer.close()
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        shutil.rmtree(building, ignore_errors=True)
+        raise
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(building, target)
+    return rows, files
+
+
+class _ByteSink:
+    """Write-only file object for ParquetWriter whose output is drained as it is produced."""
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_table(name, extract_date=None, batch_size=BATCH_SIZE, compression=COMPRESSION, using=None):
+    """
+    Yield table `name` as one Parquet file, a row group at a time, for a
+    streaming HTTP response. Pass `using` (export_database()) so a refusal
+    is raised before the response starts, not in the middle of it.
+    """
+    model = EXPORT_MODELS[name]
+    schema = arrow_schema(model, default_extract_date() if extract_date is None else extract_date)
+    sink = _ByteSink()
+    writer = _writer(sink, schema, compression)
+    for batch in record_batches(model, schema, batch_size, using):
+        writer.write_batch(batch, row_group_size=batch_size)
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
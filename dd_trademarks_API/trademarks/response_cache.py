@@ -0,0 +1,91 @@
+"""
+Whole-response cache for the read-only API.
+
+The data only changes when the import engine loads an extract, and the
+engine then bumps TmDataVersion. A cached response is keyed by its URL, with the
+query parameters in a canonical order, and by that version. One bump
+therefore retires every entry at once, without having to find them. Each
+process reads the version from the database at most once every
+DATA_VERSION_TTL seconds.
+
+Responses carry an ETag and a Last-Modified derived from the version. A
+client already holding the current version gets a 304 before the request
+reaches a view.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+from .models import TmDataVersion
+
+_version = {'value': (0, None), 'checked': float('-inf')}
+
+
+def data_version():
+    """(version, changed_at) of the loaded data, re-read every DATA_VERSION_TTL seconds."""
+    now = time.monotonic()
+    if now - _version['checked'] >= settings.DATA_VERSION_TTL:
+        _version['value'] = TmDataVersion.objects.values_list('version', 'changed_at').first() or (0, None)
+        _version['checked'] = now
+    return _version['value']
+
+
+def normalised_url(request):
+    """Absolute URL with the query parameters sorted by name (each one's values keep their order)."""
+    query = urlencode([(key, value) for key, values in sorted(request.GET.lists()) for value in values])
+    return f"{request.build_absolute_uri(request.path)}?{query}"
+
+
+class ResponseCacheMiddleware:
+    """
+    Serves repeated GETs under RESPONSE_CACHE_PATHS from the default cache.
+    Only complete 200 responses are stored; streamed exports go straight
+    through.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.paths = tuple(settings.RESPONSE_CACHE_PATHS)
+
+    def __call__(self, request):
+        if request.method not in ('GET', 'HEAD') or not request.path.startswith(self.paths):
+            return self.get_response(request)
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Built inside an open transaction, the response may show rows that are never committed.
+            return self.get_response(request)
+
+        version, changed_at = data_version()
+        tag = f"{version}.{int(changed_at.timestamp()) if changed_at else 0}"
+        digest = hashlib.sha1(normalised_url(request).encode()).hexdigest()
+        etag = f'"{tag}-{digest[:20]}"'
+        last_modified = int(changed_at.timestamp()) if changed_at else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            key = f"response:{tag}:{digest}"
+            response = cache.get(key)
+            if response is not None:
+                response['X-Cache'] = 'HIT'
+            else:
+                response = self.get_response(request)
+                if response.status_code != 200 or response.streaming or request.method != 'GET':
+                    return response
+                cache.set(key, response, settings.RESPONSE_CACHE_TIMEOUT)
+                response['X-Cache'] = 'MISS'
+        if not response.has_header('ETag'):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        # Validators the view set itself are checked here when the response came from the cache.
+        return get_conditional_response(
+            request,
+            etag=response['ETag'],
+            last_modified=parse_http_date_safe(response.get('Last-Modified', '')),
+            response=response,
+        )
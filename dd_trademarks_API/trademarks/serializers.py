@@ -56,6 +56,13 @@ class TmInterestedPartySerializer(serializers.ModelSerializer):
         model = TmInterestedParty
         fields = '__all__'
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Set when the row came from a `?party_fuzzy=` lookup.
+        if hasattr(instance, 'similarity'):
+            data['similarity'] = instance.similarity
+        return data
+
 class TmPriorityClaimSerializer(serializers.ModelSerializer):
     class Meta:
         model = TmPriorityClaim
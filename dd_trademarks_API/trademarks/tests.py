@@ -1,3 +1,387 @@
-from django.test import TestCase
+import datetime
+import io
+import os
+import shutil
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import sqlalchemy
+from django.apps import apps
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from rest_framework import status
+
+from .models import TmDataVersion, TmInterestedParty, TmMain
+
+# The import engine is a set of standalone scripts that import each other
+# by module name.
+sys.path.insert(0, str(Path(__file__).resolve().parent / 'management' / 'commands'))
+import import_engine  # noqa: E402
+import run_all_imports  # noqa: E402
+from tm_specs import TABLE_SPECS  # noqa: E402
+
+EXTRACT_DATE = '2025-01-28'
+
+
+def create_tm_tables():
+    """
+    The tm_* tables are unmanaged (the import engine creates them), so the
+    test database starts without them. Inside a TestCase they go away with
+    the class's transaction.
+    """
+    with connection.schema_editor() as editor:
+        for model in apps.get_app_config('trademarks').get_models():
+            if not model._meta.managed:
+                editor.create_model(model)
+
+
+class PartyFuzzySearchTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_tm_tables()
+        main = TmMain.objects.create(application_number='1900001')
+        for name in ['ACME Corporation', 'Acme Corp.', 'Globex Inc.']:
+            TmInterestedParty.objects.create(application_number=main, party_name=name)
+
+    def search(self, **params):
+        resp = self.client.get(reverse('tm-interested-party-list'), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.data['results']
+
+    def test_ranked_by_similarity(self):
+        rows = self.search(party_fuzzy='acme corp')
+        self.assertEqual([r['party_name'] for r in rows], ['Acme Corp.', 'ACME Corporation'])
+        self.assertGreater(rows[0]['similarity'], rows[1]['similarity'])
+
+    def test_min_similarity_narrows(self):
+        rows = self.search(party_fuzzy='acme corp', min_similarity=0.9)
+        self.assertEqual([r['party_name'] for r in rows], ['Acme Corp.'])
+
+
+class ModifiedSinceTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_tm_tables()
+        TmMain.objects.create(application_number='1900001')
+
+    def numbers(self, **params):
+        resp = self.client.get(reverse('tm_main_list'), params)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return [row['application_number'] for row in resp.data['results']]
+
+    def test_all_or_nothing_by_extract_date(self):
+        TmDataVersion.objects.create(id=1, version=1, extract_date=datetime.date(2025, 1, 28))
+        self.assertEqual(self.numbers(modified_since='2025-01-27'), ['1900001'])
+        self.assertEqual(self.numbers(modified_since='2025-01-28'), [])
+
+    def test_everything_without_an_extract_date(self):
+        self.assertEqual(self.numbers(modified_since='2025-01-28'), ['1900001'])
+
+    def test_bad_date(self):
+        resp = self.client.get(reverse('tm_main_list'), {'modified_since': '28/01/2025'})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_parquet_list_reports_extract_date(self):
+        TmDataVersion.objects.create(id=1, version=1, extract_date=datetime.date(2025, 1, 28))
+        resp = self.client.get(reverse('tm-parquet-export-list'))
+        self.assertEqual(resp.data['extract_date'], '2025-01-28')
+
+
+class ParquetExportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        create_tm_tables()
+        TmDataVersion.objects.create(id=1, version=1, extract_date=datetime.date(2025, 1, 28))
+        for n in range(1, 6):
+            main = TmMain.objects.create(application_number=f'190000{n}', application_language_code='en')
+            TmInterestedParty.objects.create(application_number=main, party_name=f'Party {n}')
+
+    def test_command_writes_partitioned_files(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        with tempfile.TemporaryDirectory() as directory:
+            call_command('export_parquet', directory, 'tm_main', 'tm_interested_party', rows_per_file=2,
+                         batch_size=2, stdout=io.StringIO())
+            parts = sorted(os.listdir(os.path.join(directory, 'tm_main')))
+            table = pq.read_table(os.path.join(directory, 'tm_main'))
+            parties = pq.read_table(os.path.join(directory, 'tm_interested_party'))
+
+        self.assertEqual(parts, ['part-00000.parquet', 'part-00001.parquet', 'part-00002.parquet'])
+        self.assertEqual(table.column('application_number').to_pylist(), [f'190000{n}' for n in range(1, 6)])
+        self.assertEqual(table.schema.field('application_language_code').type,
+                         pa.dictionary(pa.int32(), pa.string()))
+        # The extract date of the last import, as recorded in tm_data_version.
+        self.assertEqual(table.schema.metadata[b'extract_date'], b'2025-01-28')
+        self.assertEqual(parties.column('application_number').to_pylist()[0], '1900001')
+
+    def test_endpoint_streams_one_file(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        resp = self.client.get(reverse('tm-parquet-export', args=['tm_main']))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        table = pq.read_table(pa.BufferReader(b''.join(resp.streaming_content)))
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.schema.metadata[b'extract_date'], b'2025-01-28')
+        resp = self.client.get(reverse('tm-parquet-export', args=['tm_nope']))
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_refused_without_server_side_cursors(self):
+        # DB_POOL_MODE=pgbouncer without DB_EXPORT_HOST: iterator() would buffer everything.
+        with mock.patch.dict(connection.settings_dict, DISABLE_SERVER_SIDE_CURSORS=True):
+            resp = self.client.get(reverse('tm-parquet-export', args=['tm_main']))
+            self.assertEqual(resp.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.assertEqual(resp.data['detail'].code, 'export_unavailable')
+            with tempfile.TemporaryDirectory() as directory:
+                with self.assertRaisesMessage(CommandError, 'DB_EXPORT_HOST'):
+                    call_command('export_parquet', directory, 'tm_main', stdout=io.StringIO())
+
+
+def test_database_engine():
+    """SQLAlchemy engine on the test database, for the import engine."""
+    db = connection.settings_dict
+    return sqlalchemy.create_engine(sqlalchemy.engine.URL.create(
+        'postgresql+psycopg2', username=db['USER'], password=db['PASSWORD'] or None,
+        host=db['HOST'] or None, port=db['PORT'] or None, database=db['NAME'],
+    ))
+
+
+class ImportEngineTestCase(TransactionTestCase):
+    """
+    Runs the import engine against the test database on small synthetic
+    extracts. The engine commits on its own connections, hence
+    TransactionTestCase, and its tables are dropped after each test.
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        patcher = mock.patch.object(import_engine, 'create_engine', test_database_engine)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        tables = [*TABLE_SPECS, import_engine.CHANGED_KEYS_TABLE,
+                  *(import_engine.staging_table_name(table) for table in TABLE_SPECS)]
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {', '.join(tables)} CASCADE")
+            for schema in (import_engine.SHADOW_SCHEMA, import_engine.RETIRED_SCHEMA):
+                cursor.execute(f'DROP SCHEMA IF EXISTS {schema} CASCADE')
+
+    def write_extract(self, table_name, rows):
+        """Writes `rows` (dicts keyed by db column) as the table's pipe-delimited extract ZIP."""
+        spec = TABLE_SPECS[table_name]
+        zip_path, csv_name = import_engine.extract_paths(spec, self.data_dir, EXTRACT_DATE)
+        lines = ['|'.join(spec['column_mapping'])] if spec.get('has_header', True) else []
+        lines += ['|'.join(row.get(column, '') for column in spec['column_mapping'].values()) for row in rows]
+        with zipfile.ZipFile(zip_path, 'w') as z:
+            z.writestr(csv_name, '\n'.join(lines) + '\n')
+
+    def load(self, table_name, rows, **options):
+        self.write_extract(table_name, rows)
+        return import_engine.run_table(table_name, self.data_dir, EXTRACT_DATE, **options)
+
+    def fetch(self, sql, params=None):
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall()
+
+    def data_version(self):
+        return TmDataVersion.objects.values_list('version', flat=True).first() or 0
+
+
+class FullLoadTest(ImportEngineTestCase):
+    MAIN_ROWS = [
+        {'application_number': '100', 'filing_date': '2020-01-02', 'expungement_indicator': 'Y',
+         'cipo_status_code': '7'},
+        {'application_number': '200', 'filing_date': 'not a date', 'expungement_indicator': 'N',
+         'cipo_status_code': 'x'},
+        {'application_number': '', 'filing_date': '2021-05-06'},
+    ]
+
+    def test_loads_and_converts_types(self):
+        self.assertEqual(self.load('tm_main', self.MAIN_ROWS), 2)
+        self.assertEqual(
+            self.fetch('SELECT application_number, filing_date, expungement_indicator, cipo_status_code '
+                       'FROM tm_main ORDER BY application_number'),
+            [('100', datetime.date(2020, 1, 2), True, 7), ('200', None, False, None)],
+        )
+
+    def test_drops_duplicates_and_rows_without_key(self):
+        self.load('tm_main', self.MAIN_ROWS)
+        event = {'application_number': '100', 'action_date': '2020-02-03', 'wipo_action_type': 'Filed'}
+        rows = [event, dict(event), {**event, 'application_number': ''}, {**event, 'wipo_action_type': 'Published'}]
+        for fk_validation in import_engine.FK_VALIDATION_MODES:
+            with self.subTest(fk_validation=fk_validation):
+                self.assertEqual(self.load('tm_event', rows, fk_validation=fk_validation), 2)
+                self.assertEqual(
+                    self.fetch('SELECT wipo_action_type FROM tm_event ORDER BY wipo_action_type'),
+                    [('Filed',), ('Published',)],
+                )
+
+    def test_run_bumps_data_version_once(self):
+        self.write_extract('tm_main', self.MAIN_ROWS)
+        self.write_extract('tm_event', [{'application_number': '100', 'wipo_action_type': 'Filed'}])
+        # Worker threads instead of processes, so they see the patched engine.
+        with mock.patch.object(run_all_imports, 'ProcessPoolExecutor', ThreadPoolExecutor), \
+                mock.patch.object(run_all_imports, 'create_engine', test_database_engine):
+            loaded, failed = run_all_imports.run_imports(
+                ['tm_main', 'tm_event'], 2, self.data_dir, EXTRACT_DATE, mode='full',
+            )
+        self.assertEqual((loaded, failed), ({'tm_main': 2, 'tm_event': 1}, []))
+        self.assertEqual(self.data_version(), 1)
+
+        self.load('tm_event', [])
+        self.assertEqual(self.data_version(), 2)
+
+    def test_records_extract_date(self):
+        self.load('tm_main', self.MAIN_ROWS)
+        self.assertEqual(TmDataVersion.objects.get().extract_date, datetime.date(2025, 1, 28))
+
+        # A bump without a usable date keeps the one already recorded.
+        import_engine.publish_data_version(test_database_engine(), 'latest')
+        self.assertEqual(TmDataVersion.objects.get().extract_date, datetime.date(2025, 1, 28))
+        self.assertEqual(self.data_version(), 2)
+
+
+class OrphanFilterTest(ImportEngineTestCase):
+    def test_staged_orphans_are_left_behind_and_counted(self):
+        self.load('tm_main', [{'application_number': '100'}])
+        rows = [{'application_number': '100', 'wipo_action_type': 'Filed'},
+                {'application_number': '999', 'wipo_action_type': 'Filed'}]
+        with self.assertLogs(level='INFO') as logs:
+            self.assertEqual(self.load('tm_event', rows, fk_validation='database'), 1)
+        self.assertIn("Removed 1 of 2 staged rows with no matching key in 'tm_main'.", '\n'.join(logs.output))
+        self.assertEqual(self.fetch('SELECT application_number FROM tm_event'), [('100',)])
+        self.assertEqual(self.fetch("SELECT to_regclass('tm_event_stage')"), [(None,)])
+
+
+class IncrementalLoadTest(ImportEngineTestCase):
+    MAIN_ROWS = [{'application_number': '100'}, {'application_number': '200'}, {'application_number': '300'}]
+    EVENT_ROWS = [
+        {'application_number': '100', 'wipo_action_type': 'Filed'},
+        {'application_number': '200', 'wipo_action_type': 'Filed'},
+        {'application_number': '200', 'wipo_action_type': 'Published'},
+        {'application_number': '300', 'wipo_action_type': 'Filed'},
+    ]
+
+    def setUp(self):
+        super().setUp()
+        self.load('tm_main', self.MAIN_ROWS)
+        self.load('tm_event', self.EVENT_ROWS)
+
+    def events(self):
+        return self.fetch('SELECT application_number, wipo_action_type, event_id FROM tm_event '
+                          'ORDER BY application_number, wipo_action_type')
+
+    def test_child_only_change_is_applied(self):
+        before = self.events()
+        # tm_main is unchanged, so CHANGED_KEYS_TABLE ends up empty.
+        self.assertEqual(self.load('tm_main', self.MAIN_ROWS, mode='incremental'), 0)
+        rows = [
+            {'application_number': '100', 'wipo_action_type': 'Registered'},  # changed
+            {'application_number': '200', 'wipo_action_type': 'Filed'},  # one of two rows removed
+            {'application_number': '300', 'wipo_action_type': 'Filed'},  # unchanged
+        ]
+        self.assertEqual(self.load('tm_event', rows, mode='incremental'), 2)
+
+        after = self.events()
+        self.assertEqual([row[:2] for row in after], [('100', 'Registered'), ('200', 'Filed'), ('300', 'Filed')])
+        # Rows of the untouched application are not rewritten.
+        self.assertEqual(after[-1], before[-1])
+
+    def test_unchanged_extract_rewrites_nothing(self):
+        before = self.events()
+        self.load('tm_main', self.MAIN_ROWS, mode='incremental')
+        self.assertEqual(self.load('tm_event', self.EVENT_ROWS, mode='incremental'), 0)
+        self.assertEqual(self.events(), before)
+
+
+class SwapLoadTest(ImportEngineTestCase):
+    def run_swap(self, defer):
+        for table_name, spec in TABLE_SPECS.items():
+            row = {'application_number': '100', **{column: '1' for column in spec.get('drop_nulls', [])}}
+            self.write_extract(table_name, [row])
+        with mock.patch.object(run_all_imports, 'ProcessPoolExecutor', ThreadPoolExecutor), \
+                mock.patch.object(run_all_imports, 'create_engine', test_database_engine):
+            return run_all_imports.run_imports(None, 4, self.data_dir, EXTRACT_DATE, mode='swap', defer=defer)
+
+    def test_swap_replaces_public_tables(self):
+        for defer in (False, True):
+            with self.subTest(defer=defer):
+                self.load('tm_main', [{'application_number': '050'}])
+                version = self.data_version()
+
+                loaded, failed = self.run_swap(defer)
+
+                self.assertEqual(failed, [])
+                self.assertEqual(loaded, dict.fromkeys(TABLE_SPECS, 1))
+                self.assertEqual(self.fetch('SELECT application_number FROM public.tm_main'), [('100',)])
+                for table_name in TABLE_SPECS:
+                    self.assertEqual(self.fetch(f'SELECT count(*) FROM public.{table_name}'), [(1,)])
+                # Every child's foreign key moved with it, points at a public table and is validated.
+                foreign_keys = self.fetch(
+                    "SELECT conrelid::regclass::text, confrelid::regclass::text, convalidated FROM pg_constraint "
+                    "WHERE contype = 'f' AND connamespace = 'public'::regnamespace "
+                    "AND conrelid::regclass::text = ANY(%s)", [list(TABLE_SPECS)]
+                )
+                self.assertEqual({row[0] for row in foreign_keys}, set(TABLE_SPECS) - {'tm_main'})
+                for table_name, ref_table, validated in foreign_keys:
+                    self.assertIn(ref_table, TABLE_SPECS)
+                    self.assertTrue(validated, table_name)
+                self.assertEqual(
+                    self.fetch('SELECT nspname FROM pg_namespace WHERE nspname IN (%s, %s)',
+                               [import_engine.SHADOW_SCHEMA, import_engine.RETIRED_SCHEMA]),
+                    [],
+                )
+                self.assertEqual(self.data_version(), version + 1)
+
+
+class DeferredConstraintsTest(ImportEngineTestCase):
+    def setUp(self):
+        super().setUp()
+        self.engine = test_database_engine()
+        self.addCleanup(self.engine.dispose)
+
+    def constraints(self, table_name):
+        return dict(self.fetch("SELECT conname, convalidated FROM pg_constraint "
+                               "WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'f')", [table_name]))
+
+    def test_clean_load_restores_everything(self):
+        self.load('tm_main', [{'application_number': '100'}], defer=True)
+        self.load('tm_event', [{'application_number': '100'}], defer=True)
+        self.assertEqual(self.constraints('tm_main'), {'tm_main_pkey': True})
+        self.assertEqual(self.constraints('tm_event'), {'tm_event_pkey': True, 'fk_tm_main': True})
+
+    def test_violations_are_reported(self):
+        # tm_main keeps duplicate rows (drop_duplicates is off), so its key cannot be rebuilt.
+        with self.assertRaisesMessage(RuntimeError, "Constraint violations in tm_main: {'tm_main_pkey': 2}"):
+            self.load('tm_main', [{'application_number': '100'}] * 3 + [{'application_number': '200'}], defer=True)
+        self.assertEqual(self.constraints('tm_main'), {})
+
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM tm_main WHERE ctid NOT IN "
+                           "(SELECT min(ctid) FROM tm_main GROUP BY application_number)")
+            cursor.execute('ALTER TABLE tm_main ADD PRIMARY KEY (application_number)')
+        import_engine.setup_database(self.engine, 'tm_event')
+        deferred = import_engine.defer_constraints(self.engine, 'tm_event')
+        self.assertEqual([(obj['name'], obj['kind']) for obj in deferred],
+                         [('tm_event_pkey', 'key'), ('fk_tm_main', 'foreign key')])
+        self.assertEqual(self.constraints('tm_event'), {})
+
+        # An orphan, as a load with the orphan filter bypassed would leave it.
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO tm_event (application_number) VALUES ('100'), ('999'), ('999')")
+        with self.assertLogs(level='ERROR') as logs:
+            violations = import_engine.finalize_table(self.engine, 'tm_event', deferred=deferred)
+        self.assertEqual(violations, {'fk_tm_main': 2})
+        self.assertIn('Constraint fk_tm_main on public.tm_event has 2 violating row(s).', logs.output[0])
+        # The foreign key is back but NOT VALID: new rows are checked, the old orphans are not.
+        self.assertEqual(self.constraints('tm_event'), {'tm_event_pkey': True, 'fk_tm_main': False})
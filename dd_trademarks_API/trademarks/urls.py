@@ -19,6 +19,8 @@ from .views import (
     TmCancellationCaseActionListView,
     TmOppositionCaseListView,
     TmOppositionCaseActionListView,
+    ParquetExportListView,
+    ParquetExportView,
 )
 
 urlpatterns = [
@@ -43,4 +45,6 @@ urlpatterns = [
     path('cancellation-cases/actions/', TmCancellationCaseActionListView.as_view(), name='tm-cancellation-case-action-list'),
     path('opposition-cases/', TmOppositionCaseListView.as_view(), name='tm-opposition-case-list'),
     path('opposition-cases/actions/', TmOppositionCaseActionListView.as_view(), name='tm-opposition-case-action-list'),
+    path('parquet/', ParquetExportListView.as_view(), name='tm-parquet-export-list'),
+    path('parquet/<str:table>/', ParquetExportView.as_view(), name='tm-parquet-export'),
 ]
\ No newline at end of file
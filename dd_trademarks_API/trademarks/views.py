@@ -1,4 +1,8 @@
+from django.http import Http404, StreamingHttpResponse
 from rest_framework import generics
+from rest_framework.response import Response
+from rest_framework.reverse import reverse
+from rest_framework.views import APIView
 from .models import (
     TmMain, 
     TmClaim, 
@@ -43,7 +47,9 @@ from .serializers import (
     TmOppositionCaseActionSerializer
 )
 
-from .filters import TmMainFilter
+from .filters import TmMainFilter, TmInterestedPartyFilter
+from .parquet_export import EXPORT_MODELS, default_extract_date, stream_table
+from .streaming import export_database
 
 class TmMainListView(generics.ListAPIView):
     """
@@ -97,12 +103,7 @@ class TmRepresentationListView(generics.ListAPIView):
 class TmInterestedPartyListView(generics.ListAPIView):
     queryset = TmInterestedParty.objects.all()
     serializer_class = TmInterestedPartySerializer
-    filterset_fields = [
-        'application_number', 
-        'party_name',
-        'party_type_code',
-        'agent_number'
-    ]
+    filterset_class = TmInterestedPartyFilter
 
 class TmPriorityClaimListView(generics.ListAPIView):
     queryset = TmPriorityClaim.objects.all()
@@ -202,4 +203,35 @@ class TmOppositionCaseActionListView(generics.ListAPIView):
         'application_number', 
         'opposition_case_number',
         'opposition_action_code'
-    ]
\ No newline at end of file
+    ]
+
+class ParquetExportListView(APIView):
+    """
+    Lists the tables available as Parquet snapshots, and the extract date of
+    the data. Analysts should pull whole tables from here rather than page
+    through the list endpoints above.
+    """
+    def get(self, request):
+        return Response({
+            'extract_date': default_extract_date(),
+            'tables': {
+                name: reverse('tm-parquet-export', args=[name], request=request)
+                for name in EXPORT_MODELS
+            },
+        })
+
+
+class ParquetExportView(APIView):
+    """
+    Streams one table as a single Parquet file, read from a server-side
+    cursor a row group at a time. Code columns are dictionary-encoded and the
+    extract date is in the file metadata. For partitioned files on disk use
+    `manage.py export_parquet`.
+    """
+    def get(self, request, table):
+        if table not in EXPORT_MODELS:
+            raise Http404(f"No Parquet export for '{table}'.")
+        response = StreamingHttpResponse(stream_table(table, using=export_database(EXPORT_MODELS[table])),
+                                         content_type='application/vnd.apache.parquet')
+        response['Content-Disposition'] = f'attachment; filename="{table}.parquet"'
+        return response